@@ -9,7 +9,14 @@ import subprocess
 import threading
 import time
 import logging
-from flask import Flask, jsonify
+import functools
+import json
+import weakref
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from flask import Flask, Response, jsonify, request
+import mysql.connector
+from mysql.connector import pooling
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -17,6 +24,12 @@ logger = logging.getLogger(__name__)
 
 # Ensure Python path is correct
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from article_scoring import RELEVANCE_THRESHOLD
+from local825_jurisdictions import resolve_area
+from response_cache import METRICS as RESPONSE_METRICS
+from response_cache import RESPONSES, read_companies_version, read_data_generation
 
 app = Flask(__name__)
 
@@ -24,6 +37,106 @@ app = Flask(__name__)
 mcp_process = None
 mcp_startup_error = None
 
+# One pooled connection per request thread (gunicorn.conf.py runs GUNICORN_THREADS per worker)
+DB_POOL_SIZE = min(int(os.environ.get('APP_DB_POOL_SIZE', os.environ.get('GUNICORN_THREADS', 8))),
+                   pooling.CNX_POOL_MAXSIZE)
+# How long payloads and the data generation are reused before the database is asked again
+CACHE_TTL_SECONDS = float(os.environ.get('APP_CACHE_TTL_SECONDS', 5))
+
+_db_pool = None
+_db_pool_lock = threading.Lock()
+# connection -> {sql: prepared cursor}; pooled connections keep their statements prepared
+_prepared_cursors = weakref.WeakKeyDictionary()
+_prepared_lock = threading.Lock()
+
+def get_db_config():
+    """Database connection parameters (from your .env)"""
+    return {
+        'host': os.environ.get('MYSQL_HOST', 'localhost'),
+        'port': int(os.environ.get('MYSQL_PORT', 3306)),
+        'database': os.environ.get('MYSQL_DATABASE', 'datapilotplus_scraper'),
+        'user': os.environ.get('MYSQL_USERNAME'),
+        'password': os.environ.get('MYSQL_PASSWORD'),
+        'charset': os.environ.get('MYSQL_CHARSET', 'utf8mb4')
+    }
+
+def init_db_pool(size: int = DB_POOL_SIZE):
+    """Create this process's connection pool (at startup; retried on first use if the database was down)"""
+    global _db_pool
+    with _db_pool_lock:
+        if _db_pool is None:
+            # No session reset on return, so prepared statements survive; autocommit keeps
+            # reads from pinning an old snapshot on a reused connection
+            _db_pool = pooling.MySQLConnectionPool(
+                pool_name=f"app-{os.getpid()}", pool_size=size, pool_reset_session=False,
+                autocommit=True, **get_db_config()
+            )
+            logger.info(f"MySQL pool of {size} connections ready")
+    return _db_pool
+
+@contextmanager
+def db_connection():
+    """Borrow a pooled connection (a direct one if every pooled connection is busy)"""
+    try:
+        conn = init_db_pool().get_connection()
+    except pooling.PoolError:
+        logger.warning("MySQL pool exhausted, opening a direct connection")
+        conn = mysql.connector.connect(autocommit=True, **get_db_config())
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+def run_prepared(conn, sql, params=()):
+    """Run one of the fixed queries as a server-side prepared statement, reused per connection"""
+    # PooledMySQLConnection wraps the real connection, which outlives each checkout
+    raw = getattr(conn, '_cnx', None) or conn
+    with _prepared_lock:
+        cursors = _prepared_cursors.setdefault(raw, {})
+    cursor = cursors.get(sql)
+    if cursor is None:
+        cursor = cursors[sql] = raw.cursor(prepared=True, dictionary=True)
+    cursor.execute(sql, params)
+    return cursor.fetchall()
+
+def ttl_memoize(seconds):
+    """Reuse a function's result per argument tuple for a few seconds"""
+    def decorator(func):
+        cache = {}
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            with lock:
+                hit = cache.get(args)
+            if hit and hit[0] > now:
+                return hit[1]
+            value = func(*args)
+            with lock:
+                cache[args] = (now + seconds, value)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+@ttl_memoize(CACHE_TTL_SECONDS)
+def data_generation():
+    """config_versions data generation, read at most once per CACHE_TTL_SECONDS"""
+    with db_connection() as conn:
+        return read_data_generation(conn)
+
+@ttl_memoize(CACHE_TTL_SECONDS)
+def companies_data_generation():
+    """data_generation() plus the companies version, for responses that embed companies rows"""
+    generation = data_generation()
+    with db_connection() as conn:
+        companies = read_companies_version(conn)
+    if generation is None or companies is None:
+        return None
+    return f"{generation}-c{companies}"
+
 @app.route('/')
 def home():
     """Home endpoint"""
@@ -35,8 +148,11 @@ def home():
         'endpoints': {
             'health': '/health',
             'data': '/data',
+            'bundle': '/bundle?fields=articles,companies,reports,stats',
             'intelligence': '/intelligence',
             'companies': '/companies',
+            'company-timeline': '/companies/<id>/timeline',
+            'company-activity': '/companies/activity?ids=1,2,3',
             'start-mcp': '/start-mcp'
         }
     })
@@ -49,112 +165,224 @@ def health():
         'timestamp': time.time(),
         'python_version': sys.version,
         'mcp_server': 'running' if mcp_process else 'stopped',
-        'mcp_error': mcp_startup_error
+        'mcp_error': mcp_startup_error,
+        'responses': RESPONSE_METRICS.snapshot()
     })
 
+# Fixed queries, run as prepared statements (see run_prepared)
+# Relevance, jurisdiction, counties and article category are scored at ingest (article_scoring)
+ARTICLES_SELECT = """
+    SELECT 
+        s.source_name as source,
+        s.category,
+        s.method_type,
+        s.url,
+        s.scraped_at as published,
+        CONCAT('Data from ', s.source_name, ' - ', s.category) as title,
+        CONCAT('Intelligence data collected from ', s.source_name, ' in category ', s.category, '. This represents real-time monitoring and analysis for Local 825 members.') as summary,
+        COALESCE(s.jurisdiction, 'General') as jurisdiction,
+        COALESCE(s.relevance_score, 0) as relevance_score,
+        s.matched_counties,
+        s.article_category
+    FROM scraped_data s
+"""
+
+# Served by idx_scraped_at, idx_relevance and idx_jurisdiction_relevance
+ARTICLES_ORDER = {
+    'recent': "ORDER BY s.scraped_at DESC",
+    'relevance': "ORDER BY s.relevance_score DESC, s.scraped_at DESC",
+}
+
+def articles_sql(sort='recent', jurisdiction=False, county=False, min_relevance=False):
+    """Article query for a filter combination; each combination is its own prepared statement"""
+    sql = ARTICLES_SELECT
+    if county:
+        sql += "    JOIN scraped_data_counties c ON c.scraped_data_id = s.id AND c.county = ?\n"
+    conditions = []
+    if jurisdiction:
+        conditions.append("s.jurisdiction = ?")
+    if min_relevance:
+        conditions.append("s.relevance_score >= ?")
+    if conditions:
+        sql += f"    WHERE {' AND '.join(conditions)}\n"
+    return sql + f"    {ARTICLES_ORDER[sort]}\n    LIMIT ?"
+
+REPORTS_SQL = """
+    SELECT 
+        report_type,
+        report_date,
+        generated_at
+    FROM reports 
+    ORDER BY generated_at DESC 
+    LIMIT ?
+"""
+
+COMPANIES_SQL = """
+    SELECT 
+        id,
+        company_name as name,
+        industry,
+        status,
+        last_updated,
+        notes,
+        'DataPilotPlus Intelligence' as source
+    FROM companies 
+    ORDER BY last_updated DESC 
+    LIMIT ?
+"""
+
+DATA_COMPANIES_SQL = """
+    SELECT 
+        company_name,
+        industry,
+        status,
+        last_updated,
+        notes
+    FROM companies 
+    ORDER BY last_updated DESC 
+    LIMIT ?
+"""
+
+STATS_TOTALS_SQL = """
+    SELECT COUNT(*) AS total_records,
+           COALESCE(SUM(scraped_at >= DATE_SUB(NOW(), INTERVAL 24 HOUR)), 0) AS last_24h_records
+    FROM scraped_data
+"""
+
+STATS_CATEGORIES_SQL = """
+    SELECT category, COUNT(*) AS count
+    FROM scraped_data
+    GROUP BY category
+    ORDER BY count DESC
+"""
+
+def fetch_articles(conn, limit: int = 50, sort: str = 'recent', jurisdiction=None, county=None, min_relevance=None):
+    """Latest (or most relevant) scraped_data rows in the article shape the WordPress plugin expects"""
+    filters = (county, jurisdiction, min_relevance)
+    sql = articles_sql(sort, jurisdiction is not None, county is not None, min_relevance is not None)
+    articles = run_prepared(conn, sql, tuple(value for value in filters if value is not None) + (limit,))
+    
+    # Transform data for WordPress plugin
+    transformed_articles = []
+    for article in articles:
+        transformed_articles.append({
+            'title': article['title'],
+            'source': article['source'],
+            'published': article['published'].isoformat() if article['published'] else '2025-08-30',
+            'summary': article['summary'],
+            'jurisdiction': article['jurisdiction'],
+            'relevance_score': article['relevance_score'],
+            'matched_counties': json.loads(article['matched_counties']) if article['matched_counties'] else [],
+            'article_category': article['article_category'],
+            'category': article['category'],
+            'url': article['url'] if article['url'] else 'https://datapilotplus.com'
+        })
+    return transformed_articles
+
+def fetch_reports(conn, limit: int = 10):
+    """Latest generated reports"""
+    return run_prepared(conn, REPORTS_SQL, (limit,))
+
+def fetch_companies(conn, limit: int = 50):
+    """Most recently updated companies, keyed by id, in the shape the WordPress plugin expects"""
+    companies = run_prepared(conn, COMPANIES_SQL, (limit,))
+    
+    # Transform to the format expected by WordPress plugin
+    transformed_companies = {}
+    for company in companies:
+        company_id = str(company['id'])
+        transformed_companies[company_id] = {
+            'name': company['name'],
+            'industry': company['industry'] or 'Construction',
+            'status': company['status'] or 'active',
+            'last_updated': company['last_updated'].isoformat() if company['last_updated'] else '2025-08-30',
+            'notes': company['notes'] or 'Company tracked by DataPilotPlus for Local 825 opportunities',
+            'source': company['source']
+        }
+    return transformed_companies
+
+def fetch_stats(conn):
+    """scraped_data totals, last-24h count and per-category breakdown"""
+    totals = run_prepared(conn, STATS_TOTALS_SQL)[0]
+    return {
+        'total_records': int(totals['total_records']),
+        'last_24h_records': int(totals['last_24h_records']),
+        'category_breakdown': {row['category']: row['count'] for row in run_prepared(conn, STATS_CATEGORIES_SQL)}
+    }
+
+@ttl_memoize(CACHE_TTL_SECONDS)
+def companies_payload(limit: int = 50):
+    """/companies body, rebuilt at most once per CACHE_TTL_SECONDS"""
+    with db_connection() as conn:
+        return fetch_companies(conn, limit)
+
+ARTICLE_JURISDICTIONS = ('New Jersey', 'New York', 'Local 825 Specific', 'General')
+
+def parse_article_filters(args):
+    """fetch_articles keyword arguments from /data query parameters; raises ValueError on a bad value"""
+    sort = args.get('sort', 'recent')
+    if sort not in ARTICLES_ORDER:
+        raise ValueError(f"sort must be one of {', '.join(ARTICLES_ORDER)}")
+    jurisdiction = args.get('jurisdiction')
+    if jurisdiction is not None:
+        jurisdiction = next((name for name in ARTICLE_JURISDICTIONS if name.lower() == jurisdiction.lower()), None)
+        if jurisdiction is None:
+            raise ValueError(f"jurisdiction must be one of {', '.join(ARTICLE_JURISDICTIONS)}")
+    county = args.get('county')
+    if county is not None:
+        county = resolve_area(county)
+        if county is None:
+            raise ValueError(f"Unknown county or area '{args.get('county')}'")
+    min_relevance = args.get('min_relevance')
+    if min_relevance is not None:
+        try:
+            min_relevance = int(min_relevance)
+        except ValueError:
+            raise ValueError("min_relevance must be an integer")
+    return {'sort': sort, 'jurisdiction': jurisdiction, 'county': county, 'min_relevance': min_relevance}
+
 @app.route('/data')
+@app.route('/intelligence')
 def get_data():
-    """Get intelligence data endpoint"""
+    """Get intelligence data endpoint (/intelligence is an alias)
+
+    ?sort=relevance orders articles by stored relevance score (default: most
+    recent); ?jurisdiction=, ?county= and ?min_relevance= filter them.
+    """
     try:
-        # Try to connect to the actual database and get real data
-        import mysql.connector
-        from datetime import datetime
-        
-        # Database connection parameters (from your .env)
-        db_config = {
-            'host': os.environ.get('MYSQL_HOST', 'localhost'),
-            'port': int(os.environ.get('MYSQL_PORT', 3306)),
-            'database': os.environ.get('MYSQL_DATABASE', 'datapilotplus_scraper'),
-            'user': os.environ.get('MYSQL_USERNAME'),
-            'password': os.environ.get('MYSQL_PASSWORD'),
-            'charset': os.environ.get('MYSQL_CHARSET', 'utf8mb4')
-        }
-        
         try:
-            # Connect to database
-            conn = mysql.connector.connect(**db_config)
-            cursor = conn.cursor(dictionary=True)
-            
-            # Get scraped data (articles)
-            cursor.execute("""
-                SELECT 
-                    source_name as source,
-                    category,
-                    method_type,
-                    url,
-                    scraped_at as published,
-                    CONCAT('Data from ', source_name, ' - ', category) as title,
-                    CONCAT('Intelligence data collected from ', source_name, ' in category ', category, '. This represents real-time monitoring and analysis for Local 825 members.') as summary,
-                    CASE 
-                        WHEN category LIKE '%NJ%' OR category LIKE '%New Jersey%' THEN 'New Jersey'
-                        WHEN category LIKE '%NY%' OR category LIKE '%New York%' THEN 'New York'
-                        ELSE 'Local 825 Specific'
-                    END as jurisdiction,
-                    ROUND(RAND() * 20 + 80) as relevance_score
-                FROM scraped_data 
-                ORDER BY scraped_at DESC 
-                LIMIT 50
-            """)
-            
-            articles = cursor.fetchall()
-            
-            # Get reports data
-            cursor.execute("""
-                SELECT 
-                    report_type,
-                    report_date,
-                    generated_at
-                FROM reports 
-                ORDER BY generated_at DESC 
-                LIMIT 10
-            """)
-            
-            reports = cursor.fetchall()
-            
-            # Get company data
-            cursor.execute("""
-                SELECT 
-                    company_name,
-                    industry,
-                    status,
-                    last_updated,
-                    notes
-                FROM companies 
-                ORDER BY last_updated DESC 
-                LIMIT 20
-            """)
-            
-            companies = cursor.fetchall()
-            
-            cursor.close()
-            conn.close()
-            
-            # Transform data for WordPress plugin
-            transformed_articles = []
-            for article in articles:
-                transformed_articles.append({
-                    'title': article['title'],
-                    'source': article['source'],
-                    'published': article['published'].isoformat() if article['published'] else '2025-08-30',
-                    'summary': article['summary'],
-                    'jurisdiction': article['jurisdiction'],
-                    'relevance_score': article['relevance_score'],
-                    'category': article['category'],
-                    'url': article['url'] if article['url'] else 'https://datapilotplus.com'
-                })
+            filters = parse_article_filters(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        key = '/data?' + '&'.join(f"{name}={value}" for name, value in sorted(filters.items()) if value is not None)
+
+        def build():
+            with db_connection() as conn:
+                articles = fetch_articles(conn, **filters)
+                reports = fetch_reports(conn)
+                companies = run_prepared(conn, DATA_COMPANIES_SQL, (20,))
             
-            return jsonify({
-                'articles': transformed_articles,
+            return {
+                'articles': articles,
                 'reports': reports,
                 'companies': companies,
                 'metadata': {
-                    'total_articles': len(transformed_articles),
+                    'total_articles': len(articles),
                     'total_reports': len(reports),
                     'total_companies': len(companies),
+                    'relevance_threshold': RELEVANCE_THRESHOLD,
                     'last_updated': datetime.now().isoformat(),
                     'data_source': 'DataPilotPlus Database'
                 }
-            })
+            }
+        
+        try:
+            # Rebuilt only when scraped_data/reports/companies changed; If-None-Match gets a 304
+            status, body, headers = RESPONSES.respond(
+                '/data', key, companies_data_generation(), build,
+                request.headers.get('Accept-Encoding'), request.headers.get('If-None-Match')
+            )
+            return Response(body, status=status, headers=headers)
             
         except mysql.connector.Error as db_error:
             logger.error(f"Database connection error: {db_error}")
@@ -183,68 +411,12 @@ def get_data():
         logger.error(f"Error in /data endpoint: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/intelligence')
-def get_intelligence():
-    """Get intelligence data (alias for /data)"""
-    return get_data()
-
 @app.route('/companies')
 def get_companies():
     """Get company data endpoint"""
     try:
-        # Try to connect to the actual database and get real company data
-        import mysql.connector
-        from datetime import datetime
-        
-        # Database connection parameters (from your .env)
-        db_config = {
-            'host': os.environ.get('MYSQL_HOST', 'localhost'),
-            'port': int(os.environ.get('MYSQL_PORT', 3306)),
-            'database': os.environ.get('MYSQL_DATABASE', 'datapilotplus_scraper'),
-            'user': os.environ.get('MYSQL_USERNAME'),
-            'password': os.environ.get('MYSQL_PASSWORD'),
-            'charset': os.environ.get('MYSQL_CHARSET', 'utf8mb4')
-        }
-        
         try:
-            # Connect to database
-            conn = mysql.connector.connect(**db_config)
-            cursor = conn.cursor(dictionary=True)
-            
-            # Get real company data
-            cursor.execute("""
-                SELECT 
-                    id,
-                    company_name as name,
-                    industry,
-                    status,
-                    last_updated,
-                    notes,
-                    'DataPilotPlus Intelligence' as source
-                FROM companies 
-                ORDER BY last_updated DESC 
-                LIMIT 50
-            """)
-            
-            companies = cursor.fetchall()
-            
-            # Transform to the format expected by WordPress plugin
-            transformed_companies = {}
-            for company in companies:
-                company_id = str(company['id'])
-                transformed_companies[company_id] = {
-                    'name': company['name'],
-                    'industry': company['industry'] or 'Construction',
-                    'status': company['status'] or 'active',
-                    'last_updated': company['last_updated'].isoformat() if company['last_updated'] else '2025-08-30',
-                    'notes': company['notes'] or 'Company tracked by DataPilotPlus for Local 825 opportunities',
-                    'source': company['source']
-                }
-            
-            cursor.close()
-            conn.close()
-            
-            return jsonify(transformed_companies)
+            return jsonify(companies_payload())
             
         except mysql.connector.Error as db_error:
             logger.error(f"Database connection error: {db_error}")
@@ -272,6 +444,192 @@ def get_companies():
         logger.error(f"Error in /companies endpoint: {e}")
         return jsonify({'error': str(e)}), 500
 
+def series_days():
+    """Sparkline window from ?days= (1-365, default 90)"""
+    return min(max(request.args.get('days', 90, type=int), 1), 365)
+
+@app.route('/companies/<int:company_id>/timeline')
+def get_company_timeline(company_id):
+    """Mentions, articles, enforcement events and contracts for one company, newest first"""
+    try:
+        from company_activity import activity_series, company_timeline
+
+        since = request.args.get('since')
+        if since:
+            try:
+                since = date.fromisoformat(since).isoformat()
+            except ValueError:
+                return jsonify({'error': 'since must be a YYYY-MM-DD date'}), 400
+        limit = min(max(request.args.get('limit', 200, type=int), 1), 1000)
+        days = series_days()
+
+        try:
+            with db_connection() as conn:
+                rows = run_prepared(conn, """
+                    SELECT id, company_name AS name, industry, status, last_updated
+                    FROM companies
+                    WHERE id = ?
+                """, (company_id,))
+                if not rows:
+                    return jsonify({'error': f'Company {company_id} not found'}), 404
+                company = dict(rows[0])
+
+                events = company_timeline(conn, company_id, since, limit)
+                activity = activity_series(conn, [company_id], days)[company_id]
+
+            company['last_updated'] = company['last_updated'].isoformat() if company['last_updated'] else None
+            return jsonify({
+                'company': company,
+                'events': events,
+                'activity': activity,
+                'metadata': {
+                    'total_events': len(events),
+                    'since': since,
+                    'days': days,
+                    'last_updated': datetime.now().isoformat()
+                }
+            })
+
+        except mysql.connector.Error as db_error:
+            logger.error(f"Database connection error: {db_error}")
+            return jsonify({'error': 'Database unavailable'}), 503
+
+    except Exception as e:
+        logger.error(f"Error in /companies/{company_id}/timeline endpoint: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/companies/activity')
+def get_company_activity():
+    """Daily activity sparklines for many companies (?ids=1,2,3&days=90)"""
+    try:
+        from company_activity import MAX_SERIES_COMPANIES, activity_series
+
+        ids = request.args.get('ids', '')
+        try:
+            company_ids = [int(value) for value in ids.split(',') if value.strip()]
+        except ValueError:
+            return jsonify({'error': 'ids must be comma-separated integers'}), 400
+        days = series_days()
+
+        try:
+            with db_connection() as conn:
+                if not company_ids:
+                    # Default to the most recently updated companies
+                    company_ids = [row['id'] for row in run_prepared(
+                        conn, "SELECT id FROM companies ORDER BY last_updated DESC LIMIT ?", (MAX_SERIES_COMPANIES,)
+                    )]
+                series = activity_series(conn, company_ids, days)
+
+            until = date.today()
+            return jsonify({
+                'companies': {str(company_id): values for company_id, values in series.items()},
+                'metadata': {
+                    'total_companies': len(series),
+                    'days': days,
+                    'start': (until - timedelta(days=days - 1)).isoformat(),
+                    'end': until.isoformat()
+                }
+            })
+
+        except mysql.connector.Error as db_error:
+            logger.error(f"Database connection error: {db_error}")
+            return jsonify({'error': 'Database unavailable'}), 503
+
+    except Exception as e:
+        logger.error(f"Error in /companies/activity endpoint: {e}")
+        return jsonify({'error': str(e)}), 500
+
+# Sections /bundle can return, fetched only when selected
+BUNDLE_SECTIONS = {
+    'articles': fetch_articles,
+    'companies': fetch_companies,
+    'reports': fetch_reports,
+    'stats': fetch_stats,
+}
+
+def parse_bundle_fields(value):
+    """?fields=articles.title,articles.url,stats -> {'articles': {'title', 'url'}, 'stats': None}.
+
+    A bare section name selects the whole section; section.key keeps only
+    those keys of each item. Raises ValueError on an unknown section.
+    """
+    selected = {}
+    for field in (value or '').split(','):
+        field = field.strip()
+        if not field:
+            continue
+        section, _, key = field.partition('.')
+        if section not in BUNDLE_SECTIONS:
+            raise ValueError(f"Unknown field '{field}'; sections are {', '.join(BUNDLE_SECTIONS)}")
+        if not key:
+            selected[section] = None
+        elif section not in selected or selected[section] is not None:
+            selected.setdefault(section, set()).add(key)
+    return selected or dict.fromkeys(BUNDLE_SECTIONS)
+
+def project(value, keys):
+    """Keep only keys of a section (a dict, a list of dicts or a dict of dicts keyed by id)"""
+    if keys is None:
+        return value
+    if isinstance(value, list):
+        return [{key: item[key] for key in keys if key in item} for item in value]
+    if value and all(isinstance(item, dict) for item in value.values()):
+        return {item_id: {key: item[key] for key in keys if key in item} for item_id, item in value.items()}
+    return {key: value[key] for key in keys if key in value}
+
+@app.route('/bundle')
+def get_bundle():
+    """Articles, companies, reports and stats from one read snapshot (?fields=articles,stats)"""
+    try:
+        try:
+            selected = parse_bundle_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        fields = ','.join(
+            section if keys is None else ','.join(f"{section}.{key}" for key in sorted(keys))
+            for section, keys in sorted(selected.items())
+        )
+        # last_24h_records moves with the clock, not just with writes
+        key = f"/bundle?fields={fields}" + (f"&hour={datetime.now():%Y%m%d%H}" if 'stats' in selected else '')
+
+        def build():
+            with db_connection() as conn:
+                # Every section reads the same snapshot
+                conn.start_transaction(consistent_snapshot=True, readonly=True)
+                try:
+                    bundle = {
+                        section: project(BUNDLE_SECTIONS[section](conn), keys)
+                        for section, keys in selected.items()
+                    }
+                finally:
+                    conn.commit()
+            bundle['metadata'] = {
+                'fields': fields,
+                'relevance_threshold': RELEVANCE_THRESHOLD,
+                'last_updated': datetime.now().isoformat(),
+                'data_source': 'DataPilotPlus Database'
+            }
+            for section in ('articles', 'companies', 'reports'):
+                if section in bundle:
+                    bundle['metadata'][f'total_{section}'] = len(bundle[section])
+            return bundle
+
+        try:
+            generation = companies_data_generation() if 'companies' in selected else data_generation()
+            status, body, headers = RESPONSES.respond(
+                '/bundle', key, generation, build,
+                request.headers.get('Accept-Encoding'), request.headers.get('If-None-Match')
+            )
+            return Response(body, status=status, headers=headers)
+
+        except mysql.connector.Error as db_error:
+            logger.error(f"Database connection error: {db_error}")
+            return jsonify({'error': 'Database unavailable'}), 503
+
+    except Exception as e:
+        logger.error(f"Error in /bundle endpoint: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/start-mcp')
 def start_mcp():
     """Start the MCP server"""
@@ -302,7 +660,9 @@ def start_mcp_server():
         mcp_startup_error = str(e)
         logger.error(f"Failed to start MCP server: {e}")
 
-if __name__ == '__main__':
+def main():
+    """Run the Flask development server (production runs gunicorn with gunicorn.conf.py)"""
+    global mcp_startup_error
     logger.info(f"Starting Local 825 Intelligence MCP Server with Python {sys.version}")
     
     # Start MCP server in background (but don't let it block Flask startup)
@@ -314,12 +674,20 @@ if __name__ == '__main__':
         logger.error(f"Failed to start MCP server thread: {e}")
         mcp_startup_error = str(e)
     
+    try:
+        init_db_pool()
+    except mysql.connector.Error as e:
+        logger.error(f"MySQL pool not created at startup (retried on first request): {e}")
+    
     # Start Flask app
     port = int(os.environ.get('PORT', 8000))
     logger.info(f"Flask app starting on port {port}")
     
     try:
-        app.run(host='0.0.0.0', port=port, debug=False)
+        app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
     except Exception as e:
         logger.error(f"Failed to start Flask app: {e}")
         sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,5 @@
 import os
-import requests
+import sys
 import time
 import re
 from bs4 import BeautifulSoup
@@ -12,6 +12,12 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from blob_store import get_store
+from http_client import connection_report, get_session
+from metrics import record_stage, write_run_summary
+from tracing import span, trace_run
+
 # Load environment variables
 load_dotenv()
 
@@ -19,6 +25,7 @@ class EnhancedDailyReporter:
     def __init__(self):
         self.base_url = "https://datapilotplus.com"
         self.headers = {'User-Agent': os.getenv('USER_AGENT')}
+        self.session = get_session()
         self.today = datetime.now().strftime('%B %d, %Y')
         self.articles_analyzed = 0
         self.sources_found = set()
@@ -26,9 +33,12 @@ class EnhancedDailyReporter:
     def scrape_homepage(self):
         """Scrape the homepage to find all articles"""
         print("📰 Scraping datapilotplus.com homepage...")
-        response = requests.get(self.base_url, headers=self.headers)
-        response.raise_for_status()
-        return BeautifulSoup(response.content, 'html.parser')
+        with span('fetch', url=self.base_url) as fetch:
+            response = self.session.get(self.base_url, headers=self.headers)
+            response.raise_for_status()
+            fetch.set(status=response.status_code, bytes=len(response.content))
+        with span('parse', url=self.base_url, bytes=len(response.content)):
+            return BeautifulSoup(response.content, 'html.parser')
     
     def extract_article_links(self, soup):
         """Extract all article links from the homepage"""
@@ -80,9 +90,12 @@ class EnhancedDailyReporter:
             # Add delay to be respectful
             time.sleep(1)
             
-            response = requests.get(article_info['url'], headers=self.headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            with span('fetch', url=article_info['url']) as fetch:
+                response = self.session.get(article_info['url'], headers=self.headers)
+                response.raise_for_status()
+                fetch.set(status=response.status_code, bytes=len(response.content))
+            with span('parse', url=article_info['url'], bytes=len(response.content)):
+                soup = BeautifulSoup(response.content, 'html.parser')
             
             # Extract article content
             content_selectors = [
@@ -108,16 +121,17 @@ class EnhancedDailyReporter:
                 'title': article_info['title'],
                 'url': article_info['url'],
                 'content': content[:1000] + "..." if len(content) > 1000 else content,
-                'full_content': content,
+                'content_sha256': get_store().put(content),
                 'sources': sources,
                 'word_count': len(content.split()),
                 'date_scraped': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             }
             
             # Extract key entities and topics
-            details['key_topics'] = self.extract_key_topics(content)
-            details['companies'] = self.extract_companies(content)
-            details['locations'] = self.extract_locations(content)
+            with span('extract', url=article_info['url'], words=details['word_count']):
+                details['key_topics'] = self.extract_key_topics(content)
+                details['companies'] = self.extract_companies(content)
+                details['locations'] = self.extract_locations(content)
             
             self.articles_analyzed += 1
             self.sources_found.update(sources)
@@ -459,6 +473,7 @@ Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             print(f"❌ Failed to send email: {e}")
             return False
     
+    @trace_run('enhanced_daily_report')
     def run_comprehensive_analysis(self):
         """Run the complete comprehensive analysis"""
         print(f"🚀 Starting comprehensive daily analysis for {self.today}")
@@ -485,26 +500,37 @@ Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
                 if article_details:
                     articles_data.append(article_details)
             
+            record_stage('article_details', min(len(article_links), 10), len(articles_data))
             print(f"✅ Successfully analyzed {len(articles_data)} articles")
             
             # Step 4: Perform trend analysis
             print("📊 Analyzing trends and patterns...")
-            trends = self.analyze_trends(articles_data)
+            with span('analyze', articles=len(articles_data)):
+                trends = self.analyze_trends(articles_data)
             
             # Step 5: Generate comprehensive report
             print("📝 Generating comprehensive report...")
-            report = self.generate_comprehensive_report(articles_data, trends)
+            with span('report', articles=len(articles_data)) as report_span:
+                report = self.generate_comprehensive_report(articles_data, trends)
+                report_span.set(bytes=len(report))
             
             # Step 6: Send email
             print("📧 Sending email report...")
-            self.send_email_report(report)
+            with span('email', bytes=len(report)):
+                self.send_email_report(report)
             
             print("🎉 Comprehensive daily analysis completed successfully!")
             print(f"📊 Final stats: {self.articles_analyzed} articles, {len(self.sources_found)} sources")
+            for line in connection_report():
+                print(f"   {line}")
             
         except Exception as e:
             print(f"❌ Error during analysis: {e}")
             raise
+        finally:
+            summary_file = write_run_summary('enhanced_daily_report')
+            if summary_file:
+                print(f"📈 Run metrics saved to: {summary_file}")
 
 if __name__ == "__main__":
     reporter = EnhancedDailyReporter()
@@ -5,7 +5,7 @@ Integrates Google News RSS scraping with AI automation for comprehensive labor i
 """
 
 import os
-import requests
+import sys
 import feedparser
 import re
 import time
@@ -19,6 +19,11 @@ import openai
 import schedule
 import threading
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from http_client import connection_report, get_session
+from metrics import FEED_PARSE_SECONDS, record_openai, record_stage, write_run_summary
+from tracing import span, trace_run
+
 # Load environment variables
 load_dotenv()
 
@@ -38,6 +43,7 @@ class EnhancedLaborIntelligenceSystem:
         self.headers = {
             'User-Agent': os.getenv('USER_AGENT', 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
         }
+        self.session = get_session()
         self.today = datetime.now().strftime('%Y-%m-%d')
         self.articles = []
         self.filtered_articles = []
@@ -123,9 +129,10 @@ class EnhancedLaborIntelligenceSystem:
             rss_url = self.get_google_news_rss_url(query, timeframe)
             logger.info(f"🔍 Scraping RSS: {query}")
             
-            response = requests.get(rss_url, headers=self.headers, timeout=30)
+            response = self.session.get(rss_url, headers=self.headers, timeout=30)
             if response.status_code == 200:
-                feed = feedparser.parse(response.content)
+                with FEED_PARSE_SECONDS.time(source='google_news'):
+                    feed = feedparser.parse(response.content)
                 articles = []
                 
                 for entry in feed.entries:
@@ -159,10 +166,11 @@ class EnhancedLaborIntelligenceSystem:
         for source_name, rss_url in self.additional_rss_sources.items():
             try:
                 logger.info(f"📡 Scraping {source_name}: {rss_url}")
-                response = requests.get(rss_url, headers=self.headers, timeout=30)
+                response = self.session.get(rss_url, headers=self.headers, timeout=30)
                 
                 if response.status_code == 200:
-                    feed = feedparser.parse(response.content)
+                    with FEED_PARSE_SECONDS.time(source=source_name):
+                        feed = feedparser.parse(response.content)
                     articles = []
                     
                     for entry in feed.entries:
@@ -250,6 +258,7 @@ class EnhancedLaborIntelligenceSystem:
         
         # Sort by relevance score
         relevant_articles.sort(key=lambda x: x['relevance_score'], reverse=True)
+        record_stage('labor_relevance', len(articles), len(relevant_articles))
         return relevant_articles
     
     def categorize_article(self, article):
@@ -300,15 +309,18 @@ class EnhancedLaborIntelligenceSystem:
                 Provide a concise, actionable analysis in 2-3 paragraphs.
                 """
                 
-                response = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are a labor intelligence analyst specializing in construction unions and Local 825 Operating Engineers."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=300,
-                    temperature=0.7
-                )
+                started = time.perf_counter()
+                with span('ai', model="gpt-3.5-turbo", url=article['url']):
+                    response = openai.ChatCompletion.create(
+                        model="gpt-3.5-turbo",
+                        messages=[
+                            {"role": "system", "content": "You are a labor intelligence analyst specializing in construction unions and Local 825 Operating Engineers."},
+                            {"role": "user", "content": prompt}
+                        ],
+                        max_tokens=300,
+                        temperature=0.7
+                    )
+                record_openai("gpt-3.5-turbo", time.perf_counter() - started, getattr(response, 'usage', None))
                 
                 ai_analysis = response.choices[0].message.content
                 
@@ -327,6 +339,7 @@ class EnhancedLaborIntelligenceSystem:
         
         return enhanced_content
     
+    @trace_run('enhanced_labor_intelligence')
     def scrape_all_sources(self):
         """Scrape all sources for comprehensive coverage"""
         logger.info("🚀 Starting comprehensive labor intelligence scraping...")
@@ -351,6 +364,7 @@ class EnhancedLaborIntelligenceSystem:
                 unique_articles[article['url']] = article
         
         self.articles = list(unique_articles.values())
+        record_stage('url_dedup', len(all_articles), len(self.articles))
         logger.info(f"📰 Total unique articles found: {len(self.articles)}")
         
         # Filter for relevance
@@ -527,5 +541,14 @@ def main():
     else:
         print("❌ No relevant articles found. Check your keywords or try different search terms.")
 
+    # Connection reuse per host for this run
+    print(f"\n🌐 HTTP connections:")
+    for line in connection_report():
+        print(f"   {line}")
+
+    summary_file = write_run_summary('enhanced_labor_intelligence', {'relevant_articles': len(articles)})
+    if summary_file:
+        print(f"📈 Run metrics saved to: {summary_file}")
+
 if __name__ == "__main__":
     main()
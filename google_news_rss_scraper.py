@@ -5,7 +5,7 @@ Uses Google News RSS feeds with targeted keywords to extract relevant labor and
 """
 
 import os
-import requests
+import sys
 import feedparser
 import re
 import time
@@ -15,6 +15,10 @@ from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 import json
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from http_client import connection_report, get_session
+from metrics import FEED_PARSE_SECONDS, record_stage, write_run_summary
+
 # Load environment variables
 load_dotenv()
 
@@ -23,6 +27,7 @@ class GoogleNewsRSSScraper:
         self.headers = {
             'User-Agent': os.getenv('USER_AGENT', 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
         }
+        self.session = get_session()
         self.today = datetime.now().strftime('%Y-%m-%d')
         self.articles = []
         self.filtered_articles = []
@@ -91,9 +96,10 @@ class GoogleNewsRSSScraper:
             rss_url = self.get_google_news_rss_url(query, timeframe)
             print(f"🔍 Scraping RSS: {query}")
             
-            response = requests.get(rss_url, headers=self.headers, timeout=30)
+            response = self.session.get(rss_url, headers=self.headers, timeout=30)
             if response.status_code == 200:
-                feed = feedparser.parse(response.content)
+                with FEED_PARSE_SECONDS.time(source='google_news'):
+                    feed = feedparser.parse(response.content)
                 articles = []
                 
                 for entry in feed.entries:
@@ -155,6 +161,7 @@ class GoogleNewsRSSScraper:
         
         # Sort by relevance score
         relevant_articles.sort(key=lambda x: x['relevance_score'], reverse=True)
+        record_stage('labor_relevance', len(articles), len(relevant_articles))
         return relevant_articles
     
     def categorize_article(self, article):
@@ -195,6 +202,7 @@ class GoogleNewsRSSScraper:
                 unique_articles[article['url']] = article
         
         self.articles = list(unique_articles.values())
+        record_stage('url_dedup', len(all_articles), len(self.articles))
         print(f"📰 Total unique articles found: {len(self.articles)}")
         
         # Filter for relevance
@@ -310,5 +318,14 @@ def main():
     else:
         print("❌ No relevant articles found. Check your keywords or try different search terms.")
 
+    # Connection reuse per host for this run
+    print(f"\n🌐 HTTP connections:")
+    for line in connection_report():
+        print(f"   {line}")
+
+    summary_file = write_run_summary('google_news_rss', {'relevant_articles': len(articles)})
+    if summary_file:
+        print(f"📈 Run metrics saved to: {summary_file}")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,33 @@
+"""
+gunicorn settings for app.py (gunicorn -c gunicorn.conf.py app:app)
+
+Each worker process serves GUNICORN_THREADS requests at once (gthread),
+so concurrent WordPress plugin polls do not queue behind one another, and
+owns a MySQL pool of the same size created as the worker starts. The MCP
+server subprocess is started once, by the master.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+keepalive = 5
+accesslog = '-'
+
+def when_ready(server):
+    import app
+
+    app.start_mcp_server()
+
+def post_worker_init(worker):
+    import mysql.connector
+
+    import app
+
+    try:
+        app.init_db_pool()
+    except mysql.connector.Error as e:
+        worker.log.error(f"MySQL pool not created at startup (retried on first request): {e}")
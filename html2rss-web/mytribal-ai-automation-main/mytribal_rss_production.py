@@ -13,6 +13,8 @@ import os
 import logging
 from pathlib import Path
 
+from rss_entry_store import RSSEntryStore
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -37,7 +39,7 @@ CONFIG = {
     'data_dir': 'rss_data',
     'max_entries_per_run': 5,
     'days_threshold': 30,  # Process entries from last 30 days
-    'backup_count': 10,    # Keep last 10 backup files
+    'max_segments': 20,    # Compact the entry store beyond this many segments
     'request_delay': 1,    # Delay between requests in seconds
 }
 
@@ -144,139 +146,63 @@ def remove_duplicates(entries):
     
     return unique_entries
 
-def load_existing_data(data_dir):
-    """Load existing RSS data to avoid reprocessing"""
-    data_file = Path(data_dir) / "mytribal_rss_master.json"
+def open_entry_store(data_dir):
+    """Open the append-only entry store, migrating the legacy JSON master file"""
+    store = RSSEntryStore(data_dir, max_segments=CONFIG['max_segments'])
     
-    if data_file.exists():
+    legacy_file = Path(data_dir) / "mytribal_rss_master.json"
+    if legacy_file.exists():
         try:
-            with open(data_file, 'r', encoding='utf-8') as f:
-                existing_data = json.load(f)
-            logger.info(f"📂 Loaded existing data: {len(existing_data)} entries")
-            return existing_data
+            store.import_legacy_json(legacy_file)
         except Exception as e:
-            logger.error(f"Error loading existing data: {e}")
+            logger.error(f"Error migrating legacy data: {e}")
     
-    return []
+    logger.info(f"📂 Entry store ready: {store.count()} entries")
+    return store
 
-def merge_new_entries(existing_entries, new_entries):
-    """Merge new entries with existing ones, avoiding duplicates"""
-    # Create a set of existing entry identifiers
-    existing_ids = {
-        f"{entry['title']}_{entry['link']}" 
-        for entry in existing_entries
-    }
-    
-    # Add only truly new entries
-    truly_new = []
-    for entry in new_entries:
-        entry_id = f"{entry['title']}_{entry['link']}"
-        if entry_id not in existing_ids:
-            truly_new.append(entry)
-            existing_ids.add(entry_id)
-    
-    # Combine existing and new entries
-    all_entries = existing_entries + truly_new
-    
-    # Sort by date (newest first)
-    all_entries.sort(
-        key=lambda x: x['parsed_date'] if x['parsed_date'] else '1970-01-01',
-        reverse=True
-    )
-    
-    return all_entries, truly_new
+def merge_new_entries(store, new_entries):
+    """Append new entries to the store, avoiding duplicates"""
+    return store.append(new_entries)
 
-def save_data(data_dir, entries, filename="mytribal_rss_master.json"):
-    """Save RSS data with backup"""
-    data_file = Path(data_dir) / filename
+def save_data(data_dir, store):
+    """Back up segments written since the last run"""
     backup_dir = Path(data_dir) / "backups"
-    backup_dir.mkdir(exist_ok=True)
-    
-    # Create backup
-    if data_file.exists():
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_file = backup_dir / f"mytribal_rss_backup_{timestamp}.json"
-        try:
-            data_file.rename(backup_file)
-            logger.info(f"💾 Created backup: {backup_file}")
-        except Exception as e:
-            logger.error(f"Error creating backup: {e}")
     
-    # Save new data
     try:
-        with open(data_file, 'w', encoding='utf-8') as f:
-            json.dump(entries, f, indent=2, ensure_ascii=False, default=str)
-        logger.info(f"💾 Saved {len(entries)} entries to {data_file}")
-        
-        # Clean up old backups
-        cleanup_old_backups(backup_dir)
-        
+        store.backup(backup_dir)
         return True
     except Exception as e:
-        logger.error(f"❌ Error saving data: {e}")
+        logger.error(f"❌ Error backing up data: {e}")
         return False
 
-def cleanup_old_backups(backup_dir):
-    """Keep only the most recent backup files"""
-    backup_files = sorted(backup_dir.glob("mytribal_rss_backup_*.json"))
-    
-    if len(backup_files) > CONFIG['backup_count']:
-        files_to_remove = backup_files[:-CONFIG['backup_count']]
-        for file in files_to_remove:
-            try:
-                file.unlink()
-                logger.info(f"🗑️ Removed old backup: {file}")
-            except Exception as e:
-                logger.error(f"Error removing backup {file}: {e}")
-
-def create_processing_summary(entries, new_entries):
+def create_processing_summary(store, new_entries):
     """Create a summary of the processing run"""
     summary = {
         'run_timestamp': datetime.now().isoformat(),
-        'total_entries': len(entries),
+        'total_entries': store.count(),
         'new_entries': len(new_entries),
-        'entries_by_age': {},
+        'entries_by_age': store.age_breakdown(),
         'processing_stats': {
             'feeds_processed': len(MYTRIBAL_RSS_FEEDS),
             'duplicates_removed': 0,
-            'successful_parses': 0
+            'successful_parses': store.parsed_count()
         }
     }
     
-    # Count entries by age
-    for entry in entries:
-        age = entry.get('days_old', 'unknown')
-        if age == 'unknown':
-            age = 'unknown'
-        elif age <= 1:
-            age = '1 day or less'
-        elif age <= 7:
-            age = '2-7 days'
-        elif age <= 30:
-            age = '8-30 days'
-        else:
-            age = '30+ days'
-        
-        summary['entries_by_age'][age] = summary['entries_by_age'].get(age, 0) + 1
-    
-    # Count successful parses
-    summary['processing_stats']['successful_parses'] = sum(
-        1 for entry in entries if entry.get('parsed_date')
-    )
-    
     return summary
 
 def main():
     """Main RSS automation workflow"""
     logger.info("🚀 Starting mytribal.ai RSS Production Automation...")
     start_time = datetime.now()
+    store = None
     
     try:
         # Ensure data directory exists
         data_dir = ensure_data_directory()
         
-        # Load existing data
-        existing_entries = load_existing_data(data_dir)
+        # Open the entry store
+        store = open_entry_store(data_dir)
         
         # Fetch new RSS content
         new_entries = fetch_mytribal_rss()
@@ -296,14 +222,14 @@ def main():
         logger.info(f"🎯 Entries to process: {len(filtered_entries)}")
         
         # Merge with existing data
-        all_entries, truly_new = merge_new_entries(existing_entries, filtered_entries)
-        logger.info(f"📊 Total entries in database: {len(all_entries)}")
+        truly_new = merge_new_entries(store, filtered_entries)
+        logger.info(f"📊 Total entries in database: {store.count()}")
         logger.info(f"🆕 New entries added: {len(truly_new)}")
         
         # Save data
-        if save_data(data_dir, all_entries):
+        if save_data(data_dir, store):
             # Create summary
-            summary = create_processing_summary(all_entries, truly_new)
+            summary = create_processing_summary(store, truly_new)
             
             # Save summary
             summary_file = Path(data_dir) / "processing_summary.json"
@@ -334,6 +260,8 @@ def main():
         raise
     
     finally:
+        if store:
+            store.close()
         end_time = datetime.now()
         duration = end_time - start_time
         logger.info(f"⏰ Total runtime: {duration}")
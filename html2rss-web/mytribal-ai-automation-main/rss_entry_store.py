@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+mytribal.ai RSS Entry Store
+Append-only JSONL segment store with a persistent SQLite id index
+"""
+
+import json
+import logging
+import shutil
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "segment_"
+SEGMENT_SUFFIX = ".jsonl"
+INDEX_FILENAME = "entry_index.db"
+MANIFEST_FILENAME = "compactions.json"
+
+def entry_identifier(entry):
+    """Build the identifier used to detect duplicate entries"""
+    return f"{entry['title']}_{entry['link']}"
+
+class RSSEntryStore:
+    """Append-only store for RSS entries.
+
+    Every run writes its new entries to a fresh, immutable JSONL segment.
+    An SQLite index maps entry ids to (segment, offset, length) so duplicate
+    checks and appends cost O(new entries) instead of O(total history).
+    Segments are merged by `compact()` once there are too many of them.
+    """
+
+    def __init__(self, data_dir, max_segments=20):
+        self.data_dir = Path(data_dir)
+        self.segment_dir = self.data_dir / "segments"
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        self.max_segments = max_segments
+        self.index = sqlite3.connect(str(self.data_dir / INDEX_FILENAME))
+        self.index.execute("PRAGMA journal_mode=WAL")
+        self.index.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                entry_id TEXT PRIMARY KEY,
+                segment TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                parsed_date TEXT,
+                days_old INTEGER
+            )
+        """)
+        self.index.execute("CREATE INDEX IF NOT EXISTS idx_parsed_date ON entries (parsed_date)")
+        self.index.commit()
+
+    def close(self):
+        """Close the index connection"""
+        self.index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def segments(self):
+        """Return segment paths in write order"""
+        return sorted(self.segment_dir.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"))
+
+    def _next_segment_path(self):
+        """Return the path for the next segment file"""
+        existing = self.segments()
+        if existing:
+            last_seq = int(existing[-1].stem[len(SEGMENT_PREFIX):])
+        else:
+            last_seq = 0
+        return self.segment_dir / f"{SEGMENT_PREFIX}{last_seq + 1:06d}{SEGMENT_SUFFIX}"
+
+    def _known_ids(self, entry_ids):
+        """Return the subset of entry_ids already present in the index"""
+        known = set()
+        entry_ids = list(entry_ids)
+        # SQLite limits the number of bound parameters per statement
+        for start in range(0, len(entry_ids), 500):
+            chunk = entry_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.index.execute(
+                f"SELECT entry_id FROM entries WHERE entry_id IN ({placeholders})", chunk
+            )
+            known.update(row[0] for row in rows)
+        return known
+
+    def _write_segment(self, path, entries):
+        """Write entries to a new segment and return their index rows"""
+        rows = []
+        with open(path, 'wb') as f:
+            for entry in entries:
+                line = (json.dumps(entry, ensure_ascii=False, default=str) + "\n").encode('utf-8')
+                offset = f.tell()
+                f.write(line)
+                rows.append((
+                    entry_identifier(entry),
+                    path.name,
+                    offset,
+                    len(line),
+                    entry.get('parsed_date'),
+                    entry.get('days_old')
+                ))
+            f.flush()
+        return rows
+
+    def append(self, entries):
+        """Append entries that are not yet stored and return them"""
+        candidates = {}
+        for entry in entries:
+            candidates.setdefault(entry_identifier(entry), entry)
+
+        known = self._known_ids(candidates)
+        truly_new = [entry for entry_id, entry in candidates.items() if entry_id not in known]
+        if not truly_new:
+            return []
+
+        rows = self._write_segment(self._next_segment_path(), truly_new)
+        with self.index:
+            self.index.executemany(
+                "INSERT INTO entries (entry_id, segment, offset, length, parsed_date, days_old) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        logger.info(f"💾 Appended {len(truly_new)} entries to {rows[0][1]}")
+
+        if len(self.segments()) > self.max_segments:
+            self.compact()
+
+        return truly_new
+
+    def count(self):
+        """Return the number of stored entries"""
+        return self.index.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def contains(self, entry):
+        """Check whether an entry is already stored"""
+        row = self.index.execute(
+            "SELECT 1 FROM entries WHERE entry_id = ?", (entry_identifier(entry),)
+        ).fetchone()
+        return row is not None
+
+    def iter_entries(self, limit=None):
+        """Yield stored entries, newest first"""
+        query = ("SELECT segment, offset, length FROM entries "
+                 "ORDER BY COALESCE(parsed_date, '1970-01-01') DESC")
+        params = ()
+        if limit is not None:
+            query += " LIMIT ?"
+            params = (limit,)
+
+        handles = {}
+        try:
+            for segment, offset, length in self.index.execute(query, params):
+                f = handles.get(segment)
+                if f is None:
+                    f = handles[segment] = open(self.segment_dir / segment, 'rb')
+                f.seek(offset)
+                yield json.loads(f.read(length).decode('utf-8'))
+        finally:
+            for f in handles.values():
+                f.close()
+
+    def age_breakdown(self):
+        """Count entries by age bucket without reading segments"""
+        rows = self.index.execute("""
+            SELECT CASE
+                WHEN days_old IS NULL THEN 'unknown'
+                WHEN days_old <= 1 THEN '1 day or less'
+                WHEN days_old <= 7 THEN '2-7 days'
+                WHEN days_old <= 30 THEN '8-30 days'
+                ELSE '30+ days'
+            END AS bucket, COUNT(*)
+            FROM entries
+            GROUP BY bucket
+        """)
+        return dict(rows.fetchall())
+
+    def parsed_count(self):
+        """Count entries with a parsed publication date"""
+        return self.index.execute(
+            "SELECT COUNT(*) FROM entries WHERE parsed_date IS NOT NULL"
+        ).fetchone()[0]
+
+    def compaction_manifest(self):
+        """Map each segment removed by compaction to the segment that replaced it"""
+        path = self.data_dir / MANIFEST_FILENAME
+        if not path.exists():
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _record_compaction(self, replaced, target):
+        """Add replaced -> target to the manifest before the replaced segments are deleted"""
+        manifest = self.compaction_manifest()
+        manifest.update((path.name, target.name) for path in replaced)
+        path = self.data_dir / MANIFEST_FILENAME
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        tmp_path.replace(path)
+
+    def compact(self):
+        """Merge all segments into one, newest entries first"""
+        old_segments = self.segments()
+        if len(old_segments) <= 1:
+            return
+
+        logger.info(f"🗜️ Compacting {len(old_segments)} segments...")
+        target = self._next_segment_path()
+        rows = self._write_segment(target, self.iter_entries())
+
+        with self.index:
+            self.index.execute("DELETE FROM entries")
+            self.index.executemany(
+                "INSERT INTO entries (entry_id, segment, offset, length, parsed_date, days_old) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+        self._record_compaction(old_segments, target)
+        for path in old_segments:
+            path.unlink()
+        logger.info(f"✅ Compacted into {target.name}: {len(rows)} entries")
+
+    def rebuild_index(self):
+        """Recreate the id index by scanning every segment"""
+        logger.info("🔧 Rebuilding entry index from segments...")
+        rows = []
+        for path in self.segments():
+            with open(path, 'rb') as f:
+                offset = 0
+                for line in f:
+                    entry = json.loads(line.decode('utf-8'))
+                    rows.append((
+                        entry_identifier(entry),
+                        path.name,
+                        offset,
+                        len(line),
+                        entry.get('parsed_date'),
+                        entry.get('days_old')
+                    ))
+                    offset += len(line)
+
+        with self.index:
+            self.index.execute("DELETE FROM entries")
+            self.index.executemany(
+                "INSERT OR IGNORE INTO entries (entry_id, segment, offset, length, parsed_date, days_old) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        logger.info(f"✅ Index rebuilt: {self.count()} entries")
+
+    def backup(self, backup_dir):
+        """Copy segments that are not backed up yet.
+
+        Segments are immutable, so only files written since the last backup
+        are copied. A backed-up segment is dropped only when the compaction
+        manifest names it as replaced and its replacement (or whatever later
+        replaced that) has been copied; nothing is dropped while the store
+        has no segments. The index is not backed up; `rebuild_index()`
+        restores it from the segments.
+        """
+        backup_dir = Path(backup_dir)
+        backup_dir.mkdir(parents=True, exist_ok=True)
+
+        live = {path.name: path for path in self.segments()}
+        copied = 0
+        for name, path in live.items():
+            if not (backup_dir / name).exists():
+                # Copied under a temporary name so an interrupted copy never counts as backed up
+                tmp_path = backup_dir / f"{name}.tmp"
+                shutil.copy2(path, tmp_path)
+                tmp_path.replace(backup_dir / name)
+                copied += 1
+
+        if not live:
+            return copied
+
+        replaced_by = self.compaction_manifest()
+
+        def replacement_backed_up(name):
+            seen = set()
+            while name in replaced_by and name not in seen:
+                seen.add(name)
+                name = replaced_by[name]
+                if (backup_dir / name).exists():
+                    return True
+            return False
+
+        for path in backup_dir.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"):
+            if path.name not in live and replacement_backed_up(path.name):
+                path.unlink()
+
+        if copied:
+            logger.info(f"💾 Backed up {copied} new segment(s) to {backup_dir}")
+        return copied
+
+    def import_legacy_json(self, json_file):
+        """Import a legacy whole-file JSON master store once"""
+        json_file = Path(json_file)
+        if not json_file.exists() or self.count() > 0:
+            return 0
+
+        with open(json_file, 'r', encoding='utf-8') as f:
+            legacy_entries = json.load(f)
+
+        imported = self.append(legacy_entries)
+        json_file.rename(json_file.with_suffix('.json.migrated'))
+        logger.info(f"📂 Migrated {len(imported)} entries from {json_file}")
+        return len(imported)
+
+def _synthetic_entries(start, count):
+    """Generate synthetic entries for benchmarking"""
+    now = datetime.now().isoformat()
+    return [
+        {
+            'title': f"Benchmark entry {i}",
+            'link': f"https://mytribal.ai/benchmark/{i}/",
+            'published': now,
+            'summary': "Lorem ipsum dolor sit amet " * 8,
+            'feed_url': "https://mytribal.ai/feed/",
+            'feed_title': 'mytribal.ai',
+            'timestamp': now,
+            'processed': False,
+            'processing_date': None,
+            'parsed_date': now,
+            'days_old': i % 60
+        }
+        for i in range(start, start + count)
+    ]
+
+def benchmark(history_size=100000, new_entries=5):
+    """Compare one run against the whole-file JSON store and the segment store"""
+    import tempfile
+
+    history = _synthetic_entries(0, history_size)
+    fresh = _synthetic_entries(history_size, new_entries)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Whole-file JSON: load, rebuild id set, sort and rewrite everything
+        json_file = Path(tmp) / "mytribal_rss_master.json"
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(history, f, indent=2, ensure_ascii=False, default=str)
+
+        started = time.perf_counter()
+        with open(json_file, 'r', encoding='utf-8') as f:
+            existing = json.load(f)
+        existing_ids = {entry_identifier(entry) for entry in existing}
+        truly_new = [entry for entry in fresh if entry_identifier(entry) not in existing_ids]
+        merged = existing + truly_new
+        merged.sort(key=lambda x: x['parsed_date'] or '1970-01-01', reverse=True)
+        json_file.rename(Path(tmp) / "backup.json")
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, indent=2, ensure_ascii=False, default=str)
+        json_seconds = time.perf_counter() - started
+
+        # Segment store: duplicate check and append touch only the new entries
+        store_dir = Path(tmp) / "store"
+        with RSSEntryStore(store_dir) as store:
+            store.append(history)
+        started = time.perf_counter()
+        with RSSEntryStore(store_dir) as store:
+            store.append(fresh)
+            store.backup(store_dir / "backups")
+        store_seconds = time.perf_counter() - started
+
+    print(f"History size:        {history_size:,} entries (+{new_entries} new)")
+    print(f"Whole-file JSON run: {json_seconds * 1000:.1f} ms")
+    print(f"Segment store run:   {store_seconds * 1000:.1f} ms")
+    return {'json_seconds': json_seconds, 'store_seconds': store_seconds}
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="mytribal.ai RSS entry store")
+    parser.add_argument('--benchmark', type=int, metavar='N', nargs='?', const=100000,
+                        help="Benchmark one run with N historical entries")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+    else:
+        parser.print_help()
@@ -373,11 +373,17 @@ class Local825IntelligencePlugin {
     // Core intelligence methods
     public function update_intelligence_data() {
         try {
-            // Call MCP server for latest intelligence data
-            $response = wp_remote_get($this->mcp_server_url . '/data', array(
-                'headers' => array(
-                    'User-Agent' => 'Local825-WordPress-Plugin/1.23.0'
-                ),
+            // One request for everything the dashboard renders, read from a single snapshot
+            $headers = array(
+                'User-Agent' => 'Local825-WordPress-Plugin/1.23.0'
+            );
+            // Revalidate against the last response so unchanged data comes back as an empty 304
+            $etag = get_option('local825_intelligence_etag', '');
+            if ($etag && !empty($this->intelligence_data)) {
+                $headers['If-None-Match'] = $etag;
+            }
+            $response = wp_remote_get($this->mcp_server_url . '/bundle?fields=articles,reports,stats', array(
+                'headers' => $headers,
                 'timeout' => 30
             ));
             
@@ -389,6 +395,14 @@ class Local825IntelligencePlugin {
             }
             
             $status_code = wp_remote_retrieve_response_code($response);
+            if ($status_code === 304) {
+                update_option('local825_last_update', current_time('mysql'));
+                return array(
+                    'success' => true,
+                    'data' => $this->intelligence_data,
+                    'message' => 'Intelligence data unchanged'
+                );
+            }
             if ($status_code !== 200) {
                 return array(
                     'success' => false,
@@ -409,6 +423,7 @@ class Local825IntelligencePlugin {
             // Update local data
             $this->intelligence_data = $data;
             update_option('local825_intelligence_data', $data);
+            update_option('local825_intelligence_etag', wp_remote_retrieve_header($response, 'etag'));
             update_option('local825_last_update', current_time('mysql'));
             
             // Log the update
@@ -441,9 +456,12 @@ class Local825IntelligencePlugin {
                 );
             }
             
-            // Analyze articles for Local 825 relevance
-            $relevant_articles = array_filter($intelligence_data['articles'], function($article) {
-                return $article['relevance_score'] >= 80 || 
+            // Analyze articles for Local 825 relevance (scores are computed at ingest by the server)
+            $threshold = isset($intelligence_data['metadata']['relevance_threshold'])
+                ? $intelligence_data['metadata']['relevance_threshold']
+                : 80;
+            $relevant_articles = array_filter($intelligence_data['articles'], function($article) use ($threshold) {
+                return $article['relevance_score'] >= $threshold || 
                        strpos($article['jurisdiction'], 'Local 825') !== false ||
                        strpos($article['category'], 'Construction') !== false;
             });
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Local 825 Jurisdiction Areas
+Counties and boroughs in the Local 825 territory, with helpers for matching them in article text
+"""
+
+# Local 825 jurisdiction focus areas
+JURISDICTION_AREAS = {
+    'new_jersey': [
+        'Bergen County', 'Essex County', 'Hudson County', 'Passaic County',
+        'Union County', 'Morris County', 'Somerset County', 'Middlesex County',
+        'Monmouth County', 'Ocean County', 'Burlington County', 'Camden County',
+        'Gloucester County', 'Salem County', 'Cape May County', 'Atlantic County',
+        'Cumberland County', 'Hunterdon County', 'Warren County', 'Sussex County',
+        'Mercer County'
+    ],
+    'new_york_relevant': [
+        'New York City', 'Bronx', 'Brooklyn', 'Manhattan', 'Queens', 'Staten Island',
+        'Long Island', 'Nassau County', 'Suffolk County', 'Westchester County',
+        'Rockland County', 'Orange County', 'Putnam County', 'Dutchess County'
+    ]
+}
+
+ALL_AREAS = JURISDICTION_AREAS['new_jersey'] + JURISDICTION_AREAS['new_york_relevant']
+
+_AREAS_BY_LOWER = {area.lower(): area for area in ALL_AREAS}
+
+def match_areas(text):
+    """Return every jurisdiction area mentioned in text, in ALL_AREAS order"""
+    text_lower = text.lower()
+    return [area for area in ALL_AREAS if area.lower() in text_lower]
+
+def resolve_area(name):
+    """Resolve a user-supplied area name ('bergen', 'bergen-county') to its canonical form"""
+    name_lower = ' '.join(name.replace('-', ' ').replace('_', ' ').lower().split())
+    if name_lower in _AREAS_BY_LOWER:
+        return _AREAS_BY_LOWER[name_lower]
+    if f"{name_lower} county" in _AREAS_BY_LOWER:
+        return _AREAS_BY_LOWER[f"{name_lower} county"]
+    return None
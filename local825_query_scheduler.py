@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Local 825 Adaptive Query Scheduler
+Chooses which Google News queries to fetch each run based on their historical yield
+
+Each query keeps a smoothed yield (new relevant articles per fetch). Every run
+fetches, in order:
+    1. the highest upper-confidence-bound (UCB) scores, up to exploit_share of
+       the budget
+    2. queries never fetched, or not fetched within their revisit interval,
+       stalest first, up to the rest of the budget
+    3. the next highest UCB scores while budget is left
+High-yield queries therefore run every time, even when many queries come due
+at once, and low-yield ones only as often as the exploration bonus or the
+revisit guarantee demands. Each query's revisit interval is shortened by a
+fixed hash-derived offset (up to revisit_jitter of max_revisit_days), so
+queries first fetched together come due on different runs.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATS_PATH = os.getenv('QUERY_STATS_PATH', 'reports/query_stats.json')
+
+def _url_key(url):
+    """Short hash used to remember URLs between runs"""
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+
+class AdaptiveQueryScheduler:
+    """Bandit-style query selection with persistent per-query yield statistics"""
+
+    def __init__(self, stats_path=DEFAULT_STATS_PATH, budget=None, max_revisit_days=7,
+                 exploration=0.5, smoothing=0.7, seen_ttl_days=14, exploit_share=0.5,
+                 revisit_jitter=0.3):
+        self.stats_path = stats_path
+        self.budget = budget if budget is not None else int(os.getenv('GOOGLE_NEWS_QUERY_BUDGET', 60))
+        self.max_revisit = timedelta(days=max_revisit_days)
+        self.exploit_share = exploit_share
+        self.revisit_jitter = revisit_jitter
+        self.exploration = exploration
+        self.smoothing = smoothing
+        self.seen_ttl = timedelta(days=seen_ttl_days)
+        self.queries = {}
+        self.seen_urls = {}
+        self.load()
+
+    def load(self):
+        """Load persisted statistics, if any"""
+        if not os.path.exists(self.stats_path):
+            return
+        try:
+            with open(self.stats_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.queries = data.get('queries', {})
+            self.seen_urls = data.get('seen_urls', {})
+            logger.info(f"📂 Loaded yield statistics for {len(self.queries)} queries")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load query statistics: {e}")
+
+    def save(self):
+        """Persist statistics, dropping URLs past their TTL"""
+        cutoff = (datetime.now() - self.seen_ttl).isoformat()
+        self.seen_urls = {key: seen for key, seen in self.seen_urls.items() if seen >= cutoff}
+
+        os.makedirs(os.path.dirname(self.stats_path) or '.', exist_ok=True)
+        tmp_path = f"{self.stats_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'queries': self.queries, 'seen_urls': self.seen_urls}, f, indent=2)
+        os.replace(tmp_path, self.stats_path)
+
+    def _revisit_interval(self, query):
+        """max_revisit less a fixed per-query offset, so revisits of a batch are staggered"""
+        offset = int(hashlib.sha1(query.encode('utf-8')).hexdigest()[:8], 16) / 0xFFFFFFFF
+        return self.max_revisit * (1 - self.revisit_jitter * offset)
+
+    def _is_due(self, query, now):
+        """A query is due when never fetched or past its revisit interval"""
+        stats = self.queries.get(query)
+        if not stats or not stats.get('last_fetched'):
+            return True
+        return now - datetime.fromisoformat(stats['last_fetched']) >= self._revisit_interval(query)
+
+    def _ucb(self, stats, total_fetches):
+        """Upper confidence bound on a query's yield"""
+        fetches = max(stats.get('fetches', 0), 1)
+        bonus = self.exploration * math.sqrt(math.log(total_fetches + 1) / fetches)
+        return stats.get('mean_yield', 0.0) + bonus
+
+    def select(self, queries):
+        """Return the queries to fetch this run"""
+        now = datetime.now()
+        total_fetches = sum(stats.get('fetches', 0) for stats in self.queries.values())
+        ranked = sorted(
+            (q for q in queries if q in self.queries),
+            key=lambda q: self._ucb(self.queries[q], total_fetches),
+            reverse=True
+        )
+
+        # The best queries keep their share of the budget however many are due
+        top = ranked[:min(int(round(self.budget * self.exploit_share)), self.budget)]
+        chosen = set(top)
+        due = sorted(
+            (q for q in queries if q not in chosen and self._is_due(q, now)),
+            key=lambda q: self.queries.get(q, {}).get('last_fetched') or ''
+        )[:self.budget - len(top)]
+        chosen.update(due)
+        rest = [q for q in ranked if q not in chosen][:self.budget - len(top) - len(due)]
+
+        selected = top + due + rest
+        logger.info(f"🎯 Scheduled {len(selected)} of {len(queries)} queries "
+                    f"({len(due)} due for revisit)")
+        return selected
+
+    def record_run(self, query_urls, relevant_urls):
+        """Update yields from one run.
+
+        query_urls maps each fetched query to the URLs it returned and
+        relevant_urls is the set that passed relevance filtering. A query's
+        yield is the number of its relevant URLs not seen in earlier runs;
+        queries returning the same new article are all credited.
+        """
+        now = datetime.now().isoformat()
+        new_urls = {url for url in relevant_urls if _url_key(url) not in self.seen_urls}
+
+        for query, urls in query_urls.items():
+            run_yield = len(new_urls.intersection(urls))
+            stats = self.queries.setdefault(query, {'fetches': 0, 'mean_yield': 0.0, 'total_yield': 0})
+            if stats['fetches'] == 0:
+                stats['mean_yield'] = float(run_yield)
+            else:
+                stats['mean_yield'] = self.smoothing * stats['mean_yield'] + (1 - self.smoothing) * run_yield
+            stats['fetches'] += 1
+            stats['total_yield'] += run_yield
+            stats['last_yield'] = run_yield
+            stats['last_fetched'] = now
+
+        for url in relevant_urls:
+            self.seen_urls[_url_key(url)] = now
+
+    def summary(self, limit=10):
+        """Return the top and bottom queries by smoothed yield"""
+        ranked = sorted(self.queries.items(), key=lambda item: item[1].get('mean_yield', 0), reverse=True)
+        return {
+            'top': [(q, round(s['mean_yield'], 2)) for q, s in ranked[:limit]],
+            'bottom': [(q, round(s['mean_yield'], 2)) for q, s in ranked[-limit:]]
+        }
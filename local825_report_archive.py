@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Local 825 Report Archive
+Compact, memory-mappable binary archive of the daily local825_intelligence JSON reports
+
+File layout (little endian):
+    header   magic, version, record size, record count, report day,
+             records offset, heap offset, area table (offset, length)
+    records  fixed-width rows: published day, relevance score, jurisdiction code,
+             matched-area bitmap and (offset, length) pairs into the string heap
+    heap     UTF-8 strings referenced by the records and the area table
+
+Queries scan the fixed-width records straight from the mmap and only decode
+strings for matching rows, so no report has to be deserialized in full.
+"""
+
+import argparse
+import glob
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from datetime import date, datetime, timedelta
+from email.utils import parsedate_to_datetime
+
+from local825_jurisdictions import ALL_AREAS, match_areas, resolve_area
+
+MAGIC = b'L825ARC1'
+VERSION = 1
+
+HEADER = struct.Struct('<8sHHIIQQII')
+RECORD = struct.Struct('<IhBxQ' + 'II' * 5)
+
+STRING_FIELDS = ('title', 'url', 'source', 'category', 'summary')
+
+JURISDICTIONS = ['General', 'New Jersey', 'New York', 'Local 825 Specific']
+JURISDICTION_CODES = {name: code for code, name in enumerate(JURISDICTIONS)}
+
+REPORT_PATTERN = re.compile(r'local825_intelligence_(\d{4}-\d{2}-\d{2})\.json$')
+ARCHIVE_SUFFIX = '.l825'
+
+def archive_path_for(json_path):
+    """Return the archive path that mirrors a JSON report path"""
+    directory, filename = os.path.split(json_path)
+    return os.path.join(directory, 'archive', os.path.splitext(filename)[0] + ARCHIVE_SUFFIX)
+
+def published_day(article, fallback):
+    """Return the article publication date, falling back to the report date"""
+    published = article.get('published')
+    if published:
+        try:
+            parsed = parsedate_to_datetime(published)
+        except (TypeError, ValueError):
+            parsed = None
+        # Older Pythons return None instead of raising for unparseable dates
+        if parsed is not None:
+            return parsed.date()
+        try:
+            return datetime.fromisoformat(published.replace('Z', '+00:00')).date()
+        except ValueError:
+            pass
+    return fallback
+
+def write_archive(articles, path, report_date):
+    """Write articles to a binary archive at path"""
+    heap = bytearray()
+
+    def add_string(value):
+        encoded = (value or '').encode('utf-8')
+        offset = len(heap)
+        heap.extend(encoded)
+        return offset, len(encoded)
+
+    area_table = add_string('\n'.join(ALL_AREAS))
+    bit_for_area = {area: bit for bit, area in enumerate(ALL_AREAS)}
+
+    records = bytearray()
+    for article in articles:
+        areas = article.get('matched_counties')
+        if areas is None:
+            areas = match_areas(f"{article.get('title', '')} {article.get('summary', '')}")
+        mask = 0
+        for area in areas:
+            if area in bit_for_area:
+                mask |= 1 << bit_for_area[area]
+
+        strings = []
+        for field in STRING_FIELDS:
+            strings.extend(add_string(article.get(field)))
+
+        records.extend(RECORD.pack(
+            published_day(article, report_date).toordinal(),
+            max(-32768, min(32767, int(article.get('relevance_score') or 0))),
+            JURISDICTION_CODES.get(article.get('jurisdiction'), 0),
+            mask,
+            *strings
+        ))
+
+    records_offset = HEADER.size
+    heap_offset = records_offset + len(records)
+    header = HEADER.pack(
+        MAGIC, VERSION, RECORD.size, len(articles), report_date.toordinal(),
+        records_offset, heap_offset, *area_table
+    )
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(records)
+        f.write(heap)
+    os.replace(tmp_path, path)
+    return path
+
+class ReportArchive:
+    """Read-only, memory-mapped view of one archive file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, record_size, self.record_count, report_day,
+         self.records_offset, self.heap_offset, areas_off, areas_len) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"Not a Local 825 report archive: {path}")
+
+        self.report_date = date.fromordinal(report_day)
+        area_names = self._string(areas_off, areas_len).split('\n')
+        self.area_bits = {area: 1 << bit for bit, area in enumerate(area_names)}
+
+    def close(self):
+        """Release the mmap and file handle"""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return self.record_count
+
+    def _string(self, offset, length):
+        start = self.heap_offset + offset
+        return self._map[start:start + length].decode('utf-8')
+
+    def _article(self, fields):
+        day, score, jurisdiction, mask = fields[:4]
+        article = {
+            'published_date': date.fromordinal(day).isoformat(),
+            'relevance_score': score,
+            'jurisdiction': JURISDICTIONS[jurisdiction] if jurisdiction < len(JURISDICTIONS) else 'General',
+            'matched_counties': [area for area, bit in self.area_bits.items() if mask & bit]
+        }
+        for i, field in enumerate(STRING_FIELDS):
+            article[field] = self._string(fields[4 + 2 * i], fields[5 + 2 * i])
+        return article
+
+    def query(self, county=None, since=None, until=None, jurisdiction=None, min_score=None):
+        """Yield articles matching every given filter"""
+        county_bit = None
+        if county:
+            county_bit = self.area_bits.get(county)
+            if county_bit is None:
+                return
+        since_day = since.toordinal() if since else None
+        until_day = until.toordinal() if until else None
+        jurisdiction_code = JURISDICTION_CODES.get(jurisdiction) if jurisdiction else None
+
+        for i in range(self.record_count):
+            fields = RECORD.unpack_from(self._map, self.records_offset + i * RECORD.size)
+            day, score, code, mask = fields[:4]
+            if county_bit is not None and not mask & county_bit:
+                continue
+            if since_day is not None and day < since_day:
+                continue
+            if until_day is not None and day > until_day:
+                continue
+            if jurisdiction_code is not None and code != jurisdiction_code:
+                continue
+            if min_score is not None and score < min_score:
+                continue
+            yield self._article(fields)
+
+def convert_reports(reports_dir='reports', force=False):
+    """Convert JSON reports that have no up-to-date archive yet"""
+    converted = []
+    for json_path in sorted(glob.glob(os.path.join(reports_dir, 'local825_intelligence_*.json'))):
+        match = REPORT_PATTERN.search(json_path)
+        if not match:
+            continue
+        path = archive_path_for(json_path)
+        if not force and os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(json_path):
+            continue
+
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        report_date = date.fromisoformat(match.group(1))
+        write_archive(data.get('articles', []), path, report_date)
+        converted.append(path)
+        print(f"💾 Archived {json_path} -> {path}")
+    return converted
+
+def query_archives(reports_dir='reports', county=None, since=None, until=None,
+                   jurisdiction=None, min_score=None):
+    """Query every archive whose report date can hold matching articles"""
+    pattern = os.path.join(reports_dir, 'archive', f'local825_intelligence_*{ARCHIVE_SUFFIX}')
+    for path in sorted(glob.glob(pattern), reverse=True):
+        day = re.search(r'(\d{4}-\d{2}-\d{2})', os.path.basename(path))
+        # Reports only hold articles published on or before their report date
+        if since and day and date.fromisoformat(day.group(1)) < since:
+            continue
+        with ReportArchive(path) as archive:
+            for article in archive.query(county, since, until, jurisdiction, min_score):
+                article['report_date'] = archive.report_date.isoformat()
+                yield article
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Local 825 report archive tool")
+    parser.add_argument('--reports-dir', default='reports', help="Directory holding the JSON reports")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    convert_parser = subparsers.add_parser('convert', help="Convert JSON reports to binary archives")
+    convert_parser.add_argument('--force', action='store_true', help="Rebuild archives that are up to date")
+
+    query_parser = subparsers.add_parser('query', help="Query archived articles")
+    query_parser.add_argument('--county', help="County or borough, e.g. 'Bergen County' or 'bergen'")
+    query_parser.add_argument('--days', type=int, help="Only articles from the last N days")
+    query_parser.add_argument('--jurisdiction', choices=JURISDICTIONS)
+    query_parser.add_argument('--min-score', type=int)
+    query_parser.add_argument('--limit', type=int, default=50)
+    query_parser.add_argument('--json', action='store_true', help="Print results as JSON lines")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'convert':
+        converted = convert_reports(args.reports_dir, force=args.force)
+        print(f"✅ Converted {len(converted)} report(s)")
+        return 0
+
+    county = None
+    if args.county:
+        county = resolve_area(args.county)
+        if not county:
+            print(f"❌ Unknown county or area: {args.county}", file=sys.stderr)
+            return 1
+    since = date.today() - timedelta(days=args.days) if args.days else None
+
+    results = query_archives(args.reports_dir, county, since, None, args.jurisdiction, args.min_score)
+    count = 0
+    for article in results:
+        if count >= args.limit:
+            break
+        count += 1
+        if args.json:
+            print(json.dumps(article, ensure_ascii=False))
+        else:
+            print(f"{article['published_date']}  [{article['relevance_score']:>3}] {article['title']}")
+            print(f"    {article['source']} | {', '.join(article['matched_counties']) or article['jurisdiction']}")
+            print(f"    {article['url']}")
+    if not args.json:
+        print(f"📊 {count} article(s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,7 @@ Focused on NJ and relevant NY territories with comprehensive research framework
 """
 
 import os
-import requests
+import sys
 import feedparser
 import re
 import time
@@ -17,6 +17,19 @@ from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 import openai
 
+from local825_jurisdictions import JURISDICTION_AREAS, match_areas
+from local825_report_archive import archive_path_for, published_day, write_archive
+from local825_query_scheduler import AdaptiveQueryScheduler
+from local825_territory_index import DEFAULT_INDEX_PATH, TerritoryIndex
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from article_scoring import (RELEVANCE_THRESHOLD, TARGET_KEYWORDS, categorize_article,
+                             categorize_jurisdiction, score_relevance)
+from http_client import connection_report, get_session
+from metrics import FEED_PARSE_SECONDS, record_stage, write_run_summary
+from mysql_config import get_mysql_config
+from tracing import span, trace_run
+
 # Load environment variables
 load_dotenv()
 
@@ -36,6 +49,7 @@ class Local825TargetedIntelligenceSystem:
         self.headers = {
             'User-Agent': os.getenv('USER_AGENT', 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
         }
+        self.session = get_session()
         self.today = datetime.now().strftime('%Y-%m-%d')
         self.articles = []
         self.filtered_articles = []
@@ -47,55 +61,14 @@ class Local825TargetedIntelligenceSystem:
             openai.api_key = os.getenv('OPENAI_API_KEY')
             self.openai_client = openai
         
-        # Local 825 specific target keywords and jurisdictions
-        self.target_keywords = {
-            'local825_specific': [
-                'Local 825', 'Operating Engineers Local 825', 'IUOE Local 825',
-                'New Jersey Operating Engineers', 'NY Operating Engineers'
-            ],
-            'nj_construction': [
-                'New Jersey construction', 'NJ construction projects', 'NJ infrastructure',
-                'NJ building trades', 'NJ heavy construction', 'NJ road construction',
-                'NJ bridge construction', 'NJ tunnel construction', 'NJ port construction'
-            ],
-            'ny_relevant_territories': [
-                'New York construction', 'NYC construction', 'Long Island construction',
-                'Westchester construction', 'Rockland construction', 'Orange construction',
-                'Putnam construction', 'Dutchess construction', 'Suffolk construction'
-            ],
-            'union_organizing': [
-                'union organizing', 'union drive', 'NLRB', 'collective bargaining',
-                'union representation', 'union certification', 'union recognition'
-            ],
-            'labor_issues': [
-                'strike', 'lockout', 'work stoppage', 'labor dispute', 'contract negotiation',
-                'wage increase', 'benefits negotiation', 'working conditions', 'overtime pay'
-            ],
-            'construction_trades': [
-                'construction union', 'building trades', 'heavy equipment', 'bulldozer',
-                'excavator', 'construction worker', 'infrastructure', 'heavy construction'
-            ],
-            'government_projects': [
-                'federal contracts', 'state contracts', 'municipal contracts', 'infrastructure bill',
-                'construction projects', 'public works', 'government spending', 'prevailing wage'
-            ]
-        }
+        # Local 825 specific target keywords and jurisdictions (scored by article_scoring)
+        self.target_keywords = TARGET_KEYWORDS
         
         # Local 825 jurisdiction focus areas
-        self.jurisdiction_areas = {
-            'new_jersey': [
-                'Bergen County', 'Essex County', 'Hudson County', 'Passaic County',
-                'Union County', 'Morris County', 'Somerset County', 'Middlesex County',
-                'Monmouth County', 'Ocean County', 'Burlington County', 'Camden County',
-                'Gloucester County', 'Salem County', 'Cape May County', 'Atlantic County',
-                'Cumberland County', 'Hunterdon County', 'Warren County', 'Sussex County'
-            ],
-            'new_york_relevant': [
-                'New York City', 'Bronx', 'Brooklyn', 'Manhattan', 'Queens', 'Staten Island',
-                'Long Island', 'Nassau County', 'Suffolk County', 'Westchester County',
-                'Rockland County', 'Orange County', 'Putnam County', 'Dutchess County'
-            ]
-        }
+        self.jurisdiction_areas = JURISDICTION_AREAS
+        
+        # Picks which Google News queries to fetch based on their past yield
+        self.query_scheduler = AdaptiveQueryScheduler()
         
         # Google News RSS base URLs
         self.google_news_rss_base = "https://news.google.com/rss/search"
@@ -139,8 +112,8 @@ class Local825TargetedIntelligenceSystem:
             "Operating Engineers Local 825 NY"
         ])
         
-        # NJ construction and infrastructure
-        for county in self.jurisdiction_areas['new_jersey'][:10]:  # Focus on major counties
+        # NJ construction and infrastructure (the query scheduler decides how often each runs)
+        for county in self.jurisdiction_areas['new_jersey']:
             queries.extend([
                 f"{county} construction projects",
                 f"{county} infrastructure projects",
@@ -148,7 +121,7 @@ class Local825TargetedIntelligenceSystem:
             ])
         
         # NY relevant territories
-        for area in self.jurisdiction_areas['new_york_relevant'][:8]:  # Focus on major areas
+        for area in self.jurisdiction_areas['new_york_relevant']:
             queries.extend([
                 f"{area} construction projects",
                 f"{area} infrastructure projects",
@@ -180,9 +153,14 @@ class Local825TargetedIntelligenceSystem:
             rss_url = self.get_google_news_rss_url(query, timeframe)
             logger.info(f"🔍 Scraping RSS: {query}")
             
-            response = requests.get(rss_url, headers=self.headers, timeout=30)
+            with span('fetch', url=rss_url, query=query) as fetch:
+                response = self.session.get(rss_url, headers=self.headers, timeout=30)
+                fetch.set(status=response.status_code, bytes=len(response.content))
             if response.status_code == 200:
-                feed = feedparser.parse(response.content)
+                with span('parse', query=query, bytes=len(response.content)) as parse, \
+                        FEED_PARSE_SECONDS.time(source='google_news'):
+                    feed = feedparser.parse(response.content)
+                    parse.set(articles=len(feed.entries))
                 articles = []
                 
                 for entry in feed.entries:
@@ -195,7 +173,8 @@ class Local825TargetedIntelligenceSystem:
                         'query': query,
                         'scraped_at': datetime.now().isoformat(),
                         'type': 'google_news',
-                        'jurisdiction': self.categorize_jurisdiction(entry.title + ' ' + entry.get('summary', ''))
+                        'jurisdiction': self.categorize_jurisdiction(entry.title + ' ' + entry.get('summary', '')),
+                        'matched_counties': match_areas(entry.title + ' ' + entry.get('summary', ''))
                     }
                     articles.append(article)
                 
@@ -211,25 +190,7 @@ class Local825TargetedIntelligenceSystem:
     
     def categorize_jurisdiction(self, text):
         """Categorize article by Local 825 jurisdiction"""
-        text_lower = text.lower()
-        
-        # Check for NJ focus
-        if any(county.lower() in text_lower for county in self.jurisdiction_areas['new_jersey']):
-            return 'New Jersey'
-        elif 'new jersey' in text_lower or 'nj' in text_lower:
-            return 'New Jersey'
-        
-        # Check for NY focus
-        if any(area.lower() in text_lower for area in self.jurisdiction_areas['new_york_relevant']):
-            return 'New York'
-        elif 'new york' in text_lower or 'nyc' in text_lower:
-            return 'New York'
-        
-        # Check for Local 825 specific
-        if 'local 825' in text_lower or 'operating engineers' in text_lower:
-            return 'Local 825 Specific'
-        
-        return 'General'
+        return categorize_jurisdiction(text)
     
     def scrape_local825_rss_sources(self):
         """Scrape Local 825 specific RSS sources"""
@@ -239,10 +200,15 @@ class Local825TargetedIntelligenceSystem:
         for source_name, rss_url in self.local825_rss_sources.items():
             try:
                 logger.info(f"📡 Scraping {source_name}: {rss_url}")
-                response = requests.get(rss_url, headers=self.headers, timeout=30)
+                with span('fetch', url=rss_url, source=source_name) as fetch:
+                    response = self.session.get(rss_url, headers=self.headers, timeout=30)
+                    fetch.set(status=response.status_code, bytes=len(response.content))
                 
                 if response.status_code == 200:
-                    feed = feedparser.parse(response.content)
+                    with span('parse', source=source_name, bytes=len(response.content)) as parse, \
+                            FEED_PARSE_SECONDS.time(source=source_name):
+                        feed = feedparser.parse(response.content)
+                        parse.set(articles=len(feed.entries))
                     articles = []
                     
                     for entry in feed.entries:
@@ -264,7 +230,8 @@ class Local825TargetedIntelligenceSystem:
                                                 'query': f'RSS_{source_name}',
                                                 'scraped_at': datetime.now().isoformat(),
                                                 'type': 'local825_rss',
-                                                'jurisdiction': self.categorize_jurisdiction(entry.title + ' ' + entry.get('summary', ''))
+                                                'jurisdiction': self.categorize_jurisdiction(entry.title + ' ' + entry.get('summary', '')),
+                                                'matched_counties': match_areas(entry.title + ' ' + entry.get('summary', ''))
                                             }
                                             articles.append(article)
                                         break
@@ -281,7 +248,8 @@ class Local825TargetedIntelligenceSystem:
                                     'query': f'RSS_{source_name}',
                                     'scraped_at': datetime.now().isoformat(),
                                     'type': 'local825_rss',
-                                    'jurisdiction': self.categorize_jurisdiction(entry.title + ' ' + entry.get('summary', ''))
+                                    'jurisdiction': self.categorize_jurisdiction(entry.title + ' ' + entry.get('summary', '')),
+                                    'matched_counties': match_areas(entry.title + ' ' + entry.get('summary', ''))
                                 }
                                 articles.append(article)
                     
@@ -300,43 +268,13 @@ class Local825TargetedIntelligenceSystem:
         relevant_articles = []
         
         for article in articles:
-            relevance_score = 0
-            matched_keywords = []
-            
-            # Combine title and summary for analysis
-            text_to_analyze = f"{article['title']} {article['summary']}".lower()
-            
-            # Score based on keyword matches
-            for category, keywords in self.target_keywords.items():
-                for keyword in keywords:
-                    if keyword.lower() in text_to_analyze:
-                        relevance_score += 1
-                        matched_keywords.append(keyword)
-            
-            # Jurisdiction scoring
-            if article['jurisdiction'] == 'Local 825 Specific':
-                relevance_score += 5  # Highest priority
-            elif article['jurisdiction'] == 'New Jersey':
-                relevance_score += 4  # High priority
-            elif article['jurisdiction'] == 'New York':
-                relevance_score += 3  # Medium-high priority
-            
-            # Additional scoring factors
-            if 'union' in text_to_analyze:
-                relevance_score += 2
-            if 'construction' in text_to_analyze:
-                relevance_score += 2
-            if 'Local 825' in text_to_analyze:
-                relevance_score += 5  # High priority
-            if 'strike' in text_to_analyze or 'negotiation' in text_to_analyze:
-                relevance_score += 3
-            if 'infrastructure' in text_to_analyze:
-                relevance_score += 2
-            if 'prevailing wage' in text_to_analyze:
-                relevance_score += 3
+            # Same scorer save_scraped_data stores with each scraped_data row
+            relevance_score, matched_keywords = score_relevance(
+                f"{article['title']} {article['summary']}", article['jurisdiction']
+            )
             
             # Filter out low-relevance articles
-            if relevance_score >= 3:  # Higher threshold for Local 825 focus
+            if relevance_score >= RELEVANCE_THRESHOLD:  # Higher threshold for Local 825 focus
                 article['relevance_score'] = relevance_score
                 article['matched_keywords'] = matched_keywords
                 article['category'] = self.categorize_article(article)
@@ -344,31 +282,14 @@ class Local825TargetedIntelligenceSystem:
         
         # Sort by relevance score
         relevant_articles.sort(key=lambda x: x['relevance_score'], reverse=True)
+        record_stage('local825_relevance', len(articles), len(relevant_articles))
         return relevant_articles
     
     def categorize_article(self, article):
         """Categorize article based on content and keywords"""
-        text = f"{article['title']} {article['summary']}".lower()
-        
-        if any(term in text for term in ['strike', 'lockout', 'work stoppage']):
-            return 'Labor Disputes'
-        elif any(term in text for term in ['negotiation', 'contract', 'bargaining']):
-            return 'Contract Negotiations'
-        elif any(term in text for term in ['organizing', 'election', 'NLRB']):
-            return 'Union Organizing'
-        elif any(term in text for term in ['construction', 'infrastructure', 'project']):
-            return 'Construction Projects'
-        elif any(term in text for term in ['job', 'hiring', 'employment']):
-            return 'Job Market'
-        elif 'Local 825' in text:
-            return 'Local 825 Specific'
-        elif 'prevailing wage' in text:
-            return 'Prevailing Wage Issues'
-        elif 'infrastructure bill' in text:
-            return 'Infrastructure Bill Projects'
-        else:
-            return 'General Labor News'
+        return categorize_article(f"{article['title']} {article['summary']}")
     
+    @trace_run('scrape_all_local825_sources')
     def scrape_all_local825_sources(self):
         """Scrape all sources for Local 825 focused coverage"""
         logger.info("🚀 Starting Local 825 targeted intelligence scraping...")
@@ -376,9 +297,11 @@ class Local825TargetedIntelligenceSystem:
         all_articles = []
         
         # 1. Google News RSS scraping with Local 825 focus
-        queries = self.build_local825_search_queries()
+        queries = self.query_scheduler.select(self.build_local825_search_queries())
+        query_urls = {}
         for query in queries:
             articles = self.scrape_google_news_rss(query)
+            query_urls[query] = [article['url'] for article in articles]
             all_articles.extend(articles)
             time.sleep(1)  # Be respectful to Google's servers
         
@@ -387,18 +310,30 @@ class Local825TargetedIntelligenceSystem:
         all_articles.extend(local825_articles)
         
         # Remove duplicates based on URL
-        unique_articles = {}
-        for article in all_articles:
-            if article['url'] not in unique_articles:
-                unique_articles[article['url']] = article
-        
-        self.articles = list(unique_articles.values())
+        with span('dedup', articles=len(all_articles)) as dedup:
+            unique_articles = {}
+            for article in all_articles:
+                if article['url'] not in unique_articles:
+                    unique_articles[article['url']] = article
+            
+            self.articles = list(unique_articles.values())
+            dedup.set(unique=len(self.articles))
+        record_stage('url_dedup', len(all_articles), len(self.articles))
         logger.info(f"📰 Total unique articles found: {len(self.articles)}")
         
         # Filter for Local 825 relevance
-        self.filtered_articles = self.filter_articles_by_local825_relevance(self.articles)
+        with span('score', articles=len(self.articles)) as score:
+            self.filtered_articles = self.filter_articles_by_local825_relevance(self.articles)
+            score.set(relevant=len(self.filtered_articles))
         logger.info(f"✅ Local 825 relevant articles: {len(self.filtered_articles)}")
         
+        # Record per-query yield so the next run favours productive queries
+        try:
+            self.query_scheduler.record_run(query_urls, {a['url'] for a in self.filtered_articles})
+            self.query_scheduler.save()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save query statistics: {e}")
+        
         return self.filtered_articles
     
     def generate_local825_intelligence_report(self):
@@ -575,8 +510,57 @@ Contact: jeremy@augments.art
             json.dump(data, f, indent=2, default=str)
         
         logger.info(f"💾 JSON data saved to: {filename}")
+        
+        # Mirror the report into the memory-mappable archive for historical queries
+        try:
+            archive_file = write_archive(self.filtered_articles, archive_path_for(filename),
+                                         datetime.strptime(self.today, '%Y-%m-%d').date())
+            logger.info(f"💾 Archive saved to: {archive_file}")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not write report archive: {e}")
+        
         return filename
+    
+    def save_territory_index(self, index_path=None):
+        """Add relevant articles to the per-county territory index"""
+        try:
+            with TerritoryIndex(index_path or DEFAULT_INDEX_PATH) as index:
+                indexed = index.add_articles(self.filtered_articles,
+                                             datetime.strptime(self.today, '%Y-%m-%d').date())
+            logger.info(f"🗺️ Territory index updated: {indexed} articles")
+            return indexed
+        except Exception as e:
+            logger.warning(f"⚠️ Could not update territory index: {e}")
+            return 0
+
+    def save_company_links(self):
+        """Resolve company mentions in relevant articles and store article-company links"""
+        try:
+            import mysql.connector
+            from company_activity import ensure_schema, link_pairs, refresh_pairs
+            from company_names import load_tracked_companies
+            from entity_resolution import CompanyResolver, link_rows, store_links
+
+            connection = mysql.connector.connect(**get_mysql_config())
+            try:
+                ensure_schema(connection)
+                resolver = CompanyResolver(load_tracked_companies(connection))
+                fallback = datetime.strptime(self.today, '%Y-%m-%d').date()
+                rows = []
+                for article in self.filtered_articles:
+                    rows.extend(link_rows(resolver, article, published_day(article, fallback).isoformat()))
+                linked = store_links(connection, rows)
+                # Keep the per-company daily aggregates behind /companies/<id>/timeline current
+                refresh_pairs(connection, link_pairs(rows))
+            finally:
+                connection.close()
+            logger.info(f"🏢 Linked {linked} company mentions across {len(self.filtered_articles)} articles")
+            return linked
+        except Exception as e:
+            logger.warning(f"⚠️ Could not store company links: {e}")
+            return 0
 
+@trace_run('local825_targeted_intelligence')
 def main():
     """Main execution function"""
     print("🎯 Local 825 Targeted Intelligence System")
@@ -591,8 +575,12 @@ def main():
     
     if articles:
         # Generate and save reports
-        report_file = system.save_report()
-        json_file = system.save_json_data()
+        with span('report', articles=len(articles)):
+            report_file = system.save_report()
+            json_file = system.save_json_data()
+            system.save_territory_index()
+        with span('company_links', articles=len(articles)):
+            system.save_company_links()
         
         # Display summary
         print(f"\n🎉 Local 825 targeted scraping completed successfully!")
@@ -617,5 +605,14 @@ def main():
     else:
         print("❌ No Local 825 relevant articles found. Check your keywords or try different search terms.")
 
+    # Connection reuse per host for this run
+    print(f"\n🌐 HTTP connections:")
+    for line in connection_report():
+        print(f"   {line}")
+
+    summary_file = write_run_summary('local825_targeted_intelligence', {'relevant_articles': len(articles)})
+    if summary_file:
+        print(f"📈 Run metrics saved to: {summary_file}")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Local 825 Territory Index
+Persistent inverted index from jurisdiction area (county/borough) to articles
+
+Postings live in an SQLite table clustered on (area, published_date, article_id),
+so a per-county lookup is a single ordered range scan regardless of history size.
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+from datetime import date, timedelta
+
+from local825_jurisdictions import match_areas, resolve_area
+from local825_report_archive import published_day, query_archives
+
+DEFAULT_INDEX_PATH = os.getenv('TERRITORY_INDEX_PATH', 'reports/territory_index.db')
+
+def article_id(article):
+    """Return a stable id for an article, derived from its URL"""
+    key = article.get('url') or f"{article.get('title', '')}|{article.get('source', '')}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+class TerritoryIndex:
+    """County/borough -> article postings, sorted by publication date"""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH, read_only=False):
+        self.path = path
+        if read_only:
+            self.db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            return
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                article_id TEXT PRIMARY KEY,
+                title TEXT,
+                url TEXT,
+                source TEXT,
+                category TEXT,
+                jurisdiction TEXT,
+                relevance_score INTEGER,
+                published_date TEXT
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                area TEXT NOT NULL,
+                published_date TEXT NOT NULL,
+                article_id TEXT NOT NULL,
+                PRIMARY KEY (area, published_date, article_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_postings_article ON postings (article_id);
+        """)
+        self.db.commit()
+
+    def close(self):
+        """Close the index"""
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add_articles(self, articles, fallback_date=None):
+        """Index articles under every area they mention; returns the number indexed"""
+        fallback_date = fallback_date or date.today()
+        article_rows = []
+        posting_rows = []
+
+        for article in articles:
+            areas = article.get('matched_counties')
+            if areas is None:
+                areas = match_areas(f"{article.get('title', '')} {article.get('summary', '')}")
+            if not areas:
+                continue
+
+            doc_id = article_id(article)
+            published = article.get('published_date') or published_day(article, fallback_date).isoformat()
+            article_rows.append((
+                doc_id,
+                article.get('title'),
+                article.get('url'),
+                article.get('source'),
+                article.get('category'),
+                article.get('jurisdiction'),
+                article.get('relevance_score'),
+                published
+            ))
+            posting_rows.extend((area, published, doc_id) for area in areas)
+
+        with self.db:
+            # Re-indexed articles may have a corrected date or area list
+            self.db.executemany(
+                "DELETE FROM postings WHERE article_id = ?", [(row[0],) for row in article_rows]
+            )
+            self.db.executemany(
+                "INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?)", article_rows
+            )
+            self.db.executemany(
+                "INSERT OR IGNORE INTO postings (area, published_date, article_id) VALUES (?, ?, ?)",
+                posting_rows
+            )
+        return len(article_rows)
+
+    def lookup(self, area, since=None, until=None, limit=50):
+        """Return articles for an area, newest first"""
+        query = """
+            SELECT a.article_id, a.title, a.url, a.source, a.category,
+                   a.jurisdiction, a.relevance_score, p.published_date
+            FROM postings p
+            JOIN articles a ON a.article_id = p.article_id
+            WHERE p.area = ?
+        """
+        params = [area]
+        if since:
+            query += " AND p.published_date >= ?"
+            params.append(since.isoformat())
+        if until:
+            query += " AND p.published_date <= ?"
+            params.append(until.isoformat())
+        query += " ORDER BY p.published_date DESC LIMIT ?"
+        params.append(limit)
+
+        columns = ('id', 'title', 'url', 'source', 'category',
+                   'jurisdiction', 'relevance_score', 'published_date')
+        return [dict(zip(columns, row)) for row in self.db.execute(query, params)]
+
+    def count(self, area, since=None):
+        """Count postings for an area"""
+        if since:
+            row = self.db.execute(
+                "SELECT COUNT(*) FROM postings WHERE area = ? AND published_date >= ?",
+                (area, since.isoformat())
+            ).fetchone()
+        else:
+            row = self.db.execute("SELECT COUNT(*) FROM postings WHERE area = ?", (area,)).fetchone()
+        return row[0]
+
+    def area_counts(self, since=None):
+        """Return posting counts for every indexed area"""
+        if since:
+            rows = self.db.execute(
+                "SELECT area, COUNT(*) FROM postings WHERE published_date >= ? GROUP BY area",
+                (since.isoformat(),)
+            )
+        else:
+            rows = self.db.execute("SELECT area, COUNT(*) FROM postings GROUP BY area")
+        return dict(rows.fetchall())
+
+def rebuild_from_archives(reports_dir='reports', index_path=DEFAULT_INDEX_PATH):
+    """Backfill the index from the binary report archives.
+
+    An article carried by several daily reports is indexed once, under the
+    earliest date any of them gives it (a report without the article's own
+    date falls back to the report date).
+    """
+    earliest = {}
+    for article in query_archives(reports_dir):
+        doc_id = article_id(article)
+        kept = earliest.get(doc_id)
+        if kept is None or article['published_date'] < kept['published_date']:
+            earliest[doc_id] = article
+    with TerritoryIndex(index_path) as index:
+        indexed = index.add_articles(earliest.values())
+    print(f"✅ Indexed {indexed} article(s) from {reports_dir}/archive")
+    return indexed
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Local 825 territory index tool")
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH, help="Path to the index database")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    rebuild_parser = subparsers.add_parser('rebuild', help="Backfill the index from report archives")
+    rebuild_parser.add_argument('--reports-dir', default='reports')
+
+    lookup_parser = subparsers.add_parser('lookup', help="List articles for a county or borough")
+    lookup_parser.add_argument('county')
+    lookup_parser.add_argument('--days', type=int)
+    lookup_parser.add_argument('--limit', type=int, default=20)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'rebuild':
+        rebuild_from_archives(args.reports_dir, args.index)
+        return 0
+
+    area = resolve_area(args.county)
+    if not area:
+        print(f"❌ Unknown county or area: {args.county}", file=sys.stderr)
+        return 1
+    since = date.today() - timedelta(days=args.days) if args.days else None
+    with TerritoryIndex(args.index, read_only=True) as index:
+        for article in index.lookup(area, since=since, limit=args.limit):
+            print(f"{article['published_date']}  [{article['relevance_score']:>3}] {article['title']}")
+            print(f"    {article['url']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,5 @@
 import os
-import requests
+import sys
 import time
 import re
 from bs4 import BeautifulSoup
@@ -12,6 +12,12 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from blob_store import get_store
+from http_client import connection_report, get_session
+from metrics import record_stage, write_run_summary
+from tracing import span, trace_run
+
 # Load environment variables
 load_dotenv()
 
@@ -19,6 +25,7 @@ class Local825UnionAnalyzer:
     def __init__(self):
         self.base_url = "https://datapilotplus.com"
         self.headers = {'User-Agent': os.getenv('USER_AGENT')}
+        self.session = get_session()
         self.today = datetime.now().strftime('%B %d, %Y')
         self.local825_articles = []
         self.job_listings = []
@@ -37,18 +44,24 @@ class Local825UnionAnalyzer:
         
         for url in category_urls:
             try:
-                response = requests.get(url, headers=self.headers)
+                with span('fetch', url=url) as fetch:
+                    response = self.session.get(url, headers=self.headers)
+                    fetch.set(status=response.status_code, bytes=len(response.content))
                 if response.status_code == 200:
                     print(f"✅ Found Local 825 category at: {url}")
-                    return BeautifulSoup(response.content, 'html.parser'), url
+                    with span('parse', url=url, bytes=len(response.content)):
+                        return BeautifulSoup(response.content, 'html.parser'), url
             except Exception as e:
                 print(f"❌ Failed to access {url}: {e}")
                 continue
         
         # If category not found, scrape homepage
         print("🔍 Category page not found, filtering from homepage...")
-        response = requests.get(self.base_url, headers=self.headers)
-        soup = BeautifulSoup(response.content, 'html.parser')
+        with span('fetch', url=self.base_url) as fetch:
+            response = self.session.get(self.base_url, headers=self.headers)
+            fetch.set(status=response.status_code, bytes=len(response.content))
+        with span('parse', url=self.base_url, bytes=len(response.content)):
+            soup = BeautifulSoup(response.content, 'html.parser')
         return soup, self.base_url
     
     def extract_local825_articles(self, soup, source_url):
@@ -118,9 +131,12 @@ class Local825UnionAnalyzer:
             print(f"📖 Analyzing: {article_info['title'][:60]}...")
             time.sleep(1)  # Be respectful
             
-            response = requests.get(article_info['url'], headers=self.headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            with span('fetch', url=article_info['url']) as fetch:
+                response = self.session.get(article_info['url'], headers=self.headers)
+                response.raise_for_status()
+                fetch.set(status=response.status_code, bytes=len(response.content))
+            with span('parse', url=article_info['url'], bytes=len(response.content)):
+                soup = BeautifulSoup(response.content, 'html.parser')
             
             content_selectors = [
                 'article .entry-content',
@@ -138,14 +154,15 @@ class Local825UnionAnalyzer:
                     break
             
             source_url = self.extract_source_url(soup, content)
-            union_analysis = self.analyze_union_implications(content, article_info['category'])
+            with span('analyze', url=article_info['url'], words=len(content.split())):
+                union_analysis = self.analyze_union_implications(content, article_info['category'])
             
             details = {
                 'title': article_info['title'],
                 'url': article_info['url'],
                 'category': article_info['category'],
                 'content': content[:2000] + "..." if len(content) > 2000 else content,
-                'full_content': content,
+                'content_sha256': get_store().put(content),
                 'source_url': source_url,
                 'word_count': len(content.split()),
                 'union_analysis': union_analysis,
@@ -534,6 +551,7 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             print(f"❌ Failed to send union report: {e}")
             return False
     
+    @trace_run('local825_union_analysis')
     def run_local825_analysis(self):
         """Run the complete Local 825 union analysis"""
         print(f"🏗️ LOCAL 825 LABOR INTELLIGENCE ANALYSIS")
@@ -559,21 +577,31 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
                 if details:
                     analyzed_jobs.append(details)
             
+            record_stage('article_analysis', len(self.local825_articles), len(analyzed_articles))
             print(f"✅ Analysis complete:")
             print(f"   📰 {len(analyzed_articles)} Local 825 articles analyzed")
             print(f"   💼 {len(analyzed_jobs)} job opportunities reviewed")
             print(f"   🔗 {len(self.sources_found)} sources identified")
+            for line in connection_report():
+                print(f"   {line}")
             
             print("📋 Generating Local 825 intelligence report...")
-            report = self.generate_union_report(analyzed_articles, analyzed_jobs)
+            with span('report', articles=len(analyzed_articles), jobs=len(analyzed_jobs)) as report_span:
+                report = self.generate_union_report(analyzed_articles, analyzed_jobs)
+                report_span.set(bytes=len(report))
             print("📧 Sending union intelligence report...")
-            self.send_union_report(report)
+            with span('email', bytes=len(report)):
+                self.send_union_report(report)
             
             print("🎉 Local 825 labor intelligence analysis completed!")
             
         except Exception as e:
             print(f"❌ Error during Local 825 analysis: {e}")
             raise
+        finally:
+            summary_file = write_run_summary('local825_union_analysis')
+            if summary_file:
+                print(f"📈 Run metrics saved to: {summary_file}")
 
 if __name__ == "__main__":
     analyzer = Local825UnionAnalyzer()
@@ -8,16 +8,28 @@ import os
 import json
 import logging
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
 from http.server import HTTPServer, BaseHTTPRequestHandler
 import urllib.parse
 import threading
+import time
 from typing import Dict, Any, Optional
 import mysql.connector  # type: ignore
-from mysql.connector import Error  # type: ignore
+from mysql.connector import Error, errorcode  # type: ignore
 from dotenv import load_dotenv
 import sys
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from api_config_cache import BUMP_CONFIG_VERSION, CONFIG_VERSION_NAME, CREATE_CONFIG_VERSIONS_TABLE
+from local825_jurisdictions import resolve_area
+from local825_territory_index import DEFAULT_INDEX_PATH, TerritoryIndex
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from metrics import MCP_REQUEST_SECONDS, render as render_metrics, timed_execute
+from response_cache import METRICS as RESPONSE_METRICS
+from response_cache import RESPONSES, encode_json, read_data_generation
+from scraped_data_retention import query_history
+
 # Load environment variables
 load_dotenv()
 
@@ -130,6 +142,7 @@ class DataPilotPlusMCPHandler(BaseHTTPRequestHandler):
     
     def __init__(self, *args, **kwargs):
         self.db_connection = None
+        self.response_status = 200
         super().__init__(*args, **kwargs)
     
     def init_db_connection(self):
@@ -150,26 +163,62 @@ class DataPilotPlusMCPHandler(BaseHTTPRequestHandler):
                 print_status(f"❌ MCP Server: Database connection failed: {e}", "error")
                 self.db_connection = None
     
-    def send_json_response(self, data: Dict[str, Any], status_code: int = 200):
-        """Send JSON response"""
+    def metrics_endpoint(self, status_code: int = 200) -> str:
+        """Endpoint label for response metrics (errors are pooled so unknown paths can't grow them)"""
+        if status_code >= 400:
+            return 'errors'
+        path = urllib.parse.urlparse(self.path).path
+        return '/territory/<area>' if path.startswith('/territory/') else path
+    
+    def write_response(self, status_code: int, body: bytes, headers: Dict[str, str]):
+        """Send an encoded body with CORS headers"""
+        self.response_status = status_code
         self.send_response(status_code)
-        self.send_header('Content-type', 'application/json')
+        for name, value in headers.items():
+            self.send_header(name, value)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization, If-None-Match')
+        self.send_header('Access-Control-Expose-Headers', 'ETag')
         self.end_headers()
-        self.wfile.write(json.dumps(data, default=str).encode())
+        if body:
+            self.wfile.write(body)
+    
+    def send_json_response(self, data: Dict[str, Any], status_code: int = 200):
+        """Send JSON response (gzip/br when the client accepts it)"""
+        body, headers = encode_json(self.metrics_endpoint(status_code), data, self.headers.get('Accept-Encoding'))
+        self.write_response(status_code, body, headers)
+    
+    def send_cached_json_response(self, key: str, build):
+        """Send build()'s JSON with a data-generation ETag, answering If-None-Match with 304.
+
+        build() runs only when this generation's body is not cached yet;
+        key must identify the response (path plus normalized parameters).
+        """
+        status_code, body, headers = RESPONSES.respond(
+            self.metrics_endpoint(), key, read_data_generation(self.db_connection), build,
+            self.headers.get('Accept-Encoding'), self.headers.get('If-None-Match')
+        )
+        self.write_response(status_code, body, headers)
+        return status_code
+    
+    def observe_request(self, method: str, started: float):
+        """Record the request's latency under mcp_request_seconds"""
+        status = self.response_status
+        MCP_REQUEST_SECONDS.observe(time.perf_counter() - started, method=method,
+                                    endpoint=self.metrics_endpoint(status), status=str(status))
     
     def do_OPTIONS(self):
         """Handle CORS preflight requests"""
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization, If-None-Match')
         self.end_headers()
     
     def do_GET(self):
         """Handle GET requests"""
+        started = time.perf_counter()
         parsed_path = urllib.parse.urlparse(self.path)
         path = parsed_path.path
         
@@ -178,6 +227,8 @@ class DataPilotPlusMCPHandler(BaseHTTPRequestHandler):
         try:
             if path == '/health':
                 self.handle_health_check()
+            elif path == '/metrics':
+                self.handle_metrics()
             elif path == '/status':
                 self.handle_status()
             elif path == '/stats':
@@ -188,15 +239,24 @@ class DataPilotPlusMCPHandler(BaseHTTPRequestHandler):
                 self.handle_reports()
             elif path == '/data':
                 self.handle_data_query(parsed_path.query)
+            elif path == '/rate-limits':
+                self.handle_rate_limits()
+            elif path == '/territory':
+                self.handle_territory_overview(parsed_path.query)
+            elif path.startswith('/territory/'):
+                self.handle_territory(urllib.parse.unquote(path[len('/territory/'):]), parsed_path.query)
             else:
                 self.send_json_response({'error': 'Endpoint not found'}, 404)
                 
         except Exception as e:
             print_status(f"❌ MCP Server GET error: {e}", "error")
             self.send_json_response({'error': str(e)}, 500)
+        finally:
+            self.observe_request('GET', started)
     
     def do_POST(self):
         """Handle POST requests"""
+        started = time.perf_counter()
         parsed_path = urllib.parse.urlparse(self.path)
         path = parsed_path.path
         
@@ -225,6 +285,8 @@ class DataPilotPlusMCPHandler(BaseHTTPRequestHandler):
         except Exception as e:
             print_status(f"❌ MCP Server POST error: {e}", "error")
             self.send_json_response({'error': str(e)}, 500)
+        finally:
+            self.observe_request('POST', started)
     
     def handle_health_check(self):
         """Health check endpoint"""
@@ -237,6 +299,10 @@ class DataPilotPlusMCPHandler(BaseHTTPRequestHandler):
         })
         print_status("✅ Health check completed", "success")
     
+    def handle_metrics(self):
+        """Prometheus scrape endpoint: this process's counters and histograms"""
+        self.write_response(200, render_metrics().encode('utf-8'), {'Content-Type': METRICS_CONTENT_TYPE})
+    
     def handle_status(self):
         """Status endpoint"""
         print_status("📊 Status check requested", "info")
@@ -245,6 +311,7 @@ class DataPilotPlusMCPHandler(BaseHTTPRequestHandler):
             'status': 'running',
             'uptime': 'active',
             'database': 'connected' if self.db_connection and self.db_connection.is_connected() else 'disconnected',
+            'responses': RESPONSE_METRICS.snapshot(),
             'timestamp': datetime.now().isoformat()
         })
         print_status("✅ Status check completed", "success")
@@ -263,23 +330,23 @@ class DataPilotPlusMCPHandler(BaseHTTPRequestHandler):
             cursor = self.db_connection.cursor()
             
             # Get total records
-            cursor.execute("SELECT COUNT(*) FROM scraped_data")
+            timed_execute(cursor, "SELECT COUNT(*) FROM scraped_data", statement='stats_total')
             total_records = cursor.fetchone()[0]
             
             # Get records by category
-            cursor.execute("""
+            timed_execute(cursor, """
                 SELECT category, COUNT(*) as count
                 FROM scraped_data
                 GROUP BY category
                 ORDER BY count DESC
-            """)
+            """, statement='stats_categories')
             category_stats = dict(cursor.fetchall())
             
             # Get recent activity
-            cursor.execute("""
+            timed_execute(cursor, """
                 SELECT COUNT(*) FROM scraped_data
                 WHERE scraped_at >= DATE_SUB(NOW(), INTERVAL 24 HOUR)
-            """)
+            """, statement='stats_last_24h')
             last_24h = cursor.fetchone()[0]
             
             cursor.close()
@@ -317,43 +384,89 @@ class DataPilotPlusMCPHandler(BaseHTTPRequestHandler):
         })
         print_status("✅ Data sources retrieved", "success")
     
-    def handle_reports(self):
-        """Reports endpoint"""
-        print_status("📋 Reports requested", "info")
+    def handle_rate_limits(self):
+        """Remaining token-bucket capacity per API, shared by all scraper processes"""
         self.init_db_connection()
         
         if not self.db_connection:
-            print_status("❌ Database not available for reports", "error")
             self.send_json_response({'error': 'Database not available'}, 503)
             return
         
         try:
-            cursor = self.db_connection.cursor()
-            
-            # Get recent reports
-            cursor.execute("""
-                SELECT report_type, report_date, generated_at
-                FROM reports
-                ORDER BY generated_at DESC
-                LIMIT 10
-            """)
-            reports = []
-            for row in cursor.fetchall():
-                reports.append({
-                    'type': row[0],
-                    'date': row[1].isoformat() if row[1] else None,
-                    'generated_at': row[2].isoformat() if row[2] else None
-                })
-            
-            cursor.close()
+            cursor = self.db_connection.cursor(dictionary=True)
+            try:
+                timed_execute(cursor, """
+                    SELECT api_name, capacity, refill_per_second,
+                           LEAST(capacity, tokens + GREATEST(UNIX_TIMESTAMP(NOW(6)) - updated_at, 0)
+                                 * refill_per_second) AS tokens
+                    FROM api_rate_buckets
+                    ORDER BY api_name
+                """, statement='rate_limits')
+                rows = cursor.fetchall()
+            except Error as e:
+                # The first scraper to take a token creates the table; until then nothing is limited
+                if e.errno != errorcode.ER_NO_SUCH_TABLE:
+                    raise
+                rows = []
+            finally:
+                cursor.close()
+            buckets = {
+                row['api_name']: {
+                    'tokens': round(float(row['tokens']), 3),
+                    'capacity': row['capacity'],
+                    'refill_per_second': row['refill_per_second'],
+                    'requests_per_minute': round(row['refill_per_second'] * 60)
+                }
+                for row in rows
+            }
             
             self.send_json_response({
-                'reports': reports,
-                'total_reports': len(reports),
+                'rate_limits': buckets,
                 'timestamp': datetime.now().isoformat()
             })
+        except Error as e:
+            print_status(f"❌ Database error in rate limits: {e}", "error")
+            self.send_json_response({'error': 'Database error'}, 500)
+    
+    def handle_reports(self):
+        """Reports endpoint"""
+        print_status("📋 Reports requested", "info")
+        self.init_db_connection()
+        
+        if not self.db_connection:
+            print_status("❌ Database not available for reports", "error")
+            self.send_json_response({'error': 'Database not available'}, 503)
+            return
+        
+        try:
+            def build():
+                cursor = self.db_connection.cursor()
+                
+                # Get recent reports
+                timed_execute(cursor, """
+                    SELECT report_type, report_date, generated_at
+                    FROM reports
+                    ORDER BY generated_at DESC
+                    LIMIT 10
+                """, statement='reports')
+                reports = []
+                for row in cursor.fetchall():
+                    reports.append({
+                        'type': row[0],
+                        'date': row[1].isoformat() if row[1] else None,
+                        'generated_at': row[2].isoformat() if row[2] else None
+                    })
+                
+                cursor.close()
+                
+                return {
+                    'reports': reports,
+                    'total_reports': len(reports),
+                    'timestamp': datetime.now().isoformat()
+                }
             
-            print_status(f"✅ Reports retrieved: {len(reports)} reports", "success")
+            status_code = self.send_cached_json_response('/reports', build)
+            print_status(f"✅ Reports sent ({status_code})", "success")
             
         except Error as e:
             print_status(f"❌ Database error in reports: {e}", "error")
@@ -375,59 +488,170 @@ class DataPilotPlusMCPHandler(BaseHTTPRequestHandler):
             category = params.get('category', [None])[0]
             source = params.get('source', [None])[0]
             limit = min(int(params.get('limit', [10])[0]), 100)  # Max 100 records
+            # since/until (YYYY-MM-DD) reach back past retention into the monthly archives
+            try:
+                since, until = (datetime.strptime(params[name][0], '%Y-%m-%d') if name in params else None
+                                for name in ('since', 'until'))
+            except ValueError:
+                self.send_json_response({'error': 'since and until must be YYYY-MM-DD dates'}, 400)
+                return
+            
+            def build():
+                if since:
+                    filters = {column: value for column, value in (('category', category),
+                                                                   ('source_name', source)) if value}
+                    results = list(query_history(
+                        self.db_connection, since, until, limit,
+                        ('source_name', 'category', 'method_type', 'url', 'scraped_at'), **filters
+                    ))
+                    return {
+                        'query': {
+                            'category': category,
+                            'source': source,
+                            'since': since.date().isoformat(),
+                            'until': until.date().isoformat() if until else None,
+                            'limit': limit
+                        },
+                        'results': results,
+                        'total_results': len(results),
+                        'timestamp': datetime.now().isoformat()
+                    }
+                
+                cursor = self.db_connection.cursor()
+                
+                # Build query
+                query = "SELECT source_name, category, method_type, url, scraped_at FROM scraped_data"
+                conditions = []
+                query_params = []
+                
+                if category:
+                    conditions.append("category = %s")
+                    query_params.append(category)
+                
+                if source:
+                    conditions.append("source_name = %s")
+                    query_params.append(source)
+                
+                if conditions:
+                    query += " WHERE " + " AND ".join(conditions)
+                
+                query += " ORDER BY scraped_at DESC LIMIT %s"
+                query_params.append(limit)
+                
+                timed_execute(cursor, query, query_params, statement='data')
+                results = []
+                
+                for row in cursor.fetchall():
+                    results.append({
+                        'source_name': row[0],
+                        'category': row[1],
+                        'method_type': row[2],
+                        'url': row[3],
+                        'scraped_at': row[4].isoformat() if row[4] else None
+                    })
+                
+                cursor.close()
+                
+                return {
+                    'query': {
+                        'category': category,
+                        'source': source,
+                        'limit': limit
+                    },
+                    'results': results,
+                    'total_results': len(results),
+                    'timestamp': datetime.now().isoformat()
+                }
             
-            cursor = self.db_connection.cursor()
-            
-            # Build query
-            query = "SELECT source_name, category, method_type, url, scraped_at FROM scraped_data"
-            conditions = []
-            query_params = []
-            
-            if category:
-                conditions.append("category = %s")
-                query_params.append(category)
-            
-            if source:
-                conditions.append("source_name = %s")
-                query_params.append(source)
-            
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
-            
-            query += " ORDER BY scraped_at DESC LIMIT %s"
-            query_params.append(limit)
-            
-            cursor.execute(query, query_params)
-            results = []
-            
-            for row in cursor.fetchall():
-                results.append({
-                    'source_name': row[0],
-                    'category': row[1],
-                    'method_type': row[2],
-                    'url': row[3],
-                    'scraped_at': row[4].isoformat() if row[4] else None
-                })
-            
-            cursor.close()
-            
-            self.send_json_response({
-                'query': {
-                    'category': category,
-                    'source': source,
-                    'limit': limit
-                },
-                'results': results,
-                'total_results': len(results),
-                'timestamp': datetime.now().isoformat()
+            key = '/data?' + urllib.parse.urlencode({
+                'category': category or '', 'source': source or '', 'limit': limit,
+                'since': params.get('since', [''])[0], 'until': params.get('until', [''])[0]
             })
-            
-            print_status(f"✅ Data query completed: {len(results)} results", "success")
+            status_code = self.send_cached_json_response(key, build)
+            print_status(f"✅ Data query completed ({status_code})", "success")
             
         except Error as e:
             print_status(f"❌ Database error in data query: {e}", "error")
             self.send_json_response({'error': 'Database error'}, 500)
     
+    def open_territory_index(self) -> Optional[TerritoryIndex]:
+        """Open the territory index read-only, if it has been built"""
+        if not os.path.exists(DEFAULT_INDEX_PATH):
+            return None
+        return TerritoryIndex(DEFAULT_INDEX_PATH, read_only=True)
+    
+    def parse_territory_params(self, query_string):
+        """Parse the days/limit parameters shared by territory endpoints (ValueError on bad input)"""
+        params = urllib.parse.parse_qs(query_string)
+        try:
+            days = int(params.get('days', [-1])[0])
+            limit = int(params.get('limit', [50])[0])
+            since = (datetime.now() - timedelta(days=days)).date() if days >= 0 else None
+        except (ValueError, OverflowError):
+            raise ValueError("days and limit must be integers in range")
+        if 'days' in params and days < 0:
+            raise ValueError("days must not be negative")
+        # 1 to 500 articles; SQLite would treat a negative LIMIT as no limit at all
+        return since, max(1, min(limit, 500))
+    
+    def handle_territory_overview(self, query_string):
+        """Per-county article counts endpoint"""
+        print_status("🗺️ Territory overview requested", "info")
+        
+        try:
+            since, _ = self.parse_territory_params(query_string)
+        except ValueError as e:
+            self.send_json_response({'error': str(e)}, 400)
+            return
+        
+        index = self.open_territory_index()
+        if not index:
+            self.send_json_response({'error': 'Territory index not available'}, 503)
+            return
+        
+        with index:
+            counts = index.area_counts(since)
+        
+        self.send_json_response({
+            'territories': counts,
+            'since': since.isoformat() if since else None,
+            'timestamp': datetime.now().isoformat()
+        })
+        print_status(f"✅ Territory overview: {len(counts)} areas", "success")
+    
+    def handle_territory(self, county: str, query_string):
+        """Articles for one county or borough, newest first"""
+        print_status(f"🗺️ Territory query requested: {county}", "info")
+        
+        area = resolve_area(county)
+        if not area:
+            self.send_json_response({'error': f'Unknown county or area: {county}'}, 404)
+            return
+        
+        try:
+            since, limit = self.parse_territory_params(query_string)
+        except ValueError as e:
+            self.send_json_response({'error': str(e)}, 400)
+            return
+        
+        index = self.open_territory_index()
+        if not index:
+            self.send_json_response({'error': 'Territory index not available'}, 503)
+            return
+        
+        with index:
+            articles = index.lookup(area, since=since, limit=limit)
+            total = index.count(area, since)
+        
+        self.send_json_response({
+            'territory': area,
+            'since': since.isoformat() if since else None,
+            'articles': articles,
+            'total_articles': total,
+            'timestamp': datetime.now().isoformat()
+        })
+        print_status(f"✅ Territory query completed: {len(articles)} of {total} articles for {area}", "success")
+    
     def handle_scrape_request(self, data: Dict[str, Any]):
         """Handle scraping requests"""
         source = data.get('source')
@@ -472,7 +696,7 @@ class DataPilotPlusMCPHandler(BaseHTTPRequestHandler):
         
         try:
             cursor = self.db_connection.cursor()
-            cursor.execute(query)
+            timed_execute(cursor, query, statement='custom_query')
             
             if query.strip().upper().startswith('SELECT'):
                 columns = [desc[0] for desc in cursor.description]
@@ -537,6 +761,9 @@ class DataPilotPlusMCPHandler(BaseHTTPRequestHandler):
         
         try:
             cursor = self.db_connection.cursor()
+            # Databases set up before config_versions existed get it here; DDL commits
+            # implicitly, so it runs before the upsert's transaction starts
+            timed_execute(cursor, CREATE_CONFIG_VERSIONS_TABLE)
             
             # Update or insert API configuration
             upsert_query = """
@@ -548,7 +775,9 @@ class DataPilotPlusMCPHandler(BaseHTTPRequestHandler):
                 last_used = NOW()
             """
             
-            cursor.execute(upsert_query, (api_name, api_key, base_url))
+            timed_execute(cursor, upsert_query, (api_name, api_key, base_url), statement='config_upsert')
+            # Running scrapers reload their api_configs cache when this version moves
+            timed_execute(cursor, BUMP_CONFIG_VERSION, (CONFIG_VERSION_NAME,), statement='config_version')
             self.db_connection.commit()
             cursor.close()
             
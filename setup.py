@@ -14,6 +14,7 @@ setup(
     packages=find_packages(),
     install_requires=[
         "flask>=3.0.0",
+        "gunicorn>=21.2.0",
         "mysql-connector-python>=9.4.0",
         "python-dotenv>=1.0.0",
         "requests>=2.31.0",
@@ -22,6 +23,10 @@ setup(
         "feedparser>=6.0.10",
         "openai>=1.3.0",
     ],
+    extras_require={
+        "http": ["brotli>=1.1.0"],
+        "storage": ["zstandard>=0.22.0"],
+    },
     python_requires=">=3.8",
     entry_points={
         "console_scripts": [
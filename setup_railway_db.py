@@ -5,8 +5,15 @@ Setup script for Railway MySQL database
 
 import mysql.connector
 from mysql.connector import Error
+import os
+import sys
 import logging
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from article_scoring import ensure_schema as ensure_scoring_schema
+from blob_store import ensure_schema as ensure_blob_schema
+from scraped_data_retention import ensure_partitioned
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -37,13 +44,21 @@ def create_tables():
                 method_type VARCHAR(50) NOT NULL,
                 url TEXT,
                 data_points JSON,
-                content TEXT,
+                content MEDIUMTEXT,
+                content_sha256 CHAR(64) CHARACTER SET ascii NULL,
                 analysis JSON,
+                relevance_score SMALLINT NULL,
+                jurisdiction VARCHAR(32) NULL,
+                matched_counties JSON NULL,
+                article_category VARCHAR(64) NULL,
                 scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
                 INDEX idx_source (source_name),
                 INDEX idx_category (category),
-                INDEX idx_scraped_at (scraped_at)
+                INDEX idx_scraped_at (scraped_at),
+                INDEX idx_relevance (relevance_score, scraped_at),
+                INDEX idx_jurisdiction_relevance (jurisdiction, relevance_score, scraped_at),
+                INDEX idx_content_sha256 (content_sha256)
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
             """
             
@@ -75,6 +90,15 @@ def create_tables():
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
             """
             
+            # Version counter bumped on every api_configs change (cache invalidation)
+            create_config_versions_table = """
+            CREATE TABLE IF NOT EXISTS config_versions (
+                name VARCHAR(64) PRIMARY KEY,
+                version BIGINT NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+            """
+            
             # Table for scraping jobs and schedules
             create_jobs_table = """
             CREATE TABLE IF NOT EXISTS scraping_jobs (
@@ -86,9 +110,12 @@ def create_tables():
                 last_run TIMESTAMP NULL,
                 next_run TIMESTAMP NULL,
                 status ENUM('active', 'paused', 'error') DEFAULT 'active',
+                locked_by VARCHAR(255) NULL,
+                locked_until TIMESTAMP NULL,
+                last_error TEXT NULL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                INDEX idx_job_name (job_name),
+                UNIQUE KEY unique_job_name (job_name),
                 INDEX idx_status (status),
                 INDEX idx_next_run (next_run)
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
@@ -159,6 +186,7 @@ def create_tables():
                 ('scraped_data', create_data_table),
                 ('reports', create_reports_table),
                 ('api_configs', create_config_table),
+                ('config_versions', create_config_versions_table),
                 ('scraping_jobs', create_jobs_table),
                 ('data_quality', create_quality_table),
                 ('local825_intelligence', create_intelligence_table),
@@ -175,6 +203,27 @@ def create_tables():
                     else:
                         logging.error(f"❌ Error creating table '{table_name}': {e}")
             
+            # Score columns and scraped_data_counties for tables created before them
+            try:
+                ensure_scoring_schema(connection)
+                logging.info("✅ Relevance score columns in place (python src/article_scoring.py backfill scores old rows)")
+            except Error as e:
+                logging.error(f"❌ Error adding relevance score columns: {e}")
+            
+            # Article bodies move to the blob store; rows keep content_sha256
+            try:
+                ensure_blob_schema(connection)
+                logging.info("✅ content_sha256 column in place")
+            except Error as e:
+                logging.error(f"❌ Error adding content_sha256 column: {e}")
+            
+            # Monthly partitions on scraped_at; the first run rebuilds an existing table
+            try:
+                partitioning = ensure_partitioned(connection)
+                logging.info(f"✅ scraped_data partitioned by month ({len(partitioning['added'])} partitions added)")
+            except Error as e:
+                logging.error(f"❌ Error partitioning scraped_data: {e}")
+            
             # Insert sample data
             try:
                 # Insert sample API configs
@@ -198,7 +247,9 @@ def create_tables():
                     ('SEC EDGAR Daily', 'sec_edgar', 'company_information', '0 6 * * *'),
                     ('OpenCorporates Weekly', 'opencorporates', 'company_information', '0 0 * * 0'),
                     ('Yahoo Finance Daily', 'yahoo_finance', 'financial', '0 8 * * *'),
-                    ('USAspending Daily', 'usaspending', 'operations', '0 4 * * *')
+                    ('USAspending Daily', 'usaspending', 'operations', '0 4 * * *'),
+                    ('Comprehensive Intelligence', 'comprehensive', 'all', '0 */6 * * *'),
+                    ('Scraped Data Retention', 'scraped_data_retention', 'maintenance', '30 3 * * *')
                 ]
                 
                 for job_name, source, category, schedule in sample_jobs:
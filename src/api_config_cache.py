@@ -0,0 +1,183 @@
+"""
+In-memory cache of the api_configs table.
+
+The whole table is loaded once per process. Writers (the MCP /config
+endpoint) bump a row in config_versions in the same transaction as their
+change; readers compare that single integer at most every check_interval
+seconds and reload only when it moved. last_used is tracked in memory and
+written back in one batch by flush_last_used().
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import mysql.connector
+from mysql.connector import Error
+
+logger = logging.getLogger(__name__)
+
+CONFIG_VERSION_NAME = 'api_configs'
+
+CREATE_CONFIG_VERSIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS config_versions (
+    name VARCHAR(64) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+# Run by writers inside the transaction that changes api_configs
+BUMP_CONFIG_VERSION = """
+INSERT INTO config_versions (name, version) VALUES (%s, 1)
+ON DUPLICATE KEY UPDATE version = version + 1
+"""
+
+class ApiConfigCache:
+    """Process-wide, thread-safe view of api_configs"""
+
+    def __init__(self, db_config: Dict[str, Any], check_interval: Optional[float] = None):
+        self.db_config = db_config
+        self.check_interval = check_interval if check_interval is not None else \
+            float(os.getenv('CONFIG_CACHE_CHECK_SECONDS', 30))
+        self.lock = threading.RLock()
+        self.connection = None
+        self.configs: Dict[str, Dict[str, Any]] = {}
+        self.version: Optional[int] = None
+        self.last_check = 0.0
+        self.loaded = False
+        self.pending_last_used: Dict[str, datetime] = {}
+
+    def connect(self):
+        """Open (or reopen) the cache's own connection"""
+        if not self.connection or not self.connection.is_connected():
+            self.connection = mysql.connector.connect(**self.db_config)
+            self.connection.autocommit = True
+        return self.connection
+
+    def ensure_schema(self):
+        """Create config_versions if this database predates it"""
+        with self.lock:
+            cursor = self.connect().cursor()
+            try:
+                cursor.execute(CREATE_CONFIG_VERSIONS_TABLE)
+            finally:
+                cursor.close()
+
+    def _read_version(self, cursor) -> int:
+        cursor.execute("SELECT version FROM config_versions WHERE name = %s", (CONFIG_VERSION_NAME,))
+        row = cursor.fetchone()
+        return row['version'] if row else 0
+
+    def reload(self):
+        """Load the full table and its version"""
+        with self.lock:
+            cursor = self.connect().cursor(dictionary=True)
+            try:
+                version = self._read_version(cursor)
+                cursor.execute("""
+                    SELECT api_name, api_key, base_url, rate_limit, last_used FROM api_configs
+                """)
+                configs = {row['api_name']: row for row in cursor.fetchall()}
+            finally:
+                cursor.close()
+
+            # Uses recorded since the last flush are newer than the table
+            for api_name, used_at in self.pending_last_used.items():
+                if api_name in configs:
+                    configs[api_name]['last_used'] = used_at
+
+            self.configs = configs
+            if self.loaded and version != self.version:
+                logger.info(f"🔄 api_configs changed (version {self.version} -> {version}), cache reloaded")
+            self.version = version
+            self.loaded = True
+            self.last_check = time.monotonic()
+
+    def refresh_if_stale(self):
+        """Reload when the version row moved; checks at most every check_interval seconds"""
+        with self.lock:
+            try:
+                if not self.loaded:
+                    self.reload()
+                    return
+                if time.monotonic() - self.last_check < self.check_interval:
+                    return
+
+                cursor = self.connect().cursor(dictionary=True)
+                try:
+                    version = self._read_version(cursor)
+                finally:
+                    cursor.close()
+                self.last_check = time.monotonic()
+                if version != self.version:
+                    self.reload()
+            except Error as e:
+                # Keep serving the last good copy
+                logger.warning(f"⚠️ Could not refresh api_configs cache: {e}")
+                self.connection = None
+                self.last_check = time.monotonic()
+
+    def get(self, api_name: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of one API's configuration"""
+        self.refresh_if_stale()
+        with self.lock:
+            config = self.configs.get(api_name)
+            return dict(config) if config else None
+
+    def get_api_key(self, api_name: str) -> Optional[str]:
+        config = self.get(api_name)
+        return config['api_key'] if config else None
+
+    def get_rate_limit(self, api_name: str) -> Optional[int]:
+        config = self.get(api_name)
+        return config['rate_limit'] if config else None
+
+    def all(self) -> Dict[str, Dict[str, Any]]:
+        """Return a copy of every API's configuration"""
+        self.refresh_if_stale()
+        with self.lock:
+            return {api_name: dict(config) for api_name, config in self.configs.items()}
+
+    def mark_used(self, api_name: str):
+        """Record a use in memory; written back by flush_last_used()"""
+        now = datetime.now()
+        with self.lock:
+            self.pending_last_used[api_name] = now
+            if api_name in self.configs:
+                self.configs[api_name]['last_used'] = now
+
+    def flush_last_used(self):
+        """Write pending last_used timestamps in one statement batch"""
+        with self.lock:
+            if not self.pending_last_used:
+                return
+            pending = list(self.pending_last_used.items())
+            try:
+                cursor = self.connect().cursor()
+                try:
+                    cursor.executemany(
+                        "UPDATE api_configs SET last_used = %s WHERE api_name = %s",
+                        [(used_at, api_name) for api_name, used_at in pending]
+                    )
+                finally:
+                    cursor.close()
+                self.pending_last_used.clear()
+            except Error as e:
+                logger.warning(f"⚠️ Could not write api_configs.last_used: {e}")
+                self.connection = None
+
+_caches: Dict[tuple, ApiConfigCache] = {}
+_caches_lock = threading.Lock()
+
+def get_config_cache(db_config: Dict[str, Any]) -> ApiConfigCache:
+    """Return the shared cache for a database, creating it on first use"""
+    key = (db_config.get('host'), db_config.get('port'), db_config.get('database'))
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = ApiConfigCache(db_config)
+        return cache
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Local 825 relevance scoring, computed once per article and stored with it.
+
+The keyword relevance score, jurisdiction, matched counties and article
+category used to be worked out in the targeted intelligence system only,
+while /data fabricated a random relevance and guessed jurisdiction with
+LIKE on every request. The scorers now live here; save_scraped_data stores
+their results as indexed scraped_data columns at ingest (counties also go
+to scraped_data_counties, one row per county), so /data filters and sorts
+by relevance through an index.
+
+Rows saved before these columns existed are scored by the backfill:
+
+    python src/article_scoring.py backfill            # unscored rows only
+    python src/article_scoring.py backfill --rescore  # every row (after a scorer change)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from local825_jurisdictions import JURISDICTION_AREAS, match_areas
+from mysql_config import get_mysql_config
+
+# Articles scoring below this are dropped by the targeted intelligence system
+RELEVANCE_THRESHOLD = 3
+
+TARGET_KEYWORDS = {
+    'local825_specific': [
+        'Local 825', 'Operating Engineers Local 825', 'IUOE Local 825',
+        'New Jersey Operating Engineers', 'NY Operating Engineers'
+    ],
+    'nj_construction': [
+        'New Jersey construction', 'NJ construction projects', 'NJ infrastructure',
+        'NJ building trades', 'NJ heavy construction', 'NJ road construction',
+        'NJ bridge construction', 'NJ tunnel construction', 'NJ port construction'
+    ],
+    'ny_relevant_territories': [
+        'New York construction', 'NYC construction', 'Long Island construction',
+        'Westchester construction', 'Rockland construction', 'Orange construction',
+        'Putnam construction', 'Dutchess construction', 'Suffolk construction'
+    ],
+    'union_organizing': [
+        'union organizing', 'union drive', 'NLRB', 'collective bargaining',
+        'union representation', 'union certification', 'union recognition'
+    ],
+    'labor_issues': [
+        'strike', 'lockout', 'work stoppage', 'labor dispute', 'contract negotiation',
+        'wage increase', 'benefits negotiation', 'working conditions', 'overtime pay'
+    ],
+    'construction_trades': [
+        'construction union', 'building trades', 'heavy equipment', 'bulldozer',
+        'excavator', 'construction worker', 'infrastructure', 'heavy construction'
+    ],
+    'government_projects': [
+        'federal contracts', 'state contracts', 'municipal contracts', 'infrastructure bill',
+        'construction projects', 'public works', 'government spending', 'prevailing wage'
+    ]
+}
+
+_KEYWORDS_LOWER = [(keyword, keyword.lower()) for keywords in TARGET_KEYWORDS.values() for keyword in keywords]
+_NJ_AREAS = [area.lower() for area in JURISDICTION_AREAS['new_jersey']]
+_NY_AREAS = [area.lower() for area in JURISDICTION_AREAS['new_york_relevant']]
+
+JURISDICTION_WEIGHTS = {'Local 825 Specific': 5, 'New Jersey': 4, 'New York': 3}
+
+def categorize_jurisdiction(text: str) -> str:
+    """New Jersey, New York, Local 825 Specific or General"""
+    text_lower = text.lower()
+
+    # Check for NJ focus
+    if any(county in text_lower for county in _NJ_AREAS):
+        return 'New Jersey'
+    elif 'new jersey' in text_lower or 'nj' in text_lower:
+        return 'New Jersey'
+
+    # Check for NY focus
+    if any(area in text_lower for area in _NY_AREAS):
+        return 'New York'
+    elif 'new york' in text_lower or 'nyc' in text_lower:
+        return 'New York'
+
+    # Check for Local 825 specific
+    if 'local 825' in text_lower or 'operating engineers' in text_lower:
+        return 'Local 825 Specific'
+
+    return 'General'
+
+def score_relevance(text: str, jurisdiction: str) -> Tuple[int, List[str]]:
+    """(relevance score, matched keywords) for an article's title and summary"""
+    text_to_analyze = text.lower()
+    matched_keywords = [keyword for keyword, keyword_lower in _KEYWORDS_LOWER if keyword_lower in text_to_analyze]
+    relevance_score = len(matched_keywords) + JURISDICTION_WEIGHTS.get(jurisdiction, 0)
+
+    # Additional scoring factors
+    if 'union' in text_to_analyze:
+        relevance_score += 2
+    if 'construction' in text_to_analyze:
+        relevance_score += 2
+    if 'local 825' in text_to_analyze:
+        relevance_score += 5  # High priority
+    if 'strike' in text_to_analyze or 'negotiation' in text_to_analyze:
+        relevance_score += 3
+    if 'infrastructure' in text_to_analyze:
+        relevance_score += 2
+    if 'prevailing wage' in text_to_analyze:
+        relevance_score += 3
+    return relevance_score, matched_keywords
+
+def categorize_article(text: str) -> str:
+    """Article category from its title and summary"""
+    text = text.lower()
+
+    if any(term in text for term in ['strike', 'lockout', 'work stoppage']):
+        return 'Labor Disputes'
+    elif any(term in text for term in ['negotiation', 'contract', 'bargaining']):
+        return 'Contract Negotiations'
+    elif any(term in text for term in ['organizing', 'election', 'nlrb']):
+        return 'Union Organizing'
+    elif any(term in text for term in ['construction', 'infrastructure', 'project']):
+        return 'Construction Projects'
+    elif any(term in text for term in ['job', 'hiring', 'employment']):
+        return 'Job Market'
+    elif 'local 825' in text:
+        return 'Local 825 Specific'
+    elif 'prevailing wage' in text:
+        return 'Prevailing Wage Issues'
+    elif 'infrastructure bill' in text:
+        return 'Infrastructure Bill Projects'
+    else:
+        return 'General Labor News'
+
+def score_article(text: str) -> Dict[str, Any]:
+    """relevance_score, jurisdiction, matched_counties, article_category and matched_keywords for text"""
+    jurisdiction = categorize_jurisdiction(text)
+    relevance_score, matched_keywords = score_relevance(text, jurisdiction)
+    return {
+        'relevance_score': relevance_score,
+        'jurisdiction': jurisdiction,
+        'matched_counties': match_areas(text),
+        'article_category': categorize_article(text),
+        'matched_keywords': matched_keywords
+    }
+
+def row_text(data_points: Any, content: Optional[str]) -> str:
+    """What a scraped_data row is scored on: its title (from data_points) and content"""
+    if isinstance(data_points, (str, bytes)):
+        try:
+            data_points = json.loads(data_points)
+        except ValueError:
+            data_points = None
+    title = data_points.get('title') if isinstance(data_points, dict) else None
+    return ' '.join(filter(None, (title, content)))
+
+# Columns added to scraped_data; setup_database.py / setup_railway_db.py create them on new installs
+SCORE_COLUMNS = [
+    ('relevance_score', "SMALLINT NULL"),
+    ('jurisdiction', "VARCHAR(32) NULL"),
+    ('matched_counties', "JSON NULL"),
+    ('article_category', "VARCHAR(64) NULL"),
+]
+
+SCORE_INDEXES = [
+    ('idx_relevance', "(relevance_score, scraped_at)"),
+    ('idx_jurisdiction_relevance', "(jurisdiction, relevance_score, scraped_at)"),
+]
+
+CREATE_COUNTIES_TABLE = """
+CREATE TABLE IF NOT EXISTS scraped_data_counties (
+    county VARCHAR(64) NOT NULL,
+    scraped_data_id INT NOT NULL,
+    PRIMARY KEY (county, scraped_data_id),
+    INDEX idx_scraped_data (scraped_data_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+def ensure_schema(connection):
+    """Add the score columns and indexes to an existing scraped_data table (idempotent)"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            SELECT COLUMN_NAME FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'scraped_data'
+        """)
+        columns = {row[0] for row in cursor.fetchall()}
+        cursor.execute("""
+            SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'scraped_data'
+        """)
+        indexes = {row[0] for row in cursor.fetchall()}
+
+        alterations = [f"ADD COLUMN {name} {definition}" for name, definition in SCORE_COLUMNS
+                       if name not in columns]
+        alterations += [f"ADD INDEX {name} {definition}" for name, definition in SCORE_INDEXES
+                        if name not in indexes]
+        if alterations:
+            cursor.execute(f"ALTER TABLE scraped_data {', '.join(alterations)}")
+        cursor.execute(CREATE_COUNTIES_TABLE)
+        connection.commit()
+    finally:
+        cursor.close()
+
+def score_values(score: Dict[str, Any]) -> Tuple:
+    """(relevance_score, jurisdiction, matched_counties, article_category) column values"""
+    return (score['relevance_score'], score['jurisdiction'], json.dumps(score['matched_counties']),
+            score['article_category'])
+
+def store_counties(cursor, rows: Iterable[Tuple[int, List[str]]], replace: bool = True):
+    """County rows for each (scraped_data id, counties); replace drops the ids' existing rows first"""
+    rows = list(rows)
+    if not rows:
+        return
+    if replace:
+        ids = [row_id for row_id, _ in rows]
+        cursor.execute(f"DELETE FROM scraped_data_counties WHERE scraped_data_id IN ({', '.join(['%s'] * len(ids))})",
+                       ids)
+    pairs = [(county, row_id) for row_id, counties in rows for county in counties]
+    if pairs:
+        cursor.executemany("INSERT INTO scraped_data_counties (county, scraped_data_id) VALUES (%s, %s)", pairs)
+
+def backfill(connection, batch_size: int = 500, rescore: bool = False) -> Dict[str, Any]:
+    """Score scraped_data rows in id order, batch_size rows per transaction"""
+    from blob_store import row_content
+    from response_cache import bump_data_generation
+
+    started = time.perf_counter()
+    scored = 0
+    last_id = 0
+    cursor = connection.cursor()
+    try:
+        while True:
+            cursor.execute(f"""
+                SELECT id, data_points, content, content_sha256 FROM scraped_data
+                WHERE id > %s {'' if rescore else 'AND relevance_score IS NULL'}
+                ORDER BY id LIMIT %s
+            """, (last_id, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            updates = []
+            counties = []
+            for row_id, data_points, content, content_sha256 in rows:
+                score = score_article(row_text(data_points, row_content(content, content_sha256)))
+                updates.append(score_values(score) + (row_id,))
+                counties.append((row_id, score['matched_counties']))
+            cursor.executemany("""
+                UPDATE scraped_data
+                SET relevance_score = %s, jurisdiction = %s, matched_counties = %s, article_category = %s
+                WHERE id = %s
+            """, updates)
+            store_counties(cursor, counties)
+            bump_data_generation(cursor)
+            connection.commit()
+            scored += len(rows)
+            last_id = rows[-1][0]
+    finally:
+        cursor.close()
+    elapsed = time.perf_counter() - started
+    return {'scored': scored, 'seconds': round(elapsed, 2),
+            'rows_per_sec': round(scored / elapsed, 1) if elapsed else 0.0}
+
+def _connect():
+    import mysql.connector
+
+    return mysql.connector.connect(**get_mysql_config())
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Score scraped_data rows for Local 825 relevance")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    score_parser = subparsers.add_parser('score', help="Score a piece of text")
+    score_parser.add_argument('text')
+
+    backfill_parser = subparsers.add_parser('backfill', help="Score stored rows")
+    backfill_parser.add_argument('--batch-size', type=int, default=500)
+    backfill_parser.add_argument('--rescore', action='store_true', help="Rescore rows that already have a score")
+
+    args = parser.parse_args(argv)
+    if args.command == 'score':
+        print(json.dumps(score_article(args.text), indent=2))
+        return 0
+
+    connection = _connect()
+    try:
+        ensure_schema(connection)
+        result = backfill(connection, args.batch_size, args.rescore)
+    finally:
+        connection.close()
+    print(f"✅ Scored {result['scored']} rows in {result['seconds']}s ({result['rows_per_sec']} rows/sec)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Content-addressed, compressed storage for full article bodies.
+
+A body is stored once under the SHA-256 of its UTF-8 bytes, zstd-compressed
+(zlib when the zstandard package is not installed, `pip install .[storage]`),
+in a two-level sharded directory under BLOB_STORE_DIR. Rows keep only the
+64-character hash (scraped_data.content_sha256), so a page scraped again
+unchanged costs a hash and an existence check instead of another copy of
+its content.
+
+Blobs are written to a temporary file and renamed into place, so readers
+never see a partial blob and concurrent writers of the same body agree.
+
+    python src/blob_store.py stats
+    python src/blob_store.py bench reports/*.txt --repeat 5
+    python src/blob_store.py bench --from-db --limit 500 --mysql
+
+bench compares the current store with inline storage: bytes on disk
+against bytes of inline content, and bodies/sec for put() and for MySQL
+inserts of the full text versus the hash.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from mysql_config import get_mysql_config
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_ROOT = os.getenv('BLOB_STORE_DIR', os.path.join('data', 'blobs'))
+ZSTD_LEVEL = int(os.getenv('BLOB_ZSTD_LEVEL', 3))
+ZLIB_LEVEL = 6
+
+# Column added to scraped_data; setup_database.py / setup_railway_db.py create it on new installs
+CONTENT_HASH_COLUMN = ('content_sha256', "CHAR(64) CHARACTER SET ascii NULL")
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def _encode(body: Union[str, bytes]) -> bytes:
+    return body.encode('utf-8') if isinstance(body, str) else body
+
+class BlobStore:
+    """SHA-256 keyed, compressed, write-once blob directory"""
+
+    def __init__(self, root: str = DEFAULT_ROOT, zstd_level: int = ZSTD_LEVEL):
+        self.root = root
+        self.codec = 'zst' if zstandard else 'zz'
+        self.zstd_level = zstd_level
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.stats = {'puts': 0, 'stored': 0, 'deduplicated': 0, 'raw_bytes': 0, 'stored_bytes': 0,
+                      'put_seconds': 0.0}
+
+    def _bump(self, **amounts):
+        with self._lock:
+            for field, amount in amounts.items():
+                self.stats[field] += amount
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == 'zz':
+            return zlib.compress(data, ZLIB_LEVEL)
+        # zstd contexts are not thread-safe; one per thread
+        compressor = getattr(self._local, 'compressor', None)
+        if compressor is None:
+            compressor = self._local.compressor = zstandard.ZstdCompressor(level=self.zstd_level)
+        return compressor.compress(data)
+
+    @staticmethod
+    def _decompress(data: bytes, codec: str) -> bytes:
+        if codec == 'zz':
+            return zlib.decompress(data)
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read .zst blobs (pip install .[storage])")
+        return zstandard.ZstdDecompressor().decompress(data)
+
+    def path(self, digest: str, codec: Optional[str] = None) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], f"{digest}.{codec or self.codec}")
+
+    def _find(self, digest: str) -> Optional[Tuple[str, str]]:
+        for codec in (self.codec, 'zst', 'zz'):
+            path = self.path(digest, codec)
+            if os.path.exists(path):
+                return path, codec
+        return None
+
+    def exists(self, digest: str) -> bool:
+        return self._find(digest) is not None
+
+    def put(self, body: Union[str, bytes]) -> str:
+        """Store body (once) and return its SHA-256 hex digest"""
+        started = time.perf_counter()
+        data = _encode(body)
+        digest = content_hash(data)
+        if self._find(digest):
+            self._bump(puts=1, deduplicated=1, raw_bytes=len(data), put_seconds=time.perf_counter() - started)
+            return digest
+
+        compressed = self._compress(data)
+        path = self.path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._bump(puts=1, stored=1, raw_bytes=len(data), stored_bytes=len(compressed),
+                   put_seconds=time.perf_counter() - started)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """Body bytes for digest; KeyError if it was never stored"""
+        found = self._find(digest)
+        if not found:
+            raise KeyError(digest)
+        path, codec = found
+        with open(path, 'rb') as f:
+            return self._decompress(f.read(), codec)
+
+    def get_text(self, digest: str) -> str:
+        return self.get(digest).decode('utf-8')
+
+    def metrics(self) -> Dict:
+        """Counters for this process: puts, new blobs, duplicates and compression"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats['codec'] = self.codec
+        stats['dedup_rate'] = round(stats['deduplicated'] / stats['puts'], 3) if stats['puts'] else 0.0
+        stats['puts_per_sec'] = round(stats['puts'] / stats['put_seconds'], 1) if stats['put_seconds'] else 0.0
+        stats['put_seconds'] = round(stats['put_seconds'], 3)
+        return stats
+
+    def disk_usage(self) -> Dict:
+        """Blob count and bytes on disk for the whole store"""
+        blobs = 0
+        stored_bytes = 0
+        for path in glob.glob(os.path.join(self.root, '*', '*', '*.z*')):
+            blobs += 1
+            stored_bytes += os.path.getsize(path)
+        return {'root': self.root, 'blobs': blobs, 'stored_bytes': stored_bytes}
+
+_default_store: Optional[BlobStore] = None
+_default_lock = threading.Lock()
+
+def get_store() -> BlobStore:
+    """The process-wide store under BLOB_STORE_DIR"""
+    global _default_store
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                _default_store = BlobStore()
+    return _default_store
+
+def ensure_schema(connection):
+    """Add scraped_data.content_sha256 (and its index) to an existing table"""
+    name, definition = CONTENT_HASH_COLUMN
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'scraped_data' AND COLUMN_NAME = %s
+        """, (name,))
+        if not cursor.fetchone()[0]:
+            cursor.execute(f"ALTER TABLE scraped_data ADD COLUMN {name} {definition}, "
+                           f"ADD INDEX idx_content_sha256 ({name})")
+        connection.commit()
+    finally:
+        cursor.close()
+
+def row_content(content: Optional[str], digest: Optional[str], store: Optional[BlobStore] = None) -> Optional[str]:
+    """A scraped_data row's body: inline content (older rows) or its blob"""
+    if content is not None or not digest:
+        return content
+    try:
+        return (store or get_store()).get_text(digest)
+    except KeyError:
+        return None
+
+def _connect():
+    import mysql.connector
+
+    return mysql.connector.connect(**get_mysql_config())
+
+def _db_bodies(connection, limit: int) -> List[str]:
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            SELECT content, content_sha256 FROM scraped_data
+            WHERE content IS NOT NULL OR content_sha256 IS NOT NULL
+            ORDER BY scraped_at DESC LIMIT %s
+        """, (limit,))
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    return [body for body in (row_content(content, digest) for content, digest in rows) if body]
+
+def _insert_rate(connection, column_type: str, values: List[str]) -> float:
+    """Rows/sec inserting values into a temporary one-column table"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"CREATE TEMPORARY TABLE blob_bench (id INT AUTO_INCREMENT PRIMARY KEY, body {column_type})")
+        started = time.perf_counter()
+        for value in values:
+            cursor.execute("INSERT INTO blob_bench (body) VALUES (%s)", (value,))
+        connection.commit()
+        elapsed = time.perf_counter() - started
+        cursor.execute("DROP TEMPORARY TABLE blob_bench")
+    finally:
+        cursor.close()
+    return round(len(values) / elapsed, 1) if elapsed else 0.0
+
+def benchmark(bodies: Iterable[str], repeat: int = 1, root: Optional[str] = None, connection=None) -> Dict:
+    """Inline vs content-addressed storage for bodies stored repeat times (re-scrapes of the same pages)"""
+    bodies = list(bodies) * repeat
+    with tempfile.TemporaryDirectory() as scratch:
+        store = BlobStore(root or scratch)
+        started = time.perf_counter()
+        digests = [store.put(body) for body in bodies]
+        put_seconds = time.perf_counter() - started
+        usage = store.disk_usage()
+
+    inline_bytes = sum(len(_encode(body)) for body in bodies)
+    result = {
+        'bodies': len(bodies),
+        'unique_bodies': usage['blobs'],
+        'codec': store.codec,
+        'inline_bytes': inline_bytes,
+        'blob_bytes': usage['stored_bytes'],
+        'row_bytes': 64 * len(bodies),
+        'storage_ratio': round(inline_bytes / max(usage['stored_bytes'] + 64 * len(bodies), 1), 2),
+        'put_per_sec': round(len(bodies) / put_seconds, 1) if put_seconds else 0.0,
+        'put_mb_per_sec': round(inline_bytes / put_seconds / 1e6, 1) if put_seconds else 0.0,
+    }
+    if connection is not None:
+        # What the INSERT itself costs with the body inline vs only its hash
+        result['inline_insert_per_sec'] = _insert_rate(connection, 'MEDIUMTEXT', bodies)
+        result['hash_insert_per_sec'] = _insert_rate(connection, 'CHAR(64)', digests)
+    return result
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Content-addressed article body store")
+    parser.add_argument('--root', default=DEFAULT_ROOT)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('stats', help="Blob count and bytes on disk")
+    get_parser = subparsers.add_parser('get', help="Print one body")
+    get_parser.add_argument('digest')
+
+    bench_parser = subparsers.add_parser('bench', help="Compare with inline storage")
+    bench_parser.add_argument('paths', nargs='*', help="Text files to use as bodies")
+    bench_parser.add_argument('--from-db', action='store_true', help="Use recent scraped_data bodies")
+    bench_parser.add_argument('--limit', type=int, default=500)
+    bench_parser.add_argument('--repeat', type=int, default=3, help="Times each body is stored")
+    bench_parser.add_argument('--mysql', action='store_true', help="Also time inline vs hash INSERTs")
+    args = parser.parse_args(argv)
+
+    if args.command == 'stats':
+        print(json.dumps(BlobStore(args.root).disk_usage(), indent=2))
+        return 0
+    if args.command == 'get':
+        sys.stdout.write(BlobStore(args.root).get_text(args.digest))
+        return 0
+
+    connection = _connect() if args.from_db or args.mysql else None
+    try:
+        bodies = []
+        for path in args.paths:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                bodies.append(f.read())
+        if args.from_db:
+            bodies.extend(_db_bodies(connection, args.limit))
+        if not bodies:
+            parser.error("no bodies: pass text files or --from-db")
+        print(json.dumps(benchmark(bodies, args.repeat, connection=connection if args.mysql else None),
+                         indent=2))
+    finally:
+        if connection is not None:
+            connection.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
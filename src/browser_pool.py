@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Pool of warm headless Chrome instances for JavaScript-heavy pages.
+
+Launching Chrome (and resolving chromedriver) costs seconds, so browsers
+are started lazily up to a bounded pool size and reused across pages. A
+browser is recycled after max_pages pages, and discarded immediately when
+it crashes or stops responding; the next fetch starts a fresh one.
+
+Instead of sleeping a fixed time after load, fetch() waits for
+document.readyState == 'complete' and, after scrolling, for the document
+height to stop growing, both bounded by a timeout.
+
+Compare with one-browser-per-page startup:
+
+    python src/browser_pool.py https://datapilotplus.com ... --mode cold
+    python src/browser_pool.py https://datapilotplus.com ... --mode pool
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.support.ui import WebDriverWait
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = int(os.getenv('BROWSER_POOL_SIZE', 2))
+DEFAULT_MAX_PAGES = int(os.getenv('BROWSER_MAX_PAGES', 50))
+DEFAULT_LOAD_TIMEOUT = float(os.getenv('BROWSER_LOAD_TIMEOUT_SECONDS', 30))
+
+_driver_path: Optional[str] = None
+_driver_path_lock = threading.Lock()
+
+def chromedriver_path() -> str:
+    """Resolve chromedriver once per process (webdriver_manager checks the network otherwise)"""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            from webdriver_manager.chrome import ChromeDriverManager
+
+            _driver_path = ChromeDriverManager().install()
+    return _driver_path
+
+def chrome_options(user_agent: Optional[str] = None) -> Options:
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--window-size=1920,1080')
+    if user_agent:
+        options.add_argument(f'--user-agent={user_agent}')
+    return options
+
+def launch_browser(user_agent: Optional[str] = None, load_timeout: float = DEFAULT_LOAD_TIMEOUT):
+    driver = webdriver.Chrome(service=Service(chromedriver_path()), options=chrome_options(user_agent))
+    driver.set_page_load_timeout(load_timeout)
+    return driver
+
+def wait_for_dom_ready(driver, timeout: float = DEFAULT_LOAD_TIMEOUT):
+    WebDriverWait(driver, timeout).until(
+        lambda d: d.execute_script("return document.readyState") == 'complete'
+    )
+
+def wait_for_height_stable(driver, timeout: float = 5.0, poll: float = 0.25):
+    """Wait until lazy-loaded content stops extending the page (or timeout)"""
+    deadline = time.monotonic() + timeout
+    last = driver.execute_script("return document.body.scrollHeight")
+    while time.monotonic() < deadline:
+        time.sleep(poll)
+        height = driver.execute_script("return document.body.scrollHeight")
+        if height == last:
+            return
+        last = height
+
+def render_page(driver, url: str, load_timeout: float = DEFAULT_LOAD_TIMEOUT, scroll: bool = True) -> str:
+    """Load url, wait for the DOM, scroll once for lazy content and return the page source"""
+    driver.get(url)
+    wait_for_dom_ready(driver, load_timeout)
+    if scroll:
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        wait_for_height_stable(driver)
+    return driver.page_source
+
+class _PooledBrowser:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+class BrowserPool:
+    """Bounded pool of reusable Chrome drivers"""
+
+    def __init__(self, size: int = DEFAULT_POOL_SIZE, max_pages: int = DEFAULT_MAX_PAGES,
+                 user_agent: Optional[str] = None, load_timeout: float = DEFAULT_LOAD_TIMEOUT):
+        self.size = size
+        self.max_pages = max_pages
+        self.user_agent = user_agent
+        self.load_timeout = load_timeout
+        self._idle: "queue.LifoQueue[_PooledBrowser]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._started = time.monotonic()
+        self.stats = {'pages': 0, 'failures': 0, 'launches': 0, 'recycled': 0,
+                      'crashed': 0, 'launch_seconds': 0.0, 'page_seconds': 0.0}
+
+    def _bump(self, field: str, amount=1):
+        with self._lock:
+            self.stats[field] += amount
+
+    def _launch(self) -> _PooledBrowser:
+        started = time.perf_counter()
+        driver = launch_browser(self.user_agent, self.load_timeout)
+        self._bump('launches')
+        self._bump('launch_seconds', time.perf_counter() - started)
+        return _PooledBrowser(driver)
+
+    @staticmethod
+    def _quit(browser: _PooledBrowser):
+        try:
+            browser.driver.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def browser(self) -> Iterator:
+        """Check out a driver; it goes back to the pool unless it crashed or hit max_pages"""
+        if self._closed:
+            raise RuntimeError("BrowserPool is closed")
+        self._slots.acquire()
+        pooled = None
+        healthy = False
+        try:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                pooled = self._launch()
+            yield pooled.driver
+            healthy = True
+        except (TimeoutException, WebDriverException):
+            # A hung or dead renderer is not worth reusing
+            if pooled:
+                self._bump('crashed')
+            raise
+        finally:
+            if pooled:
+                pooled.pages += 1
+                if not healthy or self._closed:
+                    self._quit(pooled)
+                elif pooled.pages >= self.max_pages:
+                    self._bump('recycled')
+                    self._quit(pooled)
+                else:
+                    self._idle.put(pooled)
+            self._slots.release()
+
+    def fetch(self, url: str, scroll: bool = True) -> Optional[str]:
+        """Rendered page source, or None when the page could not be loaded"""
+        started = time.perf_counter()
+        try:
+            with self.browser() as driver:
+                source = render_page(driver, url, self.load_timeout, scroll)
+            self._bump('pages')
+            return source
+        except Exception as e:
+            self._bump('failures')
+            logger.warning(f"⚠️ Browser fetch failed for {url}: {e}")
+            return None
+        finally:
+            self._bump('page_seconds', time.perf_counter() - started)
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+        elapsed = time.monotonic() - self._started
+        stats['pages_per_minute'] = round(stats['pages'] / elapsed * 60, 1) if elapsed else 0.0
+        stats['avg_page_seconds'] = round(stats['page_seconds'] / max(stats['pages'] + stats['failures'], 1), 2)
+        stats['launch_seconds'] = round(stats['launch_seconds'], 2)
+        stats['page_seconds'] = round(stats['page_seconds'], 2)
+        return stats
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def fetch_cold(url: str, user_agent: Optional[str] = None, load_timeout: float = DEFAULT_LOAD_TIMEOUT) -> Optional[str]:
+    """One fresh browser per page (the old behavior), for comparison"""
+    driver = launch_browser(user_agent, load_timeout)
+    try:
+        return render_page(driver, url, load_timeout)
+    finally:
+        driver.quit()
+
+def benchmark(urls: List[str], mode: str, size: int, max_pages: int, workers: int) -> Dict:
+    """Render urls and return pages/minute for the chosen mode"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    started = time.perf_counter()
+    if mode == 'cold':
+        def fetch(url):
+            try:
+                return fetch_cold(url)
+            except Exception as e:
+                logger.warning(f"⚠️ {url}: {e}")
+                return None
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pages = sum(1 for source in executor.map(fetch, urls) if source)
+        stats = {}
+    else:
+        with BrowserPool(size, max_pages) as pool:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pages = sum(1 for source in executor.map(pool.fetch, urls) if source)
+            stats = pool.metrics()
+    elapsed = time.perf_counter() - started
+    return {
+        'mode': mode,
+        'pages': pages,
+        'seconds': round(elapsed, 1),
+        'pages_per_minute': round(pages / elapsed * 60, 1) if elapsed else 0.0,
+        'pool': stats
+    }
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Render pages with pooled headless Chrome")
+    parser.add_argument('urls', nargs='+')
+    parser.add_argument('--mode', choices=('pool', 'cold'), default='pool')
+    parser.add_argument('--repeat', type=int, default=1, help="Render the URL list this many times")
+    parser.add_argument('--size', type=int, default=DEFAULT_POOL_SIZE)
+    parser.add_argument('--max-pages', type=int, default=DEFAULT_MAX_PAGES)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    result = benchmark(args.urls * args.repeat, args.mode, args.size, args.max_pages, args.size)
+    print(json.dumps(result, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
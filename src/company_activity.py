@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Per-company daily activity aggregates and timelines.
+
+company_activity_daily holds one row per (company_id, day) with counts of
+article mentions (article_company_links), enforcement events (OSHA
+inspections opened, NLRB cases filed) and contract awards started
+(usaspending_awards). Ingest paths call refresh_pairs() / refresh_companies()
+for just the companies and days they touched, so the aggregates stay
+current for the cost of a few indexed queries per batch, and sparklines
+for hundreds of companies are one primary-key range read.
+
+company_timeline() merges the underlying events for one company, newest
+first, for drill-down.
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import sys
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from mysql_config import get_mysql_config
+
+CREATE_ACTIVITY_TABLE = """
+CREATE TABLE IF NOT EXISTS company_activity_daily (
+    company_id INT NOT NULL,
+    day DATE NOT NULL,
+    mentions INT NOT NULL DEFAULT 0,
+    enforcement_events INT NOT NULL DEFAULT 0,
+    contracts INT NOT NULL DEFAULT 0,
+    contract_amount DECIMAL(18,2) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (company_id, day)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+METRICS = ('mentions', 'enforcement_events', 'contracts', 'contract_amount')
+
+# (table, date column, metric expressions in METRICS order); each table is indexed on (company_id, date)
+ACTIVITY_SOURCES = [
+    ('article_company_links', 'published_date', ('COUNT(*)', '0', '0', '0')),
+    ('osha_inspections', 'open_date', ('0', 'COUNT(*)', '0', '0')),
+    ('nlrb_cases', 'date_filed', ('0', 'COUNT(*)', '0', '0')),
+    ('usaspending_awards', 'start_date', ('0', '0', 'COUNT(*)', 'COALESCE(SUM(award_amount), 0)')),
+]
+
+# Companies or (company, day) pairs recomputed per statement
+REFRESH_BATCH = 500
+
+MAX_SERIES_COMPANIES = 1000
+
+def ensure_schema(connection):
+    """Create the aggregate table and the source tables it reads"""
+    from enforcement_loader import ensure_schema as ensure_enforcement_schema
+    from entity_resolution import ensure_schema as ensure_links_schema
+    from usaspending_awards import ensure_awards_table
+
+    ensure_links_schema(connection)
+    ensure_enforcement_schema(connection)
+    ensure_awards_table(connection)
+    cursor = connection.cursor()
+    try:
+        cursor.execute(CREATE_ACTIVITY_TABLE)
+        connection.commit()
+    finally:
+        cursor.close()
+
+def _recompute(connection, where: str, params: Sequence):
+    """Replace aggregate rows matching where with fresh sums over the sources.
+
+    where is a condition on company_id and {day}; it is applied to the
+    aggregate table and, with {day} bound to each date column, to every
+    source table, so the delete and the re-insert cover the same rows.
+    """
+    selects = []
+    select_params: List = []
+    for table, date_column, expressions in ACTIVITY_SOURCES:
+        columns = ', '.join(f"{expression} AS {metric}" for expression, metric in zip(expressions, METRICS))
+        selects.append(
+            f"SELECT company_id, {date_column} AS day, {columns} FROM {table} "
+            f"WHERE company_id IS NOT NULL AND {date_column} IS NOT NULL "
+            f"AND {where.format(day=date_column)} GROUP BY company_id, {date_column}"
+        )
+        select_params.extend(params)
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"DELETE FROM company_activity_daily WHERE {where.format(day='day')}", params)
+        cursor.execute(f"""
+            INSERT INTO company_activity_daily (company_id, day, {', '.join(METRICS)})
+            SELECT company_id, day, {', '.join(f'SUM({metric})' for metric in METRICS)}
+            FROM ({' UNION ALL '.join(selects)}) activity
+            GROUP BY company_id, day
+        """, select_params)
+        written = cursor.rowcount
+        connection.commit()
+    finally:
+        cursor.close()
+    return written
+
+def refresh_pairs(connection, pairs: Iterable[Tuple[int, str]]) -> int:
+    """Recompute the given (company_id, day) aggregates; returns rows written"""
+    pairs = sorted({(company_id, str(day)) for company_id, day in pairs if company_id and day})
+    written = 0
+    for start in range(0, len(pairs), REFRESH_BATCH):
+        batch = pairs[start:start + REFRESH_BATCH]
+        where = f"(company_id, {{day}}) IN ({', '.join(['(%s, %s)'] * len(batch))})"
+        written += _recompute(connection, where, [value for pair in batch for value in pair])
+    return written
+
+def refresh_companies(connection, company_ids: Iterable[int], since: Optional[str] = None) -> int:
+    """Recompute every day (or every day from since) for the given companies"""
+    company_ids = sorted(set(company_ids))
+    written = 0
+    for start in range(0, len(company_ids), REFRESH_BATCH):
+        batch = company_ids[start:start + REFRESH_BATCH]
+        where = f"company_id IN ({', '.join(['%s'] * len(batch))})"
+        params = list(batch)
+        if since:
+            where += " AND {day} >= %s"
+            params.append(since)
+        written += _recompute(connection, where, params)
+    return written
+
+def rebuild_all(connection, since: Optional[str] = None) -> int:
+    """Recompute aggregates for every company (backfills and bulk loads)"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT id FROM companies")
+        company_ids = [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+    return refresh_companies(connection, company_ids, since)
+
+def link_pairs(link_rows: Iterable[Sequence]) -> List[Tuple[int, str]]:
+    """(company_id, day) pairs touched by entity_resolution.link_rows() output"""
+    return [(row[1], row[7]) for row in link_rows if row[7]]
+
+def activity_series(connection, company_ids: Sequence[int], days: int = 90,
+                    until: Optional[date] = None) -> Dict[int, Dict]:
+    """Dense daily series per company over the last days, for sparklines.
+
+    Returns company_id -> {'mentions': [...], ..., 'totals': {...}} with one
+    list entry per day, oldest first.
+    """
+    company_ids = list(dict.fromkeys(company_ids))[:MAX_SERIES_COMPANIES]
+    until = until or date.today()
+    since = until - timedelta(days=days - 1)
+    series = {
+        company_id: {metric: [0] * days for metric in METRICS}
+        for company_id in company_ids
+    }
+    if not company_ids:
+        return series
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"""
+            SELECT company_id, day, {', '.join(METRICS)}
+            FROM company_activity_daily
+            WHERE company_id IN ({', '.join(['%s'] * len(company_ids))})
+              AND day BETWEEN %s AND %s
+        """, (*company_ids, since, until))
+        for company_id, day, *values in cursor.fetchall():
+            offset = (day - since).days
+            for metric, value in zip(METRICS, values):
+                series[company_id][metric][offset] = float(value) if metric == 'contract_amount' else int(value)
+    finally:
+        cursor.close()
+
+    for values in series.values():
+        values['totals'] = {metric: sum(values[metric]) for metric in METRICS}
+    return series
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+def company_timeline(connection, company_id: int, since: Optional[str] = None,
+                     limit: int = 200) -> List[Dict]:
+    """Article mentions, enforcement events and contract awards for one company, newest first"""
+    from enforcement_loader import enforcement_history
+
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT published_date, title, url, source, mention, score
+            FROM article_company_links
+            WHERE company_id = %s AND (%s IS NULL OR published_date >= %s)
+            ORDER BY published_date DESC
+            LIMIT %s
+        """, (company_id, since, since, limit))
+        articles = [{
+            'date': _iso(row['published_date']),
+            'type': 'article',
+            'title': row['title'],
+            'url': row['url'],
+            'source': row['source'],
+            'mention': row['mention'],
+            'score': float(row['score']) if row['score'] is not None else None
+        } for row in cursor.fetchall()]
+
+        cursor.execute("""
+            SELECT award_id, piid, award_amount, awarding_agency, description, territory_area, start_date
+            FROM usaspending_awards
+            WHERE company_id = %s AND (%s IS NULL OR start_date >= %s)
+            ORDER BY start_date DESC
+            LIMIT %s
+        """, (company_id, since, since, limit))
+        contracts = [{
+            'date': _iso(row['start_date']),
+            'type': 'contract',
+            'title': row['description'],
+            'award_id': row['award_id'],
+            'piid': row['piid'],
+            'amount': float(row['award_amount']) if row['award_amount'] is not None else None,
+            'agency': row['awarding_agency'],
+            'territory_area': row['territory_area']
+        } for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+    enforcement = [{
+        'date': _iso(row['event_date']),
+        'type': row['source'],
+        'title': row['name'],
+        'reference': row['reference'],
+        'detail': row['detail'],
+        'closed_date': _iso(row['closed_date']),
+        'location': ', '.join(filter(None, (row['city'], row['state']))),
+        'violations': row['violations'],
+        'penalties': float(row['penalties']) if row['penalties'] is not None else None
+    } for row in enforcement_history(connection, company_id, since, limit)]
+
+    # Each list is already newest first; undated events sort last
+    merged = heapq.merge(articles, enforcement, contracts,
+                         key=lambda event: event['date'] or '', reverse=True)
+    return list(itertools.islice(merged, limit))
+
+def _connect():
+    import mysql.connector
+
+    return mysql.connector.connect(**get_mysql_config())
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Maintain per-company daily activity aggregates")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    rebuild_parser = subparsers.add_parser('rebuild', help="Recompute aggregates from the source tables")
+    rebuild_parser.add_argument('--since', help="Only recompute days on or after this date")
+
+    timeline_parser = subparsers.add_parser('timeline', help="Print one company's timeline")
+    timeline_parser.add_argument('company_id', type=int)
+    timeline_parser.add_argument('--since')
+    timeline_parser.add_argument('--limit', type=int, default=50)
+
+    args = parser.parse_args(argv)
+
+    connection = _connect()
+    try:
+        ensure_schema(connection)
+        if args.command == 'rebuild':
+            print(f"✅ Rebuilt {rebuild_all(connection, args.since)} company-day aggregates")
+        else:
+            for event in company_timeline(connection, args.company_id, args.since, args.limit):
+                print(json.dumps(event, default=str))
+    finally:
+        connection.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
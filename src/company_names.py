@@ -0,0 +1,65 @@
+"""
+Company name normalization shared by the bulk loaders and entity matching.
+
+"The Tutor-Perini Corp." and "TUTOR PERINI CORPORATION" both normalize to
+"tutor perini", so exact lookups on the normalized form line up names from
+EDGAR, OSHA, NLRB and the companies table.
+"""
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Not 'co', 'nj', 'ny' or 'de': in news text those usually follow a county or
+# town ("Bergen Co.", "Newark NJ"), and EDGAR's "/NJ/" state codes are removed below
+LEGAL_SUFFIXES = {
+    'inc', 'incorporated', 'corp', 'corporation', 'company', 'cos', 'companies',
+    'llc', 'lc', 'ltd', 'limited', 'lp', 'llp', 'lllp', 'plc', 'pc', 'pllc', 'pa',
+    'na', 'sa', 'ag', 'nv', 'bv', 'gmbh', 'the'
+}
+
+_ABBREVIATIONS = {
+    'l l c': 'llc',
+    'l p': 'lp',
+    'l l p': 'llp',
+    'n a': 'na',
+}
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+def normalize_company_name(name: Optional[str]) -> str:
+    """Lowercase, strip accents, punctuation, a leading 'the' and trailing legal suffixes"""
+    if not name:
+        return ''
+    text = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii').lower()
+    text = text.replace('&', ' and ')
+    # EDGAR appends state codes like "/NJ/" or "/DE/"
+    text = re.sub(r'/[a-z]{2}/?$', ' ', text)
+    text = _NON_ALNUM.sub(' ', text).strip()
+    for spaced, joined in _ABBREVIATIONS.items():
+        text = re.sub(rf'\b{spaced}\b', joined, text)
+
+    tokens = text.split()
+    if tokens and tokens[0] == 'the':
+        tokens = tokens[1:]
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return ' '.join(tokens)
+
+def build_name_index(companies: Iterable[Tuple[int, str]]) -> Dict[str, List[int]]:
+    """Map normalized name -> company ids for (id, company_name) pairs"""
+    index: Dict[str, List[int]] = {}
+    for company_id, company_name in companies:
+        key = normalize_company_name(company_name)
+        if key:
+            index.setdefault(key, []).append(company_id)
+    return index
+
+def load_tracked_companies(connection) -> List[Tuple[int, str]]:
+    """Return (id, company_name) for every row of the companies table"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT id, company_name FROM companies")
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
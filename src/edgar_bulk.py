@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""
+SEC EDGAR bulk ingestion for tracked companies.
+
+Instead of per-company API calls, the nightly bulk archives are read
+straight out of the zip files:
+    submissions.zip   - one CIK##########.json per filer (plus overflow pages)
+    companyfacts.zip  - one CIK##########.json of XBRL facts per filer
+Members are streamed with zipfile, never extracted to disk. Filer names are
+read from the first few KB of each submissions member, so only filers whose
+normalized name matches the companies table are fully parsed and indexed.
+
+Daily updates read the EDGAR daily master index, which lists every filing
+accepted that day, and add filings for already matched CIKs (and any newly
+matched filer names).
+
+Index layout (SQLite, EDGAR_INDEX_PATH):
+    filers(cik, company_id, company_name, edgar_name, ...)
+    filings(accession PK, cik, form, filing_date, report_date, primary_document)
+    facts(cik, taxonomy, concept, unit, period_end, ...)
+    ingest_state(key, value)
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import zipfile
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from company_names import build_name_index, normalize_company_name
+from mysql_config import get_mysql_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = os.getenv('EDGAR_INDEX_PATH', 'data/edgar/edgar_index.db')
+BULK_BASE_URL = 'https://www.sec.gov/Archives/edgar/daily-index/bulkdata'
+DAILY_INDEX_URL = 'https://www.sec.gov/Archives/edgar/daily-index/{year}/QTR{quarter}/master.{day}.idx'
+
+# Filer name sits near the top of each submissions document
+NAME_PREFIX_BYTES = 4096
+_NAME_PATTERN = re.compile(rb'"name"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_CIK_MEMBER = re.compile(r'^CIK(\d{10})\.json$')
+_CIK_OVERFLOW_MEMBER = re.compile(r'^CIK(\d{10})-submissions-\d+\.json$')
+
+# Facts kept from companyfacts.zip; None keeps every concept
+KEY_CONCEPTS = {
+    ('dei', 'EntityCommonStockSharesOutstanding'),
+    ('dei', 'EntityPublicFloat'),
+    ('us-gaap', 'Revenues'),
+    ('us-gaap', 'RevenueFromContractWithCustomerExcludingAssessedTax'),
+    ('us-gaap', 'NetIncomeLoss'),
+    ('us-gaap', 'Assets'),
+    ('us-gaap', 'Liabilities'),
+    ('us-gaap', 'StockholdersEquity'),
+    ('us-gaap', 'OperatingIncomeLoss'),
+    ('us-gaap', 'CashAndCashEquivalentsAtCarryingValue'),
+    ('us-gaap', 'ContractWithCustomerLiability'),
+    ('us-gaap', 'RevenueRemainingPerformanceObligation'),
+}
+
+def format_cik(cik) -> str:
+    """Zero-pad a CIK to EDGAR's ten digits"""
+    return str(int(cik)).zfill(10)
+
+class EdgarBulkIndex:
+    """Local index of filings and facts for tracked EDGAR filers"""
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS filers (
+                cik TEXT PRIMARY KEY,
+                company_id INTEGER,
+                company_name TEXT,
+                edgar_name TEXT,
+                normalized_name TEXT,
+                sic TEXT,
+                state_of_incorporation TEXT,
+                matched_at TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_filers_company ON filers (company_id);
+            CREATE TABLE IF NOT EXISTS filings (
+                accession TEXT PRIMARY KEY,
+                cik TEXT NOT NULL,
+                form TEXT,
+                filing_date TEXT,
+                report_date TEXT,
+                primary_document TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_filings_cik_date ON filings (cik, filing_date);
+            CREATE INDEX IF NOT EXISTS idx_filings_date ON filings (filing_date);
+            CREATE TABLE IF NOT EXISTS facts (
+                cik TEXT NOT NULL,
+                taxonomy TEXT NOT NULL,
+                concept TEXT NOT NULL,
+                unit TEXT NOT NULL,
+                period_end TEXT NOT NULL,
+                accession TEXT NOT NULL,
+                value REAL,
+                fiscal_year INTEGER,
+                fiscal_period TEXT,
+                form TEXT,
+                filed TEXT,
+                PRIMARY KEY (cik, taxonomy, concept, unit, period_end, accession)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS ingest_state (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def get_state(self, key: str) -> Optional[str]:
+        row = self.db.execute("SELECT value FROM ingest_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_state(self, key: str, value: str):
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO ingest_state VALUES (?, ?)", (key, value))
+
+    def filer_ciks(self) -> Dict[str, int]:
+        """Matched CIK -> company id"""
+        return dict(self.db.execute("SELECT cik, company_id FROM filers"))
+
+    def add_filer(self, cik: str, company_id: int, company_name: str, edgar_name: str,
+                  sic: Optional[str] = None, state_of_incorporation: Optional[str] = None):
+        with self.db:
+            self.db.execute("""
+                INSERT OR REPLACE INTO filers VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (cik, company_id, company_name, edgar_name, normalize_company_name(edgar_name),
+                  sic, state_of_incorporation, datetime.now().isoformat()))
+
+    def add_filings(self, cik: str, rows: Iterable[Tuple]) -> int:
+        """Insert (accession, form, filing_date, report_date, primary_document) rows"""
+        rows = [(accession, cik, form, filing_date, report_date, document)
+                for accession, form, filing_date, report_date, document in rows]
+        with self.db:
+            self.db.executemany("""
+                INSERT OR IGNORE INTO filings (accession, cik, form, filing_date, report_date, primary_document)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+        return len(rows)
+
+    def add_facts(self, cik: str, rows: List[Tuple]) -> int:
+        with self.db:
+            self.db.execute("DELETE FROM facts WHERE cik = ?", (cik,))
+            self.db.executemany("INSERT OR REPLACE INTO facts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def recent_filings(self, since: date, limit: int = 200) -> List[Dict]:
+        """Filings by tracked companies filed on or after since, newest first"""
+        cursor = self.db.execute("""
+            SELECT f.accession, f.cik, p.company_id, p.company_name, f.form,
+                   f.filing_date, f.report_date, f.primary_document
+            FROM filings f JOIN filers p ON p.cik = f.cik
+            WHERE f.filing_date >= ?
+            ORDER BY f.filing_date DESC
+            LIMIT ?
+        """, (since.isoformat(), limit))
+        columns = [description[0] for description in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def latest_facts(self, cik: str) -> Dict[str, Dict]:
+        """Most recent value of each stored concept for a filer"""
+        cursor = self.db.execute("""
+            SELECT taxonomy, concept, unit, period_end, value, form, filed
+            FROM facts WHERE cik = ?
+            ORDER BY period_end
+        """, (cik,))
+        latest = {}
+        for taxonomy, concept, unit, period_end, value, form, filed in cursor:
+            latest[f"{taxonomy}:{concept}"] = {
+                'unit': unit, 'period_end': period_end, 'value': value, 'form': form, 'filed': filed
+            }
+        return latest
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            table: self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ('filers', 'filings', 'facts')
+        }
+
+def _read_filer_name(archive: zipfile.ZipFile, member: str) -> Optional[str]:
+    """Decompress only the start of a submissions member and pull out the filer name"""
+    with archive.open(member) as stream:
+        prefix = stream.read(NAME_PREFIX_BYTES)
+    match = _NAME_PATTERN.search(prefix)
+    if not match:
+        return None
+    return json.loads(b'"' + match.group(1) + b'"')
+
+def _filing_rows(columns: Dict) -> Iterable[Tuple]:
+    """Turn EDGAR's columnar filings block into row tuples"""
+    accessions = columns.get('accessionNumber', [])
+    forms = columns.get('form', [])
+    filing_dates = columns.get('filingDate', [])
+    report_dates = columns.get('reportDate', [])
+    documents = columns.get('primaryDocument', [])
+    for i, accession in enumerate(accessions):
+        yield (
+            accession,
+            forms[i] if i < len(forms) else None,
+            filing_dates[i] if i < len(filing_dates) else None,
+            (report_dates[i] or None) if i < len(report_dates) else None,
+            documents[i] if i < len(documents) else None,
+        )
+
+def ingest_submissions(index: EdgarBulkIndex, archive_path: str,
+                       companies: Iterable[Tuple[int, str]]) -> Dict[str, int]:
+    """Match filers in submissions.zip to tracked companies and index their filings"""
+    companies = list(companies)
+    name_index = build_name_index(companies)
+    names_by_id = {company_id: name for company_id, name in companies}
+    known = index.filer_ciks()
+    stats = {'members_scanned': 0, 'filers_matched': 0, 'filings_indexed': 0}
+
+    with zipfile.ZipFile(archive_path) as archive:
+        members = archive.namelist()
+        matched = {}
+
+        for member in members:
+            match = _CIK_MEMBER.match(member)
+            if not match:
+                continue
+            stats['members_scanned'] += 1
+            cik = match.group(1)
+
+            if cik in known:
+                company_id = known[cik]
+            else:
+                edgar_name = _read_filer_name(archive, member)
+                company_ids = name_index.get(normalize_company_name(edgar_name))
+                if not company_ids:
+                    continue
+                company_id = company_ids[0]
+
+            with archive.open(member) as stream:
+                document = json.load(io.TextIOWrapper(stream, encoding='utf-8'))
+            index.add_filer(cik, company_id, names_by_id.get(company_id), document.get('name'),
+                            document.get('sic'), document.get('stateOfIncorporation'))
+            stats['filings_indexed'] += index.add_filings(
+                cik, _filing_rows(document.get('filings', {}).get('recent', {}))
+            )
+            matched[cik] = company_id
+
+        # Older filings spill into CIK##########-submissions-NNN.json pages
+        for member in members:
+            match = _CIK_OVERFLOW_MEMBER.match(member)
+            if match and match.group(1) in matched:
+                with archive.open(member) as stream:
+                    page = json.load(io.TextIOWrapper(stream, encoding='utf-8'))
+                stats['filings_indexed'] += index.add_filings(match.group(1), _filing_rows(page))
+
+    stats['filers_matched'] = len(matched)
+    index.set_state('submissions_ingested_at', datetime.now().isoformat())
+    logger.info(f"📥 submissions.zip: matched {stats['filers_matched']} filers, "
+                f"{stats['filings_indexed']} filings")
+    return stats
+
+def ingest_companyfacts(index: EdgarBulkIndex, archive_path: str,
+                        concepts=KEY_CONCEPTS) -> Dict[str, int]:
+    """Index XBRL facts for matched filers straight from companyfacts.zip"""
+    stats = {'filers': 0, 'facts_indexed': 0}
+    with zipfile.ZipFile(archive_path) as archive:
+        members = set(archive.namelist())
+        for cik in index.filer_ciks():
+            member = f"CIK{cik}.json"
+            if member not in members:
+                continue
+            with archive.open(member) as stream:
+                document = json.load(io.TextIOWrapper(stream, encoding='utf-8'))
+
+            rows = []
+            for taxonomy, taxonomy_facts in document.get('facts', {}).items():
+                for concept, fact in taxonomy_facts.items():
+                    if concepts is not None and (taxonomy, concept) not in concepts:
+                        continue
+                    for unit, values in fact.get('units', {}).items():
+                        for value in values:
+                            rows.append((
+                                cik, taxonomy, concept, unit, value.get('end', ''), value.get('accn', ''),
+                                value.get('val'), value.get('fy'), value.get('fp'),
+                                value.get('form'), value.get('filed')
+                            ))
+            stats['facts_indexed'] += index.add_facts(cik, rows)
+            stats['filers'] += 1
+
+    index.set_state('companyfacts_ingested_at', datetime.now().isoformat())
+    logger.info(f"📥 companyfacts.zip: {stats['facts_indexed']} facts for {stats['filers']} filers")
+    return stats
+
+def parse_master_index(text: str) -> Iterable[Tuple[str, str, str, str, str]]:
+    """Yield (cik, company_name, form, date_filed, filename) from a master.YYYYMMDD.idx file"""
+    in_body = False
+    for line in text.splitlines():
+        if not in_body:
+            in_body = line.startswith('-----')
+            continue
+        parts = line.split('|')
+        if len(parts) != 5 or not parts[0].strip().isdigit():
+            continue
+        cik, company_name, form, date_filed, filename = (part.strip() for part in parts)
+        if len(date_filed) == 8:
+            date_filed = f"{date_filed[:4]}-{date_filed[4:6]}-{date_filed[6:]}"
+        yield format_cik(cik), company_name, form, date_filed, filename
+
+def accession_from_filename(filename: str) -> str:
+    """edgar/data/320193/0000320193-24-000123.txt -> 0000320193-24-000123"""
+    return os.path.splitext(os.path.basename(filename))[0]
+
+def daily_index_url(day: date) -> str:
+    return DAILY_INDEX_URL.format(year=day.year, quarter=(day.month - 1) // 3 + 1,
+                                  day=day.strftime('%Y%m%d'))
+
+def apply_daily_index(index: EdgarBulkIndex, text: str,
+                      companies: Iterable[Tuple[int, str]] = ()) -> int:
+    """Add one day's filings for tracked filers; returns filings added"""
+    companies = list(companies)
+    name_index = build_name_index(companies)
+    names_by_id = {company_id: name for company_id, name in companies}
+    known = index.filer_ciks()
+    by_cik: Dict[str, List[Tuple]] = {}
+
+    for cik, company_name, form, date_filed, filename in parse_master_index(text):
+        if cik not in known:
+            company_ids = name_index.get(normalize_company_name(company_name))
+            if not company_ids:
+                continue
+            index.add_filer(cik, company_ids[0], names_by_id.get(company_ids[0]), company_name)
+            known[cik] = company_ids[0]
+        by_cik.setdefault(cik, []).append(
+            (accession_from_filename(filename), form, date_filed, None, None)
+        )
+
+    return sum(index.add_filings(cik, rows) for cik, rows in by_cik.items())
+
+def update_from_daily_indexes(index: EdgarBulkIndex, fetch: Callable[[str], Optional[str]],
+                              companies: Iterable[Tuple[int, str]] = (),
+                              since: Optional[date] = None, until: Optional[date] = None) -> Dict[str, int]:
+    """Apply every daily index after the last one processed.
+
+    fetch(url) returns the index text, or None when EDGAR has no index for
+    that day (weekends and holidays). Any other failure should raise, which
+    leaves the watermark at the last day applied.
+    """
+    companies = list(companies)
+    until = until or date.today()
+    if since is None:
+        last = index.get_state('daily_index_through')
+        since = date.fromisoformat(last) + timedelta(days=1) if last else until - timedelta(days=7)
+
+    stats = {'days_fetched': 0, 'filings_added': 0}
+    day = since
+    while day <= until:
+        text = fetch(daily_index_url(day))
+        if text is not None:
+            stats['days_fetched'] += 1
+            stats['filings_added'] += apply_daily_index(index, text, companies)
+            index.set_state('daily_index_through', day.isoformat())
+        elif day < until:
+            # Nothing published for a past day; never revisit it
+            index.set_state('daily_index_through', day.isoformat())
+        day += timedelta(days=1)
+
+    logger.info(f"📅 EDGAR daily indexes: {stats['days_fetched']} day(s), {stats['filings_added']} new filings")
+    return stats
+
+def make_sec_fetcher(user_agent: str, rate_limiter=None, session=None,
+                     timeout: float = 60) -> Callable[[str], Optional[str]]:
+    """Return a fetch(url) that honors SEC's User-Agent and rate-limit rules"""
+    from http_client import build_session
+
+    session = session or build_session()
+    session.headers.update({'User-Agent': user_agent})
+
+    def fetch(url: str) -> Optional[str]:
+        if rate_limiter:
+            rate_limiter.acquire_blocking('sec_edgar')
+        response = session.get(url, timeout=timeout)
+        if response.status_code == 404:
+            return None
+        # SEC answers 403 when it throttles a client: raise so the day is
+        # retried on the next run instead of being recorded as having no index
+        response.raise_for_status()
+        return response.text
+
+    return fetch
+
+def download_bulk_archive(name: str, dest_dir: str, user_agent: str) -> str:
+    """Stream submissions.zip or companyfacts.zip to disk"""
+    from http_client import build_session
+
+    os.makedirs(dest_dir, exist_ok=True)
+    path = os.path.join(dest_dir, name)
+    tmp_path = f"{path}.part"
+    session = build_session(headers={'User-Agent': user_agent}, timeout=300)
+    with session.get(f"{BULK_BASE_URL}/{name}", stream=True) as response:
+        response.raise_for_status()
+        with open(tmp_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+    os.replace(tmp_path, path)
+    return path
+
+def _companies_from_args(args) -> List[Tuple[int, str]]:
+    """Tracked companies from --companies-file (one name per line) or MySQL"""
+    if args.companies_file:
+        with open(args.companies_file, 'r', encoding='utf-8') as f:
+            names = [line.strip() for line in f if line.strip()]
+        return list(enumerate(names, start=1))
+
+    import mysql.connector
+    from company_names import load_tracked_companies
+
+    connection = mysql.connector.connect(**get_mysql_config())
+    try:
+        return load_tracked_companies(connection)
+    finally:
+        connection.close()
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="SEC EDGAR bulk ingestion")
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH, help="Path to the local EDGAR index")
+    parser.add_argument('--companies-file', help="Company names, one per line (default: companies table)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    download_parser = subparsers.add_parser('download', help="Download the bulk archives")
+    download_parser.add_argument('--dest', default='data/edgar')
+
+    ingest_parser = subparsers.add_parser('ingest', help="Index submissions.zip / companyfacts.zip")
+    ingest_parser.add_argument('--submissions', help="Path to submissions.zip")
+    ingest_parser.add_argument('--companyfacts', help="Path to companyfacts.zip")
+    ingest_parser.add_argument('--all-concepts', action='store_true', help="Keep every XBRL concept")
+
+    daily_parser = subparsers.add_parser('daily', help="Apply EDGAR daily master indexes")
+    daily_parser.add_argument('--since', type=date.fromisoformat)
+
+    subparsers.add_parser('stats', help="Show index counts")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    user_agent = os.getenv('SEC_USER_AGENT') or os.getenv('USER_AGENT') or 'Local825 Intelligence admin@example.com'
+
+    if args.command == 'download':
+        for name in ('submissions.zip', 'companyfacts.zip'):
+            print(f"⬇️ {download_bulk_archive(name, args.dest, user_agent)}")
+        return 0
+
+    with EdgarBulkIndex(args.index) as index:
+        if args.command == 'ingest':
+            if not args.submissions and not args.companyfacts:
+                parser.error("ingest needs --submissions and/or --companyfacts")
+            if args.submissions:
+                print(ingest_submissions(index, args.submissions, _companies_from_args(args)))
+            if args.companyfacts:
+                print(ingest_companyfacts(index, args.companyfacts,
+                                          None if args.all_concepts else KEY_CONCEPTS))
+        elif args.command == 'daily':
+            print(update_from_daily_indexes(index, make_sec_fetcher(user_agent),
+                                            _companies_from_args(args), since=args.since))
+        print(index.counts())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+OSHA and NLRB bulk CSV loaders.
+
+Loads the DOL enforcement extracts (osha_inspection.csv, osha_violation.csv)
+and NLRB case exports into indexed MySQL tables. Files (or the zips they
+ship in) are read as a stream and written in chunks, so memory stays flat
+regardless of file size. OSHA inspections are limited to the territory
+states by default.
+
+Establishment and employer names are stored with their normalized form
+(company_names.normalize_company_name) in an indexed column; rows are
+linked to the companies table by exact match on that column, both while
+loading and afterwards via match_companies(). A company's whole enforcement
+history is then a single indexed query (enforcement_history()).
+"""
+
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import sys
+import zipfile
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from company_names import build_name_index, load_tracked_companies, normalize_company_name
+from mysql_config import get_mysql_config
+
+logger = logging.getLogger(__name__)
+
+CHUNK_ROWS = int(os.getenv('ENFORCEMENT_CHUNK_ROWS', 5000))
+DEFAULT_STATES = ('NJ', 'NY')
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS osha_inspections (
+        activity_nr BIGINT PRIMARY KEY,
+        estab_name VARCHAR(255),
+        normalized_name VARCHAR(255),
+        company_id INT NULL,
+        site_address VARCHAR(255),
+        site_city VARCHAR(100),
+        site_state CHAR(2),
+        site_zip VARCHAR(10),
+        naics_code VARCHAR(10),
+        insp_type VARCHAR(5),
+        insp_scope VARCHAR(5),
+        union_status VARCHAR(5),
+        open_date DATE NULL,
+        close_case_date DATE NULL,
+        INDEX idx_normalized_name (normalized_name),
+        INDEX idx_company_open (company_id, open_date),
+        INDEX idx_state_open (site_state, open_date)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS osha_violations (
+        activity_nr BIGINT NOT NULL,
+        citation_id VARCHAR(20) NOT NULL,
+        standard VARCHAR(50),
+        viol_type VARCHAR(5),
+        issuance_date DATE NULL,
+        current_penalty DECIMAL(12,2),
+        initial_penalty DECIMAL(12,2),
+        gravity VARCHAR(10),
+        nr_exposed INT,
+        PRIMARY KEY (activity_nr, citation_id),
+        INDEX idx_issuance (issuance_date)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS nlrb_cases (
+        case_number VARCHAR(30) PRIMARY KEY,
+        case_name VARCHAR(255),
+        case_type VARCHAR(5),
+        employer_name VARCHAR(255),
+        normalized_name VARCHAR(255),
+        company_id INT NULL,
+        union_name VARCHAR(255),
+        status VARCHAR(50),
+        date_filed DATE NULL,
+        date_closed DATE NULL,
+        reason_closed VARCHAR(255),
+        region VARCHAR(100),
+        city VARCHAR(100),
+        state CHAR(2),
+        allegations TEXT,
+        INDEX idx_normalized_name (normalized_name),
+        INDEX idx_company_filed (company_id, date_filed),
+        INDEX idx_state_filed (state, date_filed)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """
+]
+
+# NLRB exports have changed headings over the years; first match wins
+NLRB_COLUMNS = {
+    'case_number': ('Case Number', 'case_number', 'Case'),
+    'case_name': ('Case Name', 'case_name', 'Name'),
+    'employer_name': ('Employer', 'Employer Name', 'employer_name', 'Participant'),
+    'union_name': ('Union', 'Labor Organization', 'union_name', 'Petitioner'),
+    'status': ('Status', 'status'),
+    'date_filed': ('Date Filed', 'date_filed'),
+    'date_closed': ('Date Closed', 'date_closed'),
+    'reason_closed': ('Reason Closed', 'reason_closed'),
+    'region': ('Region Assigned', 'Region', 'region'),
+    'city': ('City', 'city'),
+    'state': ('State', 'state'),
+    'allegations': ('Allegations', 'allegations'),
+}
+
+def ensure_schema(connection):
+    cursor = connection.cursor()
+    try:
+        for ddl in SCHEMA:
+            cursor.execute(ddl)
+        connection.commit()
+    finally:
+        cursor.close()
+
+@contextmanager
+def open_csv(path: str, member_hint: Optional[str] = None) -> Iterator[csv.DictReader]:
+    """Open a CSV, or the (first matching) CSV inside a zip, as a streaming DictReader"""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            members = [name for name in archive.namelist() if name.lower().endswith('.csv')]
+            if member_hint:
+                members = [name for name in members if member_hint in os.path.basename(name)] or members
+            if not members:
+                raise ValueError(f"No CSV found in {path}")
+            with archive.open(members[0]) as stream:
+                yield csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8', errors='replace', newline=''))
+    else:
+        with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+            yield csv.DictReader(f)
+
+def chunked(rows: Iterable, size: int = CHUNK_ROWS) -> Iterator[List]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def parse_date(value: Optional[str]) -> Optional[str]:
+    """ISO date from 'YYYY-MM-DD[...]' or 'MM/DD/YYYY', else None"""
+    value = (value or '').strip()
+    if not value:
+        return None
+    for fmt, length in (('%Y-%m-%d', 10), ('%m/%d/%Y', 10)):
+        try:
+            return datetime.strptime(value[:length], fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+def _number(value: Optional[str]):
+    try:
+        return float(value) if value not in (None, '') else None
+    except ValueError:
+        return None
+
+def _int(value: Optional[str]):
+    number = _number(value)
+    return int(number) if number is not None else None
+
+def _write_chunks(connection, sql: str, rows: Iterable[Sequence]) -> int:
+    written = 0
+    cursor = connection.cursor()
+    try:
+        for chunk in chunked(rows):
+            cursor.executemany(sql, chunk)
+            connection.commit()
+            written += len(chunk)
+    finally:
+        cursor.close()
+    return written
+
+def load_osha_inspections(connection, path: str, companies: Dict[str, List[int]],
+                          states: Sequence[str] = DEFAULT_STATES) -> int:
+    """Stream osha_inspection.csv into osha_inspections; returns rows written"""
+    states = {state.upper() for state in states} if states else None
+
+    def rows():
+        with open_csv(path, 'inspection') as reader:
+            for record in reader:
+                state = (record.get('site_state') or '').strip().upper()
+                if states and state not in states:
+                    continue
+                name = (record.get('estab_name') or '').strip()
+                normalized = normalize_company_name(name)
+                company_ids = companies.get(normalized)
+                yield (
+                    _int(record.get('activity_nr')), name[:255], normalized[:255],
+                    company_ids[0] if company_ids else None,
+                    (record.get('site_address') or '')[:255], (record.get('site_city') or '')[:100],
+                    state, (record.get('site_zip') or '')[:10], (record.get('naics_code') or '')[:10],
+                    record.get('insp_type'), record.get('insp_scope'), record.get('union_status'),
+                    parse_date(record.get('open_date')), parse_date(record.get('close_case_date'))
+                )
+
+    return _write_chunks(connection, """
+        INSERT INTO osha_inspections
+        (activity_nr, estab_name, normalized_name, company_id, site_address, site_city, site_state,
+         site_zip, naics_code, insp_type, insp_scope, union_status, open_date, close_case_date)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            estab_name = VALUES(estab_name),
+            normalized_name = VALUES(normalized_name),
+            company_id = COALESCE(VALUES(company_id), company_id),
+            close_case_date = VALUES(close_case_date)
+    """, (row for row in rows() if row[0] is not None))
+
+def load_osha_violations(connection, path: str, only_loaded_inspections: bool = True) -> int:
+    """Stream osha_violation.csv into osha_violations.
+
+    By default only citations for inspections already in osha_inspections
+    (i.e. in the territory states) are kept.
+    """
+    keep = None
+    if only_loaded_inspections:
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT activity_nr FROM osha_inspections")
+            keep = {row[0] for row in cursor.fetchall()}
+        finally:
+            cursor.close()
+
+    def rows():
+        with open_csv(path, 'violation') as reader:
+            for record in reader:
+                if (record.get('delete_flag') or '').strip().upper() == 'X':
+                    continue
+                activity_nr = _int(record.get('activity_nr'))
+                if activity_nr is None or (keep is not None and activity_nr not in keep):
+                    continue
+                yield (
+                    activity_nr, (record.get('citation_id') or '')[:20], (record.get('standard') or '')[:50],
+                    record.get('viol_type'), parse_date(record.get('issuance_date')),
+                    _number(record.get('current_penalty')), _number(record.get('initial_penalty')),
+                    record.get('gravity'), _int(record.get('nr_exposed'))
+                )
+
+    return _write_chunks(connection, """
+        INSERT INTO osha_violations
+        (activity_nr, citation_id, standard, viol_type, issuance_date, current_penalty,
+         initial_penalty, gravity, nr_exposed)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            current_penalty = VALUES(current_penalty),
+            viol_type = VALUES(viol_type)
+    """, rows())
+
+def _resolve_columns(fieldnames: Sequence[str]) -> Dict[str, Optional[str]]:
+    present = set(fieldnames or ())
+    return {
+        field: next((alias for alias in aliases if alias in present), None)
+        for field, aliases in NLRB_COLUMNS.items()
+    }
+
+def load_nlrb_cases(connection, path: str, companies: Dict[str, List[int]],
+                    states: Sequence[str] = ()) -> int:
+    """Stream an NLRB case export into nlrb_cases; returns rows written"""
+    states = {state.upper() for state in states} if states else None
+
+    def rows():
+        with open_csv(path) as reader:
+            columns = _resolve_columns(reader.fieldnames)
+            if not columns['case_number']:
+                raise ValueError(f"{path}: no case number column in {reader.fieldnames}")
+
+            def get(record, field):
+                column = columns[field]
+                return (record.get(column) or '').strip() if column else ''
+
+            for record in reader:
+                state = get(record, 'state').upper()[:2]
+                if states and state not in states:
+                    continue
+                case_number = get(record, 'case_number')
+                case_name = get(record, 'case_name')
+                # Case names are the charged party / employer when no employer column exists
+                employer = get(record, 'employer_name') or case_name
+                normalized = normalize_company_name(employer)
+                company_ids = companies.get(normalized)
+                case_type = case_number.split('-')[1][:5] if case_number.count('-') >= 2 else None
+                yield (
+                    case_number[:30], case_name[:255], case_type, employer[:255], normalized[:255],
+                    company_ids[0] if company_ids else None, get(record, 'union_name')[:255],
+                    get(record, 'status')[:50], parse_date(get(record, 'date_filed')),
+                    parse_date(get(record, 'date_closed')), get(record, 'reason_closed')[:255],
+                    get(record, 'region')[:100], get(record, 'city')[:100], state or None,
+                    get(record, 'allegations')
+                )
+
+    return _write_chunks(connection, """
+        INSERT INTO nlrb_cases
+        (case_number, case_name, case_type, employer_name, normalized_name, company_id, union_name,
+         status, date_filed, date_closed, reason_closed, region, city, state, allegations)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            status = VALUES(status),
+            date_closed = VALUES(date_closed),
+            reason_closed = VALUES(reason_closed),
+            company_id = COALESCE(VALUES(company_id), company_id)
+    """, (row for row in rows() if row[0]))
+
+def match_companies(connection, companies: Dict[str, List[int]]) -> Dict[str, int]:
+    """Link loaded rows to companies by normalized name (one indexed UPDATE per name)"""
+    matched = {'osha_inspections': 0, 'nlrb_cases': 0}
+    cursor = connection.cursor()
+    try:
+        for normalized, company_ids in companies.items():
+            for table in matched:
+                cursor.execute(
+                    f"UPDATE {table} SET company_id = %s WHERE normalized_name = %s "
+                    f"AND (company_id IS NULL OR company_id != %s)",
+                    (company_ids[0], normalized, company_ids[0])
+                )
+                matched[table] += cursor.rowcount
+        connection.commit()
+    finally:
+        cursor.close()
+    return matched
+
+def enforcement_history(connection, company_id: int, since: Optional[str] = None,
+                        limit: int = 500) -> List[Dict]:
+    """OSHA inspections (with citation totals) and NLRB cases for one company, newest first"""
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT * FROM (
+                SELECT 'osha' AS source, CAST(i.activity_nr AS CHAR) AS reference, i.estab_name AS name,
+                       i.open_date AS event_date, i.close_case_date AS closed_date,
+                       i.insp_type AS detail, i.site_city AS city, i.site_state AS state,
+                       COUNT(v.citation_id) AS violations, SUM(v.current_penalty) AS penalties
+                FROM osha_inspections i
+                LEFT JOIN osha_violations v ON v.activity_nr = i.activity_nr
+                WHERE i.company_id = %s AND (%s IS NULL OR i.open_date >= %s)
+                GROUP BY i.activity_nr
+                UNION ALL
+                SELECT 'nlrb', n.case_number, n.case_name, n.date_filed, n.date_closed,
+                       n.case_type, n.city, n.state, NULL, NULL
+                FROM nlrb_cases n
+                WHERE n.company_id = %s AND (%s IS NULL OR n.date_filed >= %s)
+            ) history
+            ORDER BY event_date DESC
+            LIMIT %s
+        """, (company_id, since, since, company_id, since, since, limit))
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+def enforcement_summary(connection, since: str) -> Dict[str, Dict]:
+    """Per-source counts for tracked companies since a date"""
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT COUNT(DISTINCT i.activity_nr) AS inspections, COUNT(v.citation_id) AS violations,
+                   COALESCE(SUM(v.current_penalty), 0) AS penalties,
+                   COUNT(DISTINCT i.company_id) AS companies
+            FROM osha_inspections i
+            LEFT JOIN osha_violations v ON v.activity_nr = i.activity_nr
+            WHERE i.company_id IS NOT NULL AND i.open_date >= %s
+        """, (since,))
+        osha = cursor.fetchone()
+        cursor.execute("""
+            SELECT COUNT(*) AS cases, COUNT(DISTINCT company_id) AS companies,
+                   SUM(case_type = 'CA') AS unfair_labor_practice_charges,
+                   SUM(case_type IN ('RC', 'RM', 'RD')) AS representation_petitions
+            FROM nlrb_cases
+            WHERE company_id IS NOT NULL AND date_filed >= %s
+        """, (since,))
+        nlrb = cursor.fetchone()
+        return {'osha': osha, 'nlrb': nlrb}
+    finally:
+        cursor.close()
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Load OSHA / NLRB bulk CSVs")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    osha_parser = subparsers.add_parser('osha', help="Load OSHA inspections and violations")
+    osha_parser.add_argument('--inspections', required=True, help="osha_inspection.csv (or .zip)")
+    osha_parser.add_argument('--violations', help="osha_violation.csv (or .zip)")
+    osha_parser.add_argument('--states', default=','.join(DEFAULT_STATES),
+                             help="Comma-separated site states to keep ('' for all)")
+
+    nlrb_parser = subparsers.add_parser('nlrb', help="Load an NLRB case export")
+    nlrb_parser.add_argument('--cases', required=True, help="NLRB cases CSV (or .zip)")
+    nlrb_parser.add_argument('--states', default='', help="Comma-separated states to keep")
+
+    subparsers.add_parser('match', help="Re-link loaded rows to the companies table")
+
+    profile_parser = subparsers.add_parser('profile', help="Show a company's enforcement history")
+    profile_parser.add_argument('company_id', type=int)
+    profile_parser.add_argument('--since')
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    import mysql.connector
+
+    connection = mysql.connector.connect(**get_mysql_config())
+    try:
+        ensure_schema(connection)
+        if args.command == 'profile':
+            for event in enforcement_history(connection, args.company_id, args.since):
+                print(json.dumps(event, default=str))
+            return 0
+
+        companies = build_name_index(load_tracked_companies(connection))
+        states = [state for state in args.states.split(',') if state] if hasattr(args, 'states') else ()
+        if args.command == 'osha':
+            print(f"✅ {load_osha_inspections(connection, args.inspections, companies, states)} inspections")
+            if args.violations:
+                print(f"✅ {load_osha_violations(connection, args.violations)} violations")
+        elif args.command == 'nlrb':
+            print(f"✅ {load_nlrb_cases(connection, args.cases, companies, states)} NLRB cases")
+        print(f"🔗 Matched: {match_companies(connection, companies)}")
+
+        from company_activity import ensure_schema as ensure_activity_schema
+        from company_activity import rebuild_all
+
+        ensure_activity_schema(connection)
+        print(f"📈 Refreshed {rebuild_all(connection)} company-day aggregates")
+    finally:
+        connection.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
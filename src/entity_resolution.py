@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Company entity resolution: map free-text company mentions to companies rows.
+
+Names are normalized with company_names.normalize_company_name. Lookups try
+an exact match on the normalized form first, then fall back to a character
+trigram blocking index: only companies sharing trigrams with the mention
+are scored, by Dice coefficient over trigram sets, and the best one at or
+above the threshold wins. Trigrams shared by a large share of companies
+("con", "ion", ...) are left out of the blocking index so candidate lists
+stay short.
+
+Resolved mentions are stored in article_company_links (MySQL), keyed by
+article id (the same URL hash as the territory index), so company-centric
+queries read links instead of scanning article text.
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from company_names import LEGAL_SUFFIXES, normalize_company_name
+from mysql_config import get_mysql_config
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from local825_report_archive import published_day
+from local825_territory_index import article_id
+
+DEFAULT_THRESHOLD = float(os.getenv('ENTITY_MATCH_THRESHOLD', 0.72))
+
+# Capitalized phrases, optionally ending in a legal suffix, are mention candidates
+_CANDIDATE_PATTERN = re.compile(
+    r"\b(?:[A-Z][\w&'.-]*|&)(?:\s+(?:[A-Z][\w&'.-]*|&|of))*"
+)
+
+CREATE_LINKS_TABLE = """
+CREATE TABLE IF NOT EXISTS article_company_links (
+    article_id CHAR(16) NOT NULL,
+    company_id INT NOT NULL,
+    mention VARCHAR(255),
+    score DECIMAL(4,3),
+    title TEXT,
+    url TEXT,
+    source VARCHAR(255),
+    published_date DATE NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (article_id, company_id),
+    INDEX idx_company_published (company_id, published_date)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+def trigrams(normalized: str) -> Set[str]:
+    """Character trigrams of a normalized name, padded so word edges count"""
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def dice(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return 2.0 * len(a & b) / (len(a) + len(b))
+
+class CompanyResolver:
+    """In-memory resolver over (company_id, company_name) pairs"""
+
+    def __init__(self, companies: Iterable[Tuple[int, str]], threshold: float = DEFAULT_THRESHOLD,
+                 max_posting_share: float = 0.2, min_name_length: int = 3):
+        self.threshold = threshold
+        self.min_name_length = min_name_length
+        self.names: Dict[int, str] = {}
+        self.exact: Dict[str, int] = {}
+        self.grams: Dict[int, Set[str]] = {}
+
+        for company_id, company_name in companies:
+            normalized = normalize_company_name(company_name)
+            if len(normalized) < min_name_length:
+                continue
+            self.names[company_id] = company_name
+            self.exact.setdefault(normalized, company_id)
+            self.grams[company_id] = trigrams(normalized)
+
+        postings: Dict[str, Set[int]] = {}
+        for company_id, grams in self.grams.items():
+            for gram in grams:
+                postings.setdefault(gram, set()).add(company_id)
+        max_postings = max(int(len(self.grams) * max_posting_share), 3)
+        self.blocking = {gram: ids for gram, ids in postings.items() if len(ids) <= max_postings}
+
+        # Exact names ordered longest first for whole-text scanning
+        self.scan_names = sorted(self.exact, key=len, reverse=True)
+
+    def __len__(self):
+        return len(self.names)
+
+    def resolve(self, mention: str) -> Optional[Tuple[int, float]]:
+        """Return (company_id, score) for a mention, or None below the threshold"""
+        normalized = normalize_company_name(mention)
+        if len(normalized) < self.min_name_length:
+            return None
+        company_id = self.exact.get(normalized)
+        if company_id is not None:
+            return company_id, 1.0
+
+        grams = trigrams(normalized)
+        shared = Counter()
+        for gram in grams:
+            for candidate in self.blocking.get(gram, ()):
+                shared[candidate] += 1
+
+        best, best_score = None, 0.0
+        for candidate, common in shared.items():
+            # Dice can never exceed 2*min/(sum) of the set sizes; skip hopeless candidates
+            size = len(self.grams[candidate])
+            if 2.0 * min(len(grams), size) / (len(grams) + size) < self.threshold:
+                continue
+            score = dice(grams, self.grams[candidate])
+            if score > best_score:
+                best, best_score = candidate, score
+        if best is not None and best_score >= self.threshold:
+            return best, round(best_score, 3)
+        return None
+
+    def candidate_mentions(self, text: str) -> List[str]:
+        """Capitalized phrases that could name a company"""
+        mentions = []
+        for match in _CANDIDATE_PATTERN.finditer(text or ''):
+            phrase = match.group(0).strip(" .,'&")
+            words = phrase.split()
+            if len(words) >= 2 or (words and words[-1].lower().strip('.') in LEGAL_SUFFIXES):
+                mentions.append(phrase)
+        return mentions
+
+    def find_companies(self, text: str, mentions: Iterable[str] = ()) -> Dict[int, Tuple[str, float]]:
+        """Resolve every company in text (and any pre-extracted mentions).
+
+        Returns company_id -> (mention, score), keeping the best score per company.
+        """
+        found: Dict[int, Tuple[str, float]] = {}
+
+        def keep(company_id, mention, score):
+            if company_id not in found or score > found[company_id][1]:
+                found[company_id] = (mention, score)
+
+        # Whole normalized names appearing verbatim in the text
+        padded_text = f" {normalize_company_name(text)} "
+        for normalized in self.scan_names:
+            if f" {normalized} " in padded_text:
+                keep(self.exact[normalized], normalized, 1.0)
+
+        for mention in list(mentions) + self.candidate_mentions(text):
+            result = self.resolve(mention)
+            if result:
+                keep(result[0], mention, result[1])
+        return found
+
+def ensure_schema(connection):
+    cursor = connection.cursor()
+    try:
+        cursor.execute(CREATE_LINKS_TABLE)
+        connection.commit()
+    finally:
+        cursor.close()
+
+def store_links(connection, rows: List[Tuple]) -> int:
+    """Upsert (article_id, company_id, mention, score, title, url, source, published_date) rows"""
+    if not rows:
+        return 0
+    cursor = connection.cursor()
+    try:
+        cursor.executemany("""
+            INSERT INTO article_company_links
+            (article_id, company_id, mention, score, title, url, source, published_date)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                mention = VALUES(mention),
+                score = VALUES(score),
+                published_date = VALUES(published_date)
+        """, rows)
+        connection.commit()
+    finally:
+        cursor.close()
+    return len(rows)
+
+def link_rows(resolver: CompanyResolver, article: Dict, published_date: Optional[str]) -> List[Tuple]:
+    """Link rows for one article dict (title, summary/content, url, source, companies)"""
+    text = ' '.join(filter(None, (article.get('title'), article.get('summary'), article.get('content'))))
+    doc_id = article_id(article)
+    matches = resolver.find_companies(text, article.get('companies') or ())
+    return [
+        (doc_id, company_id, mention[:255], score, article.get('title'), article.get('url'),
+         (article.get('source') or '')[:255], published_date)
+        for company_id, (mention, score) in matches.items()
+    ]
+
+def _connect():
+    import mysql.connector
+
+    return mysql.connector.connect(**get_mysql_config())
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Resolve company mentions to companies rows")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    resolve_parser = subparsers.add_parser('resolve', help="Resolve one or more names")
+    resolve_parser.add_argument('names', nargs='+')
+
+    link_parser = subparsers.add_parser('link', help="Backfill links from saved JSON reports")
+    link_parser.add_argument('--reports-dir', default='reports')
+
+    args = parser.parse_args(argv)
+
+    from company_activity import ensure_schema as ensure_activity_schema
+    from company_activity import link_pairs, refresh_pairs
+    from company_names import load_tracked_companies
+
+    connection = _connect()
+    try:
+        started = time.perf_counter()
+        resolver = CompanyResolver(load_tracked_companies(connection))
+        print(f"🔎 Resolver built for {len(resolver)} companies in "
+              f"{(time.perf_counter() - started) * 1000:.1f} ms")
+
+        if args.command == 'resolve':
+            for name in args.names:
+                started = time.perf_counter()
+                result = resolver.resolve(name)
+                elapsed_us = (time.perf_counter() - started) * 1e6
+                label = f"{resolver.names[result[0]]} ({result[1]})" if result else 'no match'
+                print(f"{name!r} -> {label} [{elapsed_us:.0f} µs]")
+            return 0
+
+        ensure_activity_schema(connection)
+        linked = 0
+        for path in sorted(glob.glob(os.path.join(args.reports_dir, 'local825_intelligence_*.json'))):
+            with open(path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+            report_date = report.get('metadata', {}).get('date')
+            fallback = date.fromisoformat(report_date[:10]) if report_date else None
+            rows = []
+            for article in report.get('articles', []):
+                # Reports keep the feed's RFC 2822 'published'; fall back to the report date
+                day = published_day(article, fallback)
+                rows.extend(link_rows(resolver, article, day.isoformat() if day else None))
+            linked += store_links(connection, rows)
+            refresh_pairs(connection, link_pairs(rows))
+        print(f"✅ Stored {linked} article-company links")
+    finally:
+        connection.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for the scrapers.
+
+get_session() returns one process-wide requests.Session whose adapter keeps
+a pool of keep-alive connections per host, retries connection errors and
+429/5xx responses with exponential backoff (honoring Retry-After), applies
+a default timeout, and asks for gzip (plus brotli when the brotli package
+is installed, since urllib3 only decodes br then). Scrapers that need their
+own default headers (a fixed User-Agent, say) call build_session(), which
+returns a separately pooled session with the same behavior.
+
+Every session records, per host, how many requests it sent and how many
+new TCP/TLS connections it had to open; connection_stats() turns that into
+a reuse rate so runs can report how well keep-alive is working. Request
+latency and status codes per host go to the metrics registry
+(http_fetch_seconds, http_responses_total).
+
+requests/urllib3 speak HTTP/1.1 only; keep-alive pooling is what removes
+the repeated handshakes to the same few hosts.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from metrics import HTTP_FETCH_SECONDS, HTTP_RESPONSES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = float(os.getenv('HTTP_TIMEOUT_SECONDS', 30))
+DEFAULT_RETRIES = int(os.getenv('HTTP_RETRIES', 3))
+DEFAULT_BACKOFF = float(os.getenv('HTTP_BACKOFF_SECONDS', 0.5))
+DEFAULT_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 10))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+DEFAULT_USER_AGENT = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+                      '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+
+try:
+    import brotli  # noqa: F401  (urllib3 decodes br responses when it is importable)
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'gzip, deflate, br'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+class HostStats:
+    """Thread-safe per-host request / new-connection / retry counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, int]] = {}
+
+    def _bump(self, host: str, field: str, amount: int = 1):
+        with self._lock:
+            counters = self._hosts.setdefault(host, {'requests': 0, 'connections': 0, 'retries': 0})
+            counters[field] += amount
+
+    def record_request(self, host: str, retries: int = 0):
+        self._bump(host, 'requests')
+        if retries:
+            self._bump(host, 'retries', retries)
+
+    def record_connection(self, host: str):
+        self._bump(host, 'connections')
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """host -> requests, connections, retries and reuse_rate (share of requests on a reused connection)"""
+        with self._lock:
+            hosts = {host: dict(counters) for host, counters in self._hosts.items()}
+        for counters in hosts.values():
+            attempts = counters['requests'] + counters['retries']
+            reused = max(attempts - counters['connections'], 0)
+            counters['reuse_rate'] = round(reused / attempts, 3) if attempts else 0.0
+        return dict(sorted(hosts.items()))
+
+    def reset(self):
+        with self._lock:
+            self._hosts.clear()
+
+STATS = HostStats()
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        STATS.record_connection(self.host)
+        return super()._new_conn()
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        STATS.record_connection(self.host)
+        return super()._new_conn()
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter with retry/backoff, a default timeout and per-host stats"""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF, pool_maxsize: int = DEFAULT_POOL_MAXSIZE):
+        self.timeout = timeout
+        super().__init__(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize,
+                         max_retries=build_retry(retries, backoff))
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        host = urlsplit(request.url).hostname or ''
+        started = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+        except requests.RequestException:
+            HTTP_RESPONSES.inc(host=host, status='error')
+            raise
+        finally:
+            HTTP_FETCH_SECONDS.observe(time.perf_counter() - started, host=host)
+        HTTP_RESPONSES.inc(host=host, status=str(response.status_code))
+        retries = getattr(response.raw, 'retries', None)
+        STATS.record_request(host, len(retries.history) if retries else 0)
+        return response
+
+def build_retry(retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF) -> Retry:
+    """Retry connection errors and 429/5xx on idempotent methods with exponential backoff"""
+    options = dict(total=retries, connect=retries, read=retries, status=retries,
+                   backoff_factor=backoff, status_forcelist=RETRY_STATUSES,
+                   respect_retry_after_header=True, raise_on_status=False)
+    try:
+        return Retry(allowed_methods=Retry.DEFAULT_ALLOWED_METHODS, **options)
+    except (TypeError, AttributeError):
+        # urllib3 < 1.26
+        return Retry(method_whitelist=Retry.DEFAULT_METHOD_WHITELIST, **options)
+
+def build_session(headers: Optional[Dict[str, str]] = None, timeout: float = DEFAULT_TIMEOUT,
+                  retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF,
+                  pool_maxsize: int = DEFAULT_POOL_MAXSIZE) -> requests.Session:
+    """A new pooled session; headers override the shared defaults"""
+    session = requests.Session()
+    adapter = PooledAdapter(timeout, retries, backoff, pool_maxsize)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'User-Agent': DEFAULT_USER_AGENT,
+        'Accept-Encoding': ACCEPT_ENCODING,
+        'Connection': 'keep-alive',
+    })
+    if headers:
+        session.headers.update(headers)
+    return session
+
+_shared_session: Optional[requests.Session] = None
+_shared_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """The process-wide pooled session (pass per-request headers rather than mutating it)"""
+    global _shared_session
+    if _shared_session is None:
+        with _shared_lock:
+            if _shared_session is None:
+                _shared_session = build_session()
+    return _shared_session
+
+def connection_stats() -> Dict[str, Dict]:
+    """Per-host request, connection, retry and reuse-rate counters for this process"""
+    return STATS.snapshot()
+
+def connection_report() -> List[str]:
+    """One line per host with its connection reuse rate"""
+    return [
+        f"🔌 {host}: {counters['requests']} requests over {counters['connections']} "
+        f"connections (reuse {counters['reuse_rate']:.0%}, {counters['retries']} retries)"
+        for host, counters in connection_stats().items()
+    ]
+
+def log_connection_stats(log: logging.Logger = logger):
+    for line in connection_report():
+        log.info(line)
@@ -0,0 +1,281 @@
+"""
+Scraping job queue backed by the scraping_jobs table.
+
+Workers claim due jobs with SELECT ... FOR UPDATE SKIP LOCKED, advance
+next_run from the job's cron expression and take a short lease in the same
+transaction, then run the job in a thread pool. Any number of worker
+processes, on one machine or several, can share the table without running
+a job twice.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set
+
+import mysql.connector
+from mysql.connector import Error
+
+logger = logging.getLogger(__name__)
+
+# Columns added to scraping_jobs for leasing; created by setup_database.py on
+# new installs and by ensure_job_queue_schema() on existing ones
+LEASE_COLUMNS = {
+    'locked_by': "ALTER TABLE scraping_jobs ADD COLUMN locked_by VARCHAR(255) NULL",
+    'locked_until': "ALTER TABLE scraping_jobs ADD COLUMN locked_until TIMESTAMP NULL",
+    'last_error': "ALTER TABLE scraping_jobs ADD COLUMN last_error TEXT NULL",
+}
+
+class CronSchedule:
+    """Minimal five-field cron expression (minute hour day-of-month month day-of-week)"""
+
+    FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = [
+            self._parse_field(field, low, high)
+            for field, (low, high) in zip(fields, self.FIELD_RANGES)
+        ]
+        # Standard cron: when both day fields are restricted, either may match
+        self.day_restricted = fields[2] != '*'
+        self.weekday_restricted = fields[4] != '*'
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> Set[int]:
+        values = set()
+        for part in field.split(','):
+            step = 1
+            if '/' in part:
+                part, step_text = part.split('/', 1)
+                step = int(step_text)
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                start_text, end_text = part.split('-', 1)
+                start, end = int(start_text), int(end_text)
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+            if high == 6 and max(start, end) > 7:
+                # 7 is accepted as Sunday; anything above is an error, not a clamp
+                raise ValueError(f"Invalid cron field {field!r}")
+            values.update(value % 7 if high == 6 else value for value in range(start, end + 1, step))
+        if not values or min(values) < low or max(values) > high:
+            raise ValueError(f"Invalid cron field {field!r}")
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.isoweekday() % 7) in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Return the first matching minute strictly after moment"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year = candidate.year + (candidate.month == 12)
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never fires: {self.expression!r}")
+
+def ensure_job_queue_schema(connection) -> None:
+    """Add the lease columns and the unique job_name key to an existing scraping_jobs table"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            SELECT COLUMN_NAME FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'scraping_jobs'
+        """)
+        existing = {row[0] for row in cursor.fetchall()}
+        for column, ddl in LEASE_COLUMNS.items():
+            if column not in existing:
+                cursor.execute(ddl)
+                logger.info(f"🗄️ Added scraping_jobs.{column}")
+
+        # Tables created before unique_job_name may hold the same job twice,
+        # which would run it twice; keep the oldest row of each name
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'scraping_jobs'
+              AND INDEX_NAME = 'unique_job_name'
+        """)
+        if not cursor.fetchone()[0]:
+            cursor.execute("""
+                DELETE newer FROM scraping_jobs newer
+                JOIN scraping_jobs older ON older.job_name = newer.job_name AND older.id < newer.id
+            """)
+            if cursor.rowcount:
+                logger.info(f"🗄️ Removed {cursor.rowcount} duplicate scraping_jobs row(s)")
+            cursor.execute("ALTER TABLE scraping_jobs ADD UNIQUE KEY unique_job_name (job_name)")
+            logger.info("🗄️ Added scraping_jobs.unique_job_name")
+        connection.commit()
+    finally:
+        cursor.close()
+
+class JobWorker:
+    """Claims due scraping jobs and runs them in a thread pool.
+
+    job_runner(source_name, category) performs one job and returns True on
+    success. It is called from pool threads, so it must not share a database
+    connection between calls running at the same time.
+    """
+
+    def __init__(self, db_config: Dict, job_runner: Callable[[str, str], bool],
+                 max_workers: int = 4, poll_interval: int = 60, lease_minutes: int = 60,
+                 worker_id: Optional[str] = None):
+        self.db_config = db_config
+        self.job_runner = job_runner
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.lease = timedelta(minutes=lease_minutes)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scraping-job')
+        self.running: Set[int] = set()
+        self.running_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.connection = None
+
+    def connect(self):
+        """Open (or reopen) the connection used for claiming and completing jobs"""
+        if not self.connection or not self.connection.is_connected():
+            self.connection = mysql.connector.connect(**self.db_config)
+        return self.connection
+
+    def claim_due_jobs(self, limit: int) -> List[Dict]:
+        """Atomically claim up to limit due jobs for this worker"""
+        if limit <= 0:
+            return []
+
+        connection = self.connect()
+        cursor = connection.cursor(dictionary=True)
+        claimed = []
+        try:
+            connection.start_transaction()
+            cursor.execute("SELECT NOW() AS now")
+            now = cursor.fetchone()['now']
+            cursor.execute("""
+                SELECT id, job_name, source_name, category, schedule
+                FROM scraping_jobs
+                WHERE status != 'paused'
+                  AND (next_run IS NULL OR next_run <= %s)
+                  AND (locked_until IS NULL OR locked_until < %s)
+                ORDER BY next_run IS NOT NULL, next_run
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            """, (now, now, limit))
+            jobs = cursor.fetchall()
+
+            for job in jobs:
+                try:
+                    next_run = CronSchedule(job['schedule']).next_after(now) if job['schedule'] else None
+                except ValueError as e:
+                    logger.error(f"❌ Job '{job['job_name']}' has an invalid schedule: {e}")
+                    cursor.execute("""
+                        UPDATE scraping_jobs SET status = 'paused', last_error = %s WHERE id = %s
+                    """, (str(e), job['id']))
+                    continue
+
+                cursor.execute("""
+                    UPDATE scraping_jobs
+                    SET last_run = %s, next_run = %s, locked_by = %s, locked_until = %s
+                    WHERE id = %s
+                """, (now, next_run, self.worker_id, now + self.lease, job['id']))
+                job['next_run'] = next_run
+                claimed.append(job)
+
+            connection.commit()
+        except Error:
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+        return claimed
+
+    def complete_job(self, job: Dict, success: bool, error: Optional[str] = None):
+        """Release the lease and record the outcome of a job"""
+        connection = mysql.connector.connect(**self.db_config)
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""
+                UPDATE scraping_jobs
+                SET status = %s, last_error = %s, locked_by = NULL, locked_until = NULL
+                WHERE id = %s AND locked_by = %s
+            """, ('active' if success else 'error', error, job['id'], self.worker_id))
+            connection.commit()
+        finally:
+            cursor.close()
+            connection.close()
+
+    def _run_job(self, job: Dict):
+        started = time.perf_counter()
+        logger.info(f"🕷️ [{self.worker_id}] Running job '{job['job_name']}' ({job['source_name']})")
+        success, error = False, None
+        try:
+            success = bool(self.job_runner(job['source_name'], job['category']))
+            if not success:
+                error = 'Job runner reported failure'
+        except Exception as e:
+            error = str(e)
+            logger.error(f"❌ Job '{job['job_name']}' failed: {e}")
+        finally:
+            try:
+                self.complete_job(job, success, error)
+            except Error as e:
+                logger.error(f"❌ Could not release job '{job['job_name']}': {e}")
+            with self.running_lock:
+                self.running.discard(job['id'])
+            logger.info(f"{'✅' if success else '⚠️'} Job '{job['job_name']}' finished in "
+                        f"{time.perf_counter() - started:.1f}s, next run {job['next_run']}")
+
+    def poll_once(self) -> int:
+        """Claim as many due jobs as there are free workers and submit them"""
+        with self.running_lock:
+            free_slots = self.max_workers - len(self.running)
+        jobs = self.claim_due_jobs(free_slots)
+        for job in jobs:
+            with self.running_lock:
+                self.running.add(job['id'])
+            self.executor.submit(self._run_job, job)
+        return len(jobs)
+
+    def run_forever(self):
+        """Poll for due jobs until stop() is called"""
+        ensure_job_queue_schema(self.connect())
+        logger.info(f"⏳ Job worker {self.worker_id} polling every {self.poll_interval}s "
+                    f"with {self.max_workers} workers")
+        while not self.stop_event.is_set():
+            try:
+                claimed = self.poll_once()
+                if claimed:
+                    logger.info(f"📥 Claimed {claimed} due job(s)")
+            except Error as e:
+                logger.error(f"❌ Job queue database error: {e}")
+                self.connection = None
+            self.stop_event.wait(self.poll_interval)
+
+    def stop(self, wait: bool = True):
+        """Stop polling and optionally wait for running jobs"""
+        self.stop_event.set()
+        self.executor.shutdown(wait=wait)
+        if self.connection and self.connection.is_connected():
+            self.connection.close()
@@ -1,30 +1,26 @@
 import os
-import requests
-import openai
-import supabase
-import pandas as pd
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
-import schedule
 import time
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
-from datetime import datetime
-import mysql.connector
-from mysql.connector import Error
+from datetime import datetime, timedelta
 import json
 import asyncio
-from crawl4ai import AsyncWebCrawler
+import functools
 import logging
 from typing import Dict, List, Any, Optional
 import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from http.server import HTTPServer, BaseHTTPRequestHandler
 import urllib.parse
 import sys
 
+from mysql_config import get_mysql_config
+
+# Heavy dependencies (mysql.connector, crawl4ai and its browser stack, requests,
+# the connector modules) are imported where they are used, so the MCP-only and
+# report-only entry points start without loading them. src/startup_importtime.py
+# keeps this honest.
+
 # Load environment variables
 load_dotenv()
 
@@ -134,6 +130,36 @@ def print_progress_bar(current: int, total: int, description: str = "Progress"):
     percentage = current / total * 100
     print(f"🔄 {description}: [{bar}] {percentage:.1f}% ({current}/{total})")
 
+def mysql_connect():
+    """Open a MySQL connection (mysql.connector is only imported by paths that need the database)"""
+    import mysql.connector
+
+    return mysql.connector.connect(**get_mysql_config())
+
+# Connectors for public data that need no api_configs key
+KEYLESS_APIS = frozenset({'sec_edgar', 'usaspending', 'osha_api', 'nlrb_api'})
+
+# Connectors that take a rate-limit token per HTTP request they make themselves
+SELF_RATE_LIMITED_APIS = frozenset({'sec_edgar', 'usaspending'})
+
+# Per-request HTTP timeout for connectors; a comprehensive run also caps it at its deadline
+API_REQUEST_TIMEOUT = float(os.getenv('API_REQUEST_TIMEOUT_SECONDS', 60))
+
+def shutdown_executor(executor: ThreadPoolExecutor):
+    """Shut an executor down without waiting for running work, cancelling anything still queued"""
+    if sys.version_info >= (3, 9):
+        executor.shutdown(wait=False, cancel_futures=True)
+        return
+    # cancel_futures is Python 3.9+; drain the queue by hand
+    while True:
+        try:
+            work_item = executor._work_queue.get_nowait()
+        except queue.Empty:
+            break
+        if work_item is not None:
+            work_item.future.cancel()
+    executor.shutdown(wait=False)
+
 class DataPilotPlusScraper:
     def __init__(self):
         print_banner()
@@ -143,12 +169,28 @@ class DataPilotPlusScraper:
         self.headers = {'User-Agent': os.getenv('USER_AGENT')}
         self.today = datetime.now().strftime('%Y-%m-%d')
         self.db_connection = None
-        self.crawler = AsyncWebCrawler()
+        # Created on first use: report-only runs never start a browser or open an EDGAR session
+        self._crawler = None
+        self._sec_session = None
+        # Set by run_comprehensive_scraping for the length of a run
+        self._api_executor = None
+        self._db_writer = None
+
+        from api_config_cache import get_config_cache
+        from rate_limiter import get_rate_limiter
+
+        self.config_cache = get_config_cache(get_mysql_config())
         
         print_status("Setting up database connection...", "connecting")
         # Initialize database
         self.init_database()
         
+        # Per-API token buckets shared with every other worker process
+        self.rate_limiter = get_rate_limiter(
+            get_mysql_config() if self.db_connection else None,
+            self.config_cache.get_rate_limit
+        )
+        
         # Data sources configuration based on the comprehensive table
         self.data_sources = {
             'company_information': {
@@ -265,22 +307,39 @@ class DataPilotPlusScraper:
         
         print_status("DataPilotPlus Intelligence Scraper initialized successfully!", "success")
     
+    @property
+    def crawler(self):
+        """crawl4ai AsyncWebCrawler, created on first use"""
+        if self._crawler is None:
+            from crawl4ai import AsyncWebCrawler
+
+            self._crawler = AsyncWebCrawler()
+        return self._crawler
+    
+    @property
+    def sec_session(self):
+        """Pooled HTTP session for EDGAR (SEC requires an identifying User-Agent)"""
+        if self._sec_session is None:
+            from http_client import build_session
+
+            self._sec_session = build_session(headers={
+                'User-Agent': os.getenv('SEC_USER_AGENT') or os.getenv('USER_AGENT') or 'Local825 Intelligence'
+            })
+        return self._sec_session
+    
     def init_database(self):
         """Initialize MySQL database connection and create tables"""
+        from mysql.connector import Error
+
         try:
             print_status("Connecting to MySQL database...", "connecting")
-            self.db_connection = mysql.connector.connect(
-                host=os.getenv('MYSQL_HOST', 'localhost'),
-                port=int(os.getenv('MYSQL_PORT', 3306)),
-                database=os.getenv('MYSQL_DATABASE', 'datapilotplus_scraper'),
-                user=os.getenv('MYSQL_USERNAME'),
-                password=os.getenv('MYSQL_PASSWORD'),
-                charset=os.getenv('MYSQL_CHARSET', 'utf8mb4')
-            )
+            self.db_connection = mysql_connect()
             
             if self.db_connection.is_connected():
                 print_status("✅ Successfully connected to MySQL database", "success")
                 self.create_tables()
+                self.config_cache.ensure_schema()
+                self.config_cache.refresh_if_stale()
             else:
                 print_status("❌ Failed to connect to MySQL database", "error")
                 
@@ -293,6 +352,10 @@ class DataPilotPlusScraper:
         if not self.db_connection:
             return
             
+        from mysql.connector import Error
+        from article_scoring import ensure_schema as ensure_scoring_schema
+        from blob_store import ensure_schema as ensure_blob_schema
+
         print_status("Creating database tables...", "processing")
         cursor = self.db_connection.cursor()
         
@@ -305,7 +368,7 @@ class DataPilotPlusScraper:
             method_type VARCHAR(50) NOT NULL,
             url TEXT,
             data_points JSON,
-            content TEXT,
+            content MEDIUMTEXT,
             analysis JSON,
             scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
@@ -345,6 +408,18 @@ class DataPilotPlusScraper:
         
         try:
             cursor.execute(create_data_table)
+            # Full page content from site crawls no longer fits in TEXT (64 KB)
+            cursor.execute("""
+                SELECT DATA_TYPE FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'scraped_data' AND COLUMN_NAME = 'content'
+            """)
+            row = cursor.fetchone()
+            if row and row[0].lower() == 'text':
+                cursor.execute("ALTER TABLE scraped_data MODIFY content MEDIUMTEXT")
+            # Relevance, jurisdiction, counties and article category are scored at ingest
+            ensure_scoring_schema(self.db_connection)
+            # Bodies live in the blob store; rows keep their SHA-256
+            ensure_blob_schema(self.db_connection)
             print_status("✅ Table 'scraped_data' created successfully", "success")
             
             cursor.execute(create_reports_table)
@@ -362,90 +437,85 @@ class DataPilotPlusScraper:
             cursor.close()
     
     async def scrape_datapilotplus(self):
-        """Scrape DataPilotPlus.com for company information"""
+        """Crawl DataPilotPlus.com (homepage and linked pages) and store each page's full content"""
         try:
-            print_status(f"🕷️ Starting DataPilotPlus scraping from {self.base_url}", "scraping")
+            print_status(f"🕷️ Starting DataPilotPlus site crawl from {self.base_url}", "scraping")
             
-            # Use crawl4ai for intelligent scraping
+            # Frontier crawl on crawl4ai; budgets come from SITE_CRAWL_* settings
             print_status("🤖 Initializing AI-powered crawler...", "processing")
-            result = await self.crawler.arun(
-                url=self.base_url,
-                extraction_strategy="LLMExtractionStrategy",
-                extraction_prompt="Extract all company information, services, team members, and business details from this page. Focus on company name, description, services offered, team members, and any business intelligence data."
-            )
+            from site_crawler import SiteCrawler
+
+            site_crawler = SiteCrawler(self.crawler)
+            pages, stats = await site_crawler.crawl(self.base_url)
+            crawl_stats = stats.as_dict()
             
-            if result and result.success:
-                # Extract content from the result object
-                if hasattr(result, 'extracted_content') and result.extracted_content:
-                    content = result.extracted_content
-                elif hasattr(result, 'markdown') and result.markdown:
-                    content = result.markdown
-                elif hasattr(result, 'text') and result.text:
-                    content = result.text
-                elif hasattr(result, 'html') and result.html:
-                    content = result.html
-                else:
-                    # Fallback: try to get any available content
-                    content = str(result)
-                
-                if content and len(content) > 0:
-                    print_status(f"✅ Successfully scraped DataPilotPlus: {len(content)} characters", "success")
-                    
-                    # Save to database
-                    print_status("💾 Saving scraped data to database...", "saving")
-                    self.save_scraped_data(
-                        source_name='datapilotplus.com',
-                        category='company_information',
-                        method_type='Web Scraping',
-                        url=self.base_url,
-                        data_points={
-                            'company_name': 'DataPilotPlus',
-                            'content_length': len(content),
-                            'scraped_at': datetime.now().isoformat(),
-                            'scraping_method': 'crawl4ai'
-                        },
-                        content=content[:1000] + "..." if len(content) > 1000 else content,  # Truncate if too long
-                        analysis={'scraping_method': 'crawl4ai', 'success': True, 'content_type': 'extracted'}
-                    )
-                    
-                    return content
-                else:
-                    print_status("⚠️ Crawler returned empty content", "warning")
-                    return None
-            else:
-                error_msg = "Unknown error"
-                if hasattr(result, 'error') and result.error:
-                    error_msg = result.error
-                elif hasattr(result, 'status') and result.status:
-                    error_msg = result.status
-                
-                print_status(f"❌ Failed to scrape DataPilotPlus: {error_msg}", "error")
+            if not pages:
+                print_status(f"❌ Failed to crawl DataPilotPlus: {'; '.join(stats.errors[:3]) or 'no pages'}", "error")
                 return None
+            
+            print_status(f"✅ Crawled {stats.pages} DataPilotPlus pages: {stats.bytes_extracted:,} bytes "
+                         f"at {crawl_stats['pages_per_sec']} pages/sec", "success")
+            
+            # Save to database, one row per page with its full content
+            print_status("💾 Saving scraped pages to database...", "saving")
+            for page in pages:
+                await self.save_scraped_data_async(
+                    source_name='datapilotplus.com',
+                    category='company_information',
+                    method_type='Web Scraping',
+                    url=page.url,
+                    data_points={
+                        'company_name': 'DataPilotPlus',
+                        'title': page.title,
+                        'depth': page.depth,
+                        'status_code': page.status_code,
+                        'content_length': page.bytes,
+                        'links': page.links,
+                        'scraped_at': datetime.now().isoformat(),
+                        'scraping_method': 'crawl4ai'
+                    },
+                    content=page.content,
+                    analysis={'scraping_method': 'crawl4ai', 'success': True, 'content_type': 'site_crawl',
+                              'crawl_seconds': page.seconds}
+                )
+            
+            return {'pages': len(pages), 'stats': crawl_stats}
                 
         except Exception as e:
             print_status(f"❌ Error scraping DataPilotPlus: {e}", "error")
             return None
     
-    def scrape_api_data(self, api_name: str, api_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Scrape data from various APIs"""
+    def scrape_api_data(self, api_name: str, api_config: Dict[str, Any], api_key: Optional[str] = None,
+                        timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Scrape data from various APIs.
+
+        Pass api_key when calling from a worker thread so the shared database
+        connection is not used concurrently. timeout bounds each HTTP request
+        a connector makes (API_REQUEST_TIMEOUT by default).
+        """
+        timeout = timeout or API_REQUEST_TIMEOUT
         try:
             print_status(f"🔌 Scraping API: {api_name}", "connecting")
             
             # Check if we have API key in database
-            api_key = self.get_api_key(api_name)
-            if not api_key:
+            if api_key is None:
+                api_key = self.get_api_key(api_name)
+            if not api_key and api_name not in KEYLESS_APIS:
                 print_status(f"⚠️ No API key found for {api_name}", "warning")
                 return None
+            if api_name not in SELF_RATE_LIMITED_APIS:
+                self.rate_limiter.acquire_blocking(api_name)
+            self.config_cache.mark_used(api_name)
             
             # Implement specific API scraping logic based on api_name
             if api_name == 'sec_edgar':
-                return self.scrape_sec_edgar(api_key)
+                return self.scrape_sec_edgar(api_key, timeout)
             elif api_name == 'opencorporates':
                 return self.scrape_opencorporates(api_key)
             elif api_name == 'yahoo_finance':
                 return self.scrape_yahoo_finance(api_key)
             elif api_name == 'usaspending':
-                return self.scrape_usaspending(api_key)
+                return self.scrape_usaspending(api_key, timeout)
             elif api_name == 'osha_api':
                 return self.scrape_osha_api(api_key)
             elif api_name == 'nlrb_api':
@@ -462,14 +532,43 @@ class DataPilotPlusScraper:
             print_status(f"❌ Error scraping API {api_name}: {e}", "error")
             return None
     
-    def scrape_sec_edgar(self, api_key: str) -> Optional[Dict[str, Any]]:
-        """Scrape SEC EDGAR data"""
+    def scrape_sec_edgar(self, api_key: str, timeout: float = API_REQUEST_TIMEOUT) -> Optional[Dict[str, Any]]:
+        """Bring the local EDGAR bulk index up to date and report recent filings.
+
+        The index is seeded from submissions.zip / companyfacts.zip with
+        `python src/edgar_bulk.py ingest`; each run only applies the EDGAR
+        daily indexes published since the last one.
+        """
         try:
             print_status("📊 Scraping SEC EDGAR data...", "scraping")
-            # SEC EDGAR API implementation
-            headers = {'User-Agent': self.headers['User-Agent']}
-            # Add SEC API specific logic here
-            return {'status': 'success', 'data': 'SEC EDGAR data placeholder'}
+            from company_names import load_tracked_companies
+            from edgar_bulk import EdgarBulkIndex, make_sec_fetcher, update_from_daily_indexes
+
+            # Runs in a worker thread, so use a private connection for the companies table
+            connection = mysql_connect()
+            try:
+                companies = load_tracked_companies(connection)
+            finally:
+                connection.close()
+
+            fetch = make_sec_fetcher(self.sec_session.headers['User-Agent'], self.rate_limiter,
+                                     self.sec_session, timeout=timeout)
+            with EdgarBulkIndex() as index:
+                update = update_from_daily_indexes(index, fetch, companies)
+                since = datetime.now().date() - timedelta(days=7)
+                filings = index.recent_filings(since)
+                counts = index.counts()
+
+            if not counts['filers']:
+                print_status("⚠️ EDGAR index has no matched filers; run src/edgar_bulk.py ingest", "warning")
+            return {
+                'status': 'success',
+                'data': {
+                    'recent_filings': filings,
+                    'daily_update': update,
+                    'index_counts': counts
+                }
+            }
         except Exception as e:
             print_status(f"❌ Error scraping SEC EDGAR: {e}", "error")
             return None
@@ -497,35 +596,69 @@ class DataPilotPlusScraper:
             print_status(f"❌ Error scraping Yahoo Finance: {e}", "error")
             return None
     
-    def scrape_usaspending(self, api_key: str) -> Optional[Dict[str, Any]]:
-        """Scrape USAspending.gov data"""
+    def scrape_usaspending(self, api_key: str, timeout: float = API_REQUEST_TIMEOUT) -> Optional[Dict[str, Any]]:
+        """Sync NJ/NY construction contract awards into usaspending_awards"""
         try:
             print_status("🏛️ Scraping USAspending.gov data...", "scraping")
-            # USAspending API implementation
-            # Add USAspending API specific logic here
-            return {'status': 'success', 'data': 'USAspending data placeholder'}
+            from company_activity import ensure_schema as ensure_activity_schema
+            from company_activity import refresh_companies
+            from company_names import build_name_index, load_tracked_companies
+            from usaspending_awards import recent_awards, sync_awards
+
+            # Runs in a worker thread, so use a private connection
+            connection = mysql_connect()
+            try:
+                companies = build_name_index(load_tracked_companies(connection))
+                sync = sync_awards(connection, rate_limiter=self.rate_limiter, companies=companies,
+                                   timeout=timeout)
+                ensure_activity_schema(connection)
+                refresh_companies(connection, sync['companies'])
+                awards = recent_awards(connection)
+            finally:
+                connection.close()
+            print_status(f"🏛️ USAspending: {sync['upserted']} awards upserted", "success")
+            return {'status': 'success', 'data': {'sync': sync, 'recent_awards': awards}}
         except Exception as e:
             print_status(f"❌ Error scraping USAspending: {e}", "error")
             return None
     
+    def enforcement_records(self, source: str) -> Dict[str, Any]:
+        """Summarize bulk-loaded OSHA/NLRB records for tracked companies (see enforcement_loader.py)"""
+        from company_activity import ensure_schema as ensure_activity_schema
+        from company_activity import rebuild_all
+        from company_names import build_name_index, load_tracked_companies
+        from enforcement_loader import enforcement_summary, match_companies
+        from enforcement_loader import ensure_schema as ensure_enforcement_schema
+
+        # Runs in a worker thread, so use a private connection
+        connection = mysql_connect()
+        try:
+            ensure_enforcement_schema(connection)
+            companies = build_name_index(load_tracked_companies(connection))
+            matched = match_companies(connection, companies)
+            if any(matched.values()):
+                ensure_activity_schema(connection)
+                rebuild_all(connection)
+            since = (datetime.now().date() - timedelta(days=90)).isoformat()
+            summary = enforcement_summary(connection, since)
+        finally:
+            connection.close()
+        return {'since': since, 'newly_matched': matched, 'summary': summary[source]}
+
     def scrape_osha_api(self, api_key: str) -> Optional[Dict[str, Any]]:
-        """Scrape OSHA API data"""
+        """Report OSHA inspections/violations for tracked companies from the bulk tables"""
         try:
             print_status("🦺 Scraping OSHA API data...", "scraping")
-            # OSHA API implementation
-            # Add OSHA API specific logic here
-            return {'status': 'success', 'data': 'OSHA data placeholder'}
+            return {'status': 'success', 'data': self.enforcement_records('osha')}
         except Exception as e:
             print_status(f"❌ Error scraping OSHA API: {e}", "error")
             return None
     
     def scrape_nlrb_api(self, api_key: str) -> Optional[Dict[str, Any]]:
-        """Scrape NLRB API data"""
+        """Report NLRB cases for tracked companies from the bulk tables"""
         try:
             print_status("⚖️ Scraping NLRB API data...", "scraping")
-            # NLRB API implementation
-            # Add NLRB API specific logic here
-            return {'status': 'success', 'data': 'NLRB data placeholder'}
+            return {'status': 'success', 'data': self.enforcement_records('nlrb')}
         except Exception as e:
             print_status(f"❌ Error scraping NLRB API: {e}", "error")
             return None
@@ -553,20 +686,16 @@ class DataPilotPlusScraper:
             return None
     
     def get_api_key(self, api_name: str) -> Optional[str]:
-        """Get API key from database"""
+        """Get API key from the shared api_configs cache"""
         if not self.db_connection:
             return None
-            
-        cursor = self.db_connection.cursor()
-        try:
-            cursor.execute("SELECT api_key FROM api_configs WHERE api_name = %s", (api_name,))
-            result = cursor.fetchone()
-            return result[0] if result else None
-        except Error as e:
-            print_status(f"❌ Error getting API key for {api_name}: {e}", "error")
-            return None
-        finally:
-            cursor.close()
+        return self.config_cache.get_api_key(api_name)
+    
+    def load_api_configs(self) -> Dict[str, Dict[str, Any]]:
+        """Return API keys, rate limits and last_used for every configured API"""
+        if not self.db_connection:
+            return {}
+        return self.config_cache.all()
     
     def save_scraped_data(self, source_name: str, category: str, method_type: str, 
                           url: str, data_points: Dict[str, Any], content: str, 
@@ -575,24 +704,37 @@ class DataPilotPlusScraper:
         if not self.db_connection:
             print_status("❌ No database connection available", "error")
             return
+        from mysql.connector import Error
+        from article_scoring import row_text, score_article, score_values, store_counties
+        from blob_store import get_store
+        from metrics import timed_execute
+        from response_cache import bump_data_generation
             
+        # Scored once here so readers filter and sort on indexed columns
+        score = score_article(row_text(data_points, content))
+        # The body is stored compressed, once per distinct content; the row keeps its hash
+        content_sha256 = get_store().put(content) if content else None
         cursor = self.db_connection.cursor()
         try:
             insert_query = """
             INSERT INTO scraped_data 
-            (source_name, category, method_type, url, data_points, content, analysis)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            (source_name, category, method_type, url, data_points, content_sha256, analysis,
+             relevance_score, jurisdiction, matched_counties, article_category)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             """
             
-            cursor.execute(insert_query, (
+            timed_execute(cursor, insert_query, (
                 source_name,
                 category,
                 method_type,
                 url,
                 json.dumps(data_points),
-                content,
+                content_sha256,
                 json.dumps(analysis)
-            ))
+            ) + score_values(score))
+            store_counties(cursor, [(cursor.lastrowid, score['matched_counties'])], replace=False)
+            # Moves the ETag of the cached /data responses in the same transaction
+            bump_data_generation(cursor)
             
             self.db_connection.commit()
             print_status(f"💾 Saved data from {source_name} to database", "saving")
@@ -601,12 +743,24 @@ class DataPilotPlusScraper:
             print_status(f"❌ Error saving data to database: {e}", "error")
         finally:
             cursor.close()
+
+    async def save_scraped_data_async(self, **fields):
+        """save_scraped_data off the event loop.
+
+        During a comprehensive run every save goes through one writer thread,
+        so the shared connection is never used by two threads at once.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._db_writer, functools.partial(self.save_scraped_data, **fields))
     
     def save_report(self, report_type: str, content: str, summary: Dict[str, Any]):
         """Save report to MySQL database"""
         if not self.db_connection:
             print_status("❌ No database connection available", "error")
             return
+        from mysql.connector import Error
+        from metrics import timed_execute
+        from response_cache import bump_data_generation
             
         cursor = self.db_connection.cursor()
         try:
@@ -615,12 +769,13 @@ class DataPilotPlusScraper:
             VALUES (%s, %s, %s, %s)
             """
             
-            cursor.execute(insert_query, (
+            timed_execute(cursor, insert_query, (
                 report_type,
                 datetime.now().date(),
                 content,
                 json.dumps(summary)
             ))
+            bump_data_generation(cursor)
             
             self.db_connection.commit()
             print_status(f"💾 Saved {report_type} report to database", "saving")
@@ -636,36 +791,38 @@ class DataPilotPlusScraper:
         
         if not self.db_connection:
             return "Database connection not available"
+        from mysql.connector import Error
+        from metrics import timed_execute
             
         cursor = self.db_connection.cursor()
         try:
             # Get summary statistics
-            cursor.execute("""
+            timed_execute(cursor, """
                 SELECT 
                     COUNT(*) as total_records,
                     COUNT(DISTINCT source_name) as unique_sources,
                     COUNT(DISTINCT category) as categories,
                     MAX(scraped_at) as last_scraped
                 FROM scraped_data
-            """)
+            """, statement='report_summary')
             stats = cursor.fetchone()
             
             # Get data by category
-            cursor.execute("""
+            timed_execute(cursor, """
                 SELECT category, COUNT(*) as count
                 FROM scraped_data
                 GROUP BY category
                 ORDER BY count DESC
-            """)
+            """, statement='report_categories')
             category_stats = cursor.fetchall()
             
             # Get recent data
-            cursor.execute("""
+            timed_execute(cursor, """
                 SELECT source_name, category, method_type, scraped_at
                 FROM scraped_data
                 ORDER BY scraped_at DESC
                 LIMIT 20
-            """)
+            """, statement='report_recent')
             recent_data = cursor.fetchall()
             
             report = f"""
@@ -744,7 +901,7 @@ IMPLEMENTATION APPROACH
 • API-based sources: Python requests with JSON/CSV parsing
 • Web scraping: BeautifulSoup, Selenium, and crawl4ai
 • Database: MySQL with structured JSON storage
-• Scheduling: Automated scraping every {os.getenv('SCRAPER_INTERVAL_HOURS', 6)} hours
+• Scheduling: Cron-scheduled jobs from the scraping_jobs table
 • MCP Server: Running on port {os.getenv('MCP_SERVER_PORT', 8000)}
 
 NEXT STEPS
@@ -772,6 +929,12 @@ Contact: jeremy@augments.art
     
     def send_comprehensive_report(self, report_content: str):
         """Send the comprehensive report via email"""
+        import smtplib
+        from email import encoders
+        from email.mime.base import MIMEBase
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+
         try:
             print_status("📧 Sending comprehensive intelligence report...", "reporting")
             
@@ -852,47 +1015,122 @@ DataPilotPlus Intelligence Bot
             print_status(f"❌ Failed to send comprehensive report: {e}", "error")
             return False
     
-    async def run_comprehensive_scraping(self):
-        """Run comprehensive scraping across all data sources"""
+    async def timed_source(self, run_record: Dict[str, Any], source_name: str, category: str,
+                           method_type: str, coroutine) -> Any:
+        """Await one source, recording its latency and outcome in the run record"""
+        started = time.perf_counter()
+        entry = {'source': source_name, 'category': category, 'method': method_type}
+        try:
+            result = await coroutine
+            entry['status'] = 'success' if result else 'no_data'
+            if isinstance(result, dict) and 'stats' in result:
+                # Site crawls report pages/sec and bytes extracted
+                entry['stats'] = result['stats']
+            return result
+        except asyncio.CancelledError:
+            entry['status'] = 'timeout'
+            raise
+        except Exception as e:
+            entry['status'] = 'error'
+            entry['error'] = str(e)
+            print_status(f"❌ Error scraping {source_name}: {e}", "error")
+            return None
+        finally:
+            entry['latency_ms'] = round((time.perf_counter() - started) * 1000, 1)
+            run_record['sources'].append(entry)
+
+    async def scrape_api_source(self, source_name: str, category: str, config: Dict[str, Any],
+                                api_key: Optional[str], timeout: float) -> Optional[Dict[str, Any]]:
+        """Run one blocking API connector in a worker thread, then save its result"""
+        loop = asyncio.get_running_loop()
+        api_data = await loop.run_in_executor(self._api_executor, self.scrape_api_data, source_name, config,
+                                              api_key, timeout)
+        if api_data:
+            await self.save_scraped_data_async(
+                source_name=source_name,
+                category=category,
+                method_type='API',
+                url=config['url'],
+                data_points=api_data,
+                content=str(api_data),
+                analysis={'api_name': source_name, 'success': True}
+            )
+        return api_data
+
+    def write_run_record(self, run_record: Dict[str, Any]):
+        """Append the run record to reports/scrape_runs.jsonl and log it"""
+        logging.info(f"Scrape run record: {json.dumps(run_record)}")
+        try:
+            os.makedirs('reports', exist_ok=True)
+            with open('reports/scrape_runs.jsonl', 'a', encoding='utf-8') as f:
+                f.write(json.dumps(run_record) + '\n')
+        except OSError as e:
+            print_status(f"⚠️ Could not write run record: {e}", "warning")
+
+    async def run_comprehensive_scraping(self, deadline_seconds: Optional[float] = None):
+        """Run comprehensive scraping across all data sources.
+
+        The crawl4ai site scrape and every API connector run concurrently.
+        Connectors wait on the shared per-API token buckets (see
+        rate_limiter.py) and anything still running at the deadline is
+        abandoned and recorded as a timeout. Connectors run on a per-run
+        executor that is shut down without waiting for them, and each HTTP
+        request they make is bounded by API_REQUEST_TIMEOUT (at most the
+        deadline), so an abandoned connector cannot hold the run open.
+        """
         print_status("🚀 Starting comprehensive DataPilotPlus scraping...", "startup")
+        if deadline_seconds is None:
+            deadline_seconds = float(os.getenv('SCRAPE_RUN_DEADLINE_SECONDS', 900))
+
+        run_started = time.perf_counter()
+        run_record = {
+            'run_id': datetime.now().strftime('%Y%m%d%H%M%S'),
+            'started_at': datetime.now().isoformat(),
+            'deadline_seconds': deadline_seconds,
+            'sources': []
+        }
+        
+        api_sources = [(category, source_name, config)
+                       for category, sources in self.data_sources.items()
+                       for source_name, config in sources.items() if config.get('method') == 'API']
+        request_timeout = min(API_REQUEST_TIMEOUT, deadline_seconds)
+        self._api_executor = ThreadPoolExecutor(max_workers=max(len(api_sources), 1),
+                                                thread_name_prefix='api-connector')
+        self._db_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scraped-data-writer')
         
         try:
-            # 1. Scrape DataPilotPlus.com
-            print_status("📊 Scraping DataPilotPlus.com...", "scraping")
-            datapilotplus_content = await self.scrape_datapilotplus()
-            
-            # 2. Scrape API-based sources
-            print_status("🔌 Scraping API-based data sources...", "connecting")
-            
-            # Count total sources for progress bar
-            total_sources = sum(len(sources) for sources in self.data_sources.values())
-            current_source = 0
+            api_configs = self.load_api_configs()
+            tasks = [asyncio.create_task(self.timed_source(
+                run_record, 'datapilotplus.com', 'company_information', 'Web Scraping',
+                self.scrape_datapilotplus()
+            ))]
+
+            for category, source_name, config in api_sources:
+                api_config = api_configs.get(source_name, {})
+                tasks.append(asyncio.create_task(self.timed_source(
+                    run_record, source_name, category, 'API',
+                    self.scrape_api_source(source_name, category, config, api_config.get('api_key'),
+                                           request_timeout)
+                )))
+
+            print_status(f"🔌 Scraping DataPilotPlus.com and {len(tasks) - 1} API sources concurrently "
+                         f"(deadline {deadline_seconds:.0f}s)", "scraping")
+            done, pending = await asyncio.wait(tasks, timeout=deadline_seconds)
+            if pending:
+                print_status(f"⏰ Deadline reached, abandoning {len(pending)} source(s)", "warning")
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+            # Connectors past the deadline are left running; saves already queued finish
+            # before the report reads the shared connection
+            shutdown_executor(self._api_executor)
+            self._db_writer.shutdown(wait=True)
             
-            for category, sources in self.data_sources.items():
-                print_status(f"📂 Processing category: {category.replace('_', ' ').title()}", "processing")
-                
-                for source_name, config in sources.items():
-                    current_source += 1
-                    print_progress_bar(current_source, total_sources, f"Scraping {source_name}")
-                    
-                    if config.get('method') == 'API':
-                        api_data = self.scrape_api_data(source_name, config)
-                        if api_data:
-                            self.save_scraped_data(
-                                source_name=source_name,
-                                category=category,
-                                method_type='API',
-                                url=config['url'],
-                                data_points=api_data,
-                                content=str(api_data),
-                                analysis={'api_name': source_name, 'success': True}
-                            )
-            
-            # 3. Generate comprehensive report
+            # Generate comprehensive report
             print_status("📋 Generating comprehensive intelligence report...", "reporting")
             report = self.generate_comprehensive_report()
             
-            # 4. Send report
+            # Send report
             print_status("📧 Sending comprehensive intelligence report...", "reporting")
             self.send_comprehensive_report(report)
             
@@ -901,6 +1139,78 @@ DataPilotPlus Intelligence Bot
         except Exception as e:
             print_status(f"❌ Error during comprehensive scraping: {e}", "error")
             raise
+        finally:
+            shutdown_executor(self._api_executor)
+            self._db_writer.shutdown(wait=True)
+            self._api_executor = self._db_writer = None
+            run_record['finished_at'] = datetime.now().isoformat()
+            run_record['duration_ms'] = round((time.perf_counter() - run_started) * 1000, 1)
+            run_record['rate_limits'] = self.rate_limiter.metrics()
+            from blob_store import get_store
+            from http_client import connection_stats
+            from metrics import snapshot as metrics_snapshot
+
+            run_record['http'] = connection_stats()
+            run_record['blobs'] = get_store().metrics()
+            # Latency histograms and stage counters accumulated by this process so far
+            run_record['metrics'] = metrics_snapshot()
+            self.write_run_record(run_record)
+            self.config_cache.flush_last_used()
+
+    def maintain_scraped_data(self) -> bool:
+        """Add upcoming scraped_data partitions and archive the ones past retention"""
+        if not self.db_connection:
+            return False
+        from mysql.connector import Error
+        from scraped_data_retention import maintain
+
+        try:
+            result = maintain(self.db_connection)
+        except Error as e:
+            print_status(f"❌ Error maintaining scraped_data partitions: {e}", "error")
+            return False
+        if result['added']:
+            print_status(f"🗂️ Added scraped_data partitions {', '.join(result['added'])}", "database")
+        for archived in result['archived']:
+            print_status(f"📦 Archived {archived['partition']}: {archived['rows']:,} rows, "
+                         f"{archived['raw_bytes']:,} -> {archived['archive_bytes']:,} bytes", "saving")
+        return True
+    
+    def run_job(self, source_name: str, category: str) -> bool:
+        """Run one scraping_jobs entry; returns True on success"""
+        if source_name == 'comprehensive':
+            asyncio.run(self.run_comprehensive_scraping())
+            return True
+
+        if source_name == 'datapilotplus.com':
+            return asyncio.run(self.scrape_datapilotplus()) is not None
+
+        if source_name == 'scraped_data_retention':
+            return self.maintain_scraped_data()
+
+        config = self.data_sources.get(category, {}).get(source_name)
+        if not config:
+            # Jobs may name a source under a different category than data_sources
+            config = next((sources[source_name] for sources in self.data_sources.values()
+                           if source_name in sources), None)
+        if not config or config.get('method') != 'API':
+            print_status(f"⚠️ No API source configured for job source {source_name}", "warning")
+            return False
+
+        api_data = self.scrape_api_data(source_name, config)
+        if not api_data:
+            return False
+        self.save_scraped_data(
+            source_name=source_name,
+            category=category,
+            method_type='API',
+            url=config['url'],
+            data_points=api_data,
+            content=str(api_data),
+            analysis={'api_name': source_name, 'success': True}
+        )
+        self.config_cache.flush_last_used()
+        return True
 
 # MCP Server Handler
 class MCPHandler(BaseHTTPRequestHandler):
@@ -920,6 +1230,15 @@ class MCPHandler(BaseHTTPRequestHandler):
             self.end_headers()
             response = {'service': 'DataPilotPlus Scraper', 'status': 'running'}
             self.wfile.write(json.dumps(response).encode())
+        elif parsed_path.path == '/metrics':
+            # Fetch, parse, stage and query metrics of the jobs this worker has run
+            from metrics import CONTENT_TYPE, render
+
+            body = render().encode()
+            self.send_response(200)
+            self.send_header('Content-type', CONTENT_TYPE)
+            self.end_headers()
+            self.wfile.write(body)
         else:
             self.send_response(404)
             self.end_headers()
@@ -971,43 +1290,100 @@ def start_mcp_server(port: int = 8000):
         print_status(f"❌ Failed to start MCP server: {e}", "error")
         return None, None
 
-# Main execution
-if __name__ == "__main__":
-    # Initialize scraper
-    scraper = DataPilotPlusScraper()
-    
+def run_worker():
+    """Run scraping_jobs from the job queue (and the MCP server, if enabled) until interrupted"""
+    from job_queue import JobWorker
+
     # Start MCP server if enabled
     mcp_server = None
     mcp_thread = None
     if os.getenv('MCP_SERVER_ENABLED', 'true').lower() == 'true':
         mcp_port = int(os.getenv('MCP_SERVER_PORT', 8000))
         mcp_server, mcp_thread = start_mcp_server(mcp_port)
-    
-    # Schedule comprehensive scraping
-    scraper_interval = int(os.getenv('SCRAPER_INTERVAL_HOURS', 6))
-    print_status(f"⏰ Scheduling scraper to run every {scraper_interval} hours", "info")
-    
-    schedule.every(scraper_interval).hours.do(
-        lambda: asyncio.run(scraper.run_comprehensive_scraping())
+
+    # Each pool thread gets its own scraper (and MySQL connection)
+    thread_scrapers = threading.local()
+    all_scrapers = []
+
+    def run_scraping_job(source_name: str, category: str) -> bool:
+        if not hasattr(thread_scrapers, 'scraper'):
+            thread_scrapers.scraper = DataPilotPlusScraper()
+            all_scrapers.append(thread_scrapers.scraper)
+        return thread_scrapers.scraper.run_job(source_name, category)
+
+    # Jobs come from the scraping_jobs table; new jobs (next_run NULL) run immediately
+    worker = JobWorker(
+        get_mysql_config(),
+        run_scraping_job,
+        max_workers=int(os.getenv('JOB_WORKERS', 4)),
+        poll_interval=int(os.getenv('JOB_POLL_SECONDS', 60)),
+        lease_minutes=int(os.getenv('JOB_LEASE_MINUTES', 60))
     )
-    
-    # Run initial scraping
-    print_status("🚀 Starting initial DataPilotPlus scraping...", "startup")
-    asyncio.run(scraper.run_comprehensive_scraping())
-    
-    # Main loop
-    print_status(f"🔄 Scraper running with {scraper_interval}-hour intervals", "info")
+    print_status(f"⏰ Running scraping_jobs with {worker.max_workers} workers as {worker.worker_id}", "info")
     print_status("💡 Press Ctrl+C to stop the scraper", "info")
-    
+
     try:
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+        worker.run_forever()
     except KeyboardInterrupt:
         print_status("🛑 Shutting down DataPilotPlus scraper...", "warning")
+        worker.stop(wait=False)
         if mcp_server:
             mcp_server.shutdown()
+        for scraper in all_scrapers:
+            if scraper.db_connection:
+                scraper.db_connection.close()
+        print_status("👋 DataPilotPlus scraper stopped successfully", "success")
+
+def run_mcp_only():
+    """Serve the MCP endpoint without touching the database or the crawler"""
+    mcp_server, mcp_thread = start_mcp_server(int(os.getenv('MCP_SERVER_PORT', 8000)))
+    if not mcp_server:
+        return 1
+    print_status("💡 Press Ctrl+C to stop the MCP server", "info")
+    try:
+        mcp_thread.join()
+    except KeyboardInterrupt:
+        print_status("🛑 Shutting down MCP server...", "warning")
+        mcp_server.shutdown()
+    return 0
+
+def run_report_only():
+    """Generate and send the comprehensive report from data already in MySQL"""
+    from metrics import write_run_summary
+
+    scraper = DataPilotPlusScraper()
+    try:
+        scraper.send_comprehensive_report(scraper.generate_comprehensive_report())
+    finally:
         if scraper.db_connection:
             scraper.db_connection.close()
-        print_status("👋 DataPilotPlus scraper stopped successfully", "success")
+        write_run_summary('comprehensive_report')
+    return 0
+
+def run_scrape_once():
+    """One comprehensive scrape (crawl, API sources, report) and exit"""
+    scraper = DataPilotPlusScraper()
+    try:
+        asyncio.run(scraper.run_comprehensive_scraping())
+    finally:
+        if scraper.db_connection:
+            scraper.db_connection.close()
+    return 0
+
+# Main execution
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DataPilotPlus intelligence scraper")
+    parser.add_argument('mode', nargs='?', default='worker', choices=('worker', 'mcp', 'report', 'scrape'),
+                        help="worker: job queue + MCP server (default); mcp: MCP server only; "
+                             "report: generate and send the report; scrape: one comprehensive run")
+    args = parser.parse_args()
 
+    if args.mode == 'mcp':
+        sys.exit(run_mcp_only())
+    if args.mode == 'report':
+        sys.exit(run_report_only())
+    if args.mode == 'scrape':
+        sys.exit(run_scrape_once())
+    run_worker()
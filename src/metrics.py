@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Process-wide counters and histograms in the Prometheus text format.
+
+The metrics below are recorded where the work happens, so a scrape of
+/metrics (MCP server, or the worker's MCP handler) or a batch job's run
+summary shows where time goes without reading logs:
+
+    http_fetch_seconds{host}                 shared HTTP client, every request
+    http_responses_total{host,status}
+    feed_parse_seconds{source}               feedparser.parse of RSS responses
+    pipeline_articles_in_total{stage}        articles entering / leaving each
+    pipeline_articles_out_total{stage}       dedup or filter stage
+    db_query_seconds{statement}              statement = verb:table
+    openai_request_seconds{model}            chat completions
+    openai_tokens_total{model,kind}          prompt / completion tokens
+    mcp_request_seconds{method,endpoint,status}
+
+Batch jobs call write_run_summary('<job>') on the way out; it writes this
+process's metrics as JSON to METRICS_SUMMARY_DIR (reports/metrics), with
+count, sum, mean, max and bucket-estimated p50/p95 for each histogram.
+Everything is in-process and stdlib only; recording is a dict lookup and an
+increment under a per-metric lock.
+"""
+
+import bisect
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+SUMMARY_DIR = os.getenv('METRICS_SUMMARY_DIR', os.path.join('reports', 'metrics'))
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; covers cached queries (ms) through slow fetches and completions (tens of s)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, help_text: str, label_names: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} takes labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+class Counter(_Metric):
+    """Monotonic total per label set"""
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._series.get(self._key(labels), 0)
+
+    def render(self) -> Iterable[str]:
+        with self._lock:
+            series = sorted(self._series.items())
+        for key, value in series:
+            yield f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+
+    def snapshot(self) -> list:
+        with self._lock:
+            series = sorted(self._series.items())
+        return [{'labels': dict(zip(self.label_names, key)), 'value': value} for key, value in series]
+
+class _Timer:
+    __slots__ = ('histogram', 'labels', 'started')
+
+    def __init__(self, histogram: 'Histogram', labels: Dict[str, object]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+class Histogram(_Metric):
+    """Bucketed observations (plus count, sum and max) per label set"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, label_names: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [per-bucket counts (last is +Inf), count, sum, max]
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0, 0.0, 0.0]
+            series[0][index] += 1
+            series[1] += 1
+            series[2] += value
+            series[3] = max(series[3], value)
+
+    def time(self, **labels) -> _Timer:
+        """Context manager observing the elapsed seconds of its block"""
+        return _Timer(self, labels)
+
+    def _copy(self):
+        with self._lock:
+            return sorted((key, (list(s[0]), s[1], s[2], s[3])) for key, s in self._series.items())
+
+    def render(self) -> Iterable[str]:
+        for key, (counts, count, total, _) in self._copy():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}"
+            labels = _format_labels(self.label_names, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+    def _quantile(self, counts, count: int, maximum: float, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (the max, past the last bucket)"""
+        rank = q * count
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return min(bound, maximum)
+        return maximum
+
+    def snapshot(self) -> list:
+        result = []
+        for key, (counts, count, total, maximum) in self._copy():
+            result.append({
+                'labels': dict(zip(self.label_names, key)),
+                'count': count,
+                'sum': round(total, 6),
+                'mean': round(total / count, 6) if count else 0.0,
+                'max': round(maximum, 6),
+                'p50': round(self._quantile(counts, count, maximum, 0.5), 6),
+                'p95': round(self._quantile(counts, count, maximum, 0.95), 6),
+            })
+        return result
+
+class Registry:
+    """Named metrics, rendered together"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, cls, name: str, help_text: str, label_names: Iterable[str], **options) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, label_names, **options)
+            elif type(metric) is not cls or metric.label_names != tuple(label_names):
+                raise ValueError(f"metric {name} is already registered as a {metric.kind} "
+                                 f"with labels {metric.label_names}")
+            return metric
+
+    def counter(self, name: str, help_text: str, label_names: Iterable[str] = ()) -> Counter:
+        return self._register(Counter, name, help_text, label_names)
+
+    def histogram(self, name: str, help_text: str, label_names: Iterable[str] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help_text, label_names, buckets=buckets)
+
+    def _all(self):
+        with self._lock:
+            return sorted(self._metrics.items())
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for name, metric in self._all():
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """name -> type and series, skipping metrics nothing has recorded yet"""
+        result = {}
+        for name, metric in self._all():
+            series = metric.snapshot()
+            if series:
+                result[name] = {'type': metric.kind, 'series': series}
+        return result
+
+    def reset(self):
+        for _, metric in self._all():
+            metric.reset()
+
+REGISTRY = Registry()
+
+HTTP_FETCH_SECONDS = REGISTRY.histogram('http_fetch_seconds', "HTTP request latency, retries included", ('host',))
+HTTP_RESPONSES = REGISTRY.counter('http_responses_total', "HTTP responses by status code", ('host', 'status'))
+FEED_PARSE_SECONDS = REGISTRY.histogram('feed_parse_seconds', "Time to parse one RSS/Atom response", ('source',))
+ARTICLES_IN = REGISTRY.counter('pipeline_articles_in_total', "Articles entering a pipeline stage", ('stage',))
+ARTICLES_OUT = REGISTRY.counter('pipeline_articles_out_total', "Articles kept by a pipeline stage", ('stage',))
+DB_QUERY_SECONDS = REGISTRY.histogram('db_query_seconds', "MySQL statement latency", ('statement',))
+OPENAI_REQUEST_SECONDS = REGISTRY.histogram('openai_request_seconds', "OpenAI completion latency", ('model',))
+OPENAI_TOKENS = REGISTRY.counter('openai_tokens_total', "OpenAI tokens used", ('model', 'kind'))
+MCP_REQUEST_SECONDS = REGISTRY.histogram('mcp_request_seconds', "MCP server request latency",
+                                         ('method', 'endpoint', 'status'))
+
+_STATEMENT_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE|TABLE(?:\s+IF\s+(?:NOT\s+)?EXISTS)?)\s+`?(\w+)', re.IGNORECASE)
+
+def statement_label(sql: str) -> str:
+    """verb:table for a SQL statement ('select:scraped_data'), a bounded label for db_query_seconds"""
+    words = sql.split(None, 1)
+    verb = words[0].lower() if words else 'unknown'
+    match = _STATEMENT_TABLE.search(sql)
+    return f"{verb}:{match.group(1).lower()}" if match else verb
+
+def timed_execute(cursor, sql: str, params=None, statement: Optional[str] = None):
+    """cursor.execute, observed under db_query_seconds"""
+    with DB_QUERY_SECONDS.time(statement=statement or statement_label(sql)):
+        if params is None:
+            return cursor.execute(sql)
+        return cursor.execute(sql, params)
+
+def record_stage(stage: str, articles_in: int, articles_out: int):
+    """Count articles into and out of a dedup/filter stage"""
+    ARTICLES_IN.inc(articles_in, stage=stage)
+    ARTICLES_OUT.inc(articles_out, stage=stage)
+
+def record_openai(model: str, seconds: float, usage=None):
+    """Latency and token usage (response.usage, object or dict) of one completion"""
+    OPENAI_REQUEST_SECONDS.observe(seconds, model=model)
+    if usage is None:
+        return
+    for kind in ('prompt_tokens', 'completion_tokens'):
+        tokens = usage.get(kind) if isinstance(usage, dict) else getattr(usage, kind, None)
+        if tokens:
+            OPENAI_TOKENS.inc(tokens, model=model, kind=kind.split('_')[0])
+
+def render() -> str:
+    return REGISTRY.render()
+
+def snapshot() -> Dict[str, Dict]:
+    return REGISTRY.snapshot()
+
+def write_run_summary(job: str, extra: Optional[Dict] = None, directory: str = SUMMARY_DIR) -> Optional[str]:
+    """Write this process's metrics to <directory>/<job>_<timestamp>.json and return the path"""
+    summary = {'job': job, 'written_at': datetime.now().isoformat(), 'metrics': snapshot()}
+    if extra:
+        summary.update(extra)
+    path = os.path.join(directory, f"{job}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, default=str)
+    except OSError:
+        return None
+    return path
@@ -0,0 +1,23 @@
+"""
+MySQL connection settings from the environment.
+
+Shared by the scraper, the job workers and the command-line tools. It imports
+nothing heavy, so any module can use it without loading main.py or
+mysql.connector:
+
+    connection = mysql.connector.connect(**get_mysql_config())
+"""
+
+import os
+from typing import Any, Dict
+
+def get_mysql_config() -> Dict[str, Any]:
+    """MySQL connection settings from the environment"""
+    return {
+        'host': os.getenv('MYSQL_HOST', 'localhost'),
+        'port': int(os.getenv('MYSQL_PORT', 3306)),
+        'database': os.getenv('MYSQL_DATABASE', 'datapilotplus_scraper'),
+        'user': os.getenv('MYSQL_USERNAME'),
+        'password': os.getenv('MYSQL_PASSWORD'),
+        'charset': os.getenv('MYSQL_CHARSET', 'utf8mb4')
+    }
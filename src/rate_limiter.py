@@ -0,0 +1,266 @@
+"""
+Per-API token-bucket rate limiting shared across worker processes.
+
+Each API gets a bucket refilled at api_configs.rate_limit requests per
+minute, holding at most one second of refill (never less than one token),
+so strict per-second limits such as SEC EDGAR's are respected as well as
+per-minute ones. Buckets live in the api_rate_buckets table and are updated
+under SELECT ... FOR UPDATE using the database clock, so every process on
+every host draws from one budget. Without a database the limiter falls back
+to in-process buckets.
+
+Callers wait for capacity rather than failing.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import mysql.connector
+from mysql.connector import Error
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE_LIMIT = 100  # requests per minute, matches the api_configs default
+
+CREATE_RATE_BUCKETS_TABLE = """
+CREATE TABLE IF NOT EXISTS api_rate_buckets (
+    api_name VARCHAR(100) PRIMARY KEY,
+    tokens DOUBLE NOT NULL,
+    capacity DOUBLE NOT NULL,
+    refill_per_second DOUBLE NOT NULL,
+    updated_at DOUBLE NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+def bucket_shape(rate_limit: Optional[int]) -> Tuple[float, float]:
+    """Return (capacity, refill_per_second) for a requests-per-minute limit"""
+    refill_per_second = max(rate_limit or DEFAULT_RATE_LIMIT, 1) / 60.0
+    return max(refill_per_second, 1.0), refill_per_second
+
+def _take(tokens: float, updated_at: float, now: float, capacity: float,
+          refill_per_second: float, requested: float) -> Tuple[float, float]:
+    """Refill a bucket and try to take tokens; returns (tokens_left, seconds_to_wait)"""
+    tokens = min(capacity, tokens + max(now - updated_at, 0.0) * refill_per_second)
+    if tokens >= requested:
+        return tokens - requested, 0.0
+    return tokens, (requested - tokens) / refill_per_second
+
+class LocalBucketStore:
+    """In-process buckets, used when no database is configured"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets: Dict[str, Dict[str, float]] = {}
+
+    def take(self, api_name: str, capacity: float, refill_per_second: float,
+             requested: float = 1) -> Tuple[float, float]:
+        with self.lock:
+            now = time.monotonic()
+            bucket = self.buckets.setdefault(api_name, {'tokens': capacity, 'updated_at': now})
+            tokens, wait = _take(bucket['tokens'], bucket['updated_at'], now,
+                                 capacity, refill_per_second, requested)
+            bucket.update(tokens=tokens, updated_at=now, capacity=capacity,
+                          refill_per_second=refill_per_second)
+            return tokens, wait
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self.lock:
+            now = time.monotonic()
+            return {
+                api_name: {
+                    'tokens': min(bucket['capacity'], bucket['tokens'] +
+                                  (now - bucket['updated_at']) * bucket['refill_per_second']),
+                    'capacity': bucket['capacity'],
+                    'refill_per_second': bucket['refill_per_second']
+                }
+                for api_name, bucket in self.buckets.items()
+            }
+
+class MySQLBucketStore:
+    """Buckets in the api_rate_buckets table, shared by every process"""
+
+    def __init__(self, db_config: Dict[str, Any]):
+        self.db_config = db_config
+        self.lock = threading.Lock()
+        self.connection = None
+
+    def connect(self):
+        if not self.connection or not self.connection.is_connected():
+            self.connection = mysql.connector.connect(**self.db_config)
+        return self.connection
+
+    def ensure_schema(self):
+        with self.lock:
+            cursor = self.connect().cursor()
+            try:
+                cursor.execute(CREATE_RATE_BUCKETS_TABLE)
+                self.connection.commit()
+            finally:
+                cursor.close()
+
+    def take(self, api_name: str, capacity: float, refill_per_second: float,
+             requested: float = 1) -> Tuple[float, float]:
+        with self.lock:
+            connection = self.connect()
+            cursor = connection.cursor(dictionary=True)
+            try:
+                connection.start_transaction()
+                cursor.execute("""
+                    INSERT INTO api_rate_buckets (api_name, tokens, capacity, refill_per_second, updated_at)
+                    VALUES (%s, %s, %s, %s, UNIX_TIMESTAMP(NOW(6)))
+                    ON DUPLICATE KEY UPDATE api_name = api_name
+                """, (api_name, capacity, capacity, refill_per_second))
+                cursor.execute("""
+                    SELECT tokens, updated_at, UNIX_TIMESTAMP(NOW(6)) AS now
+                    FROM api_rate_buckets WHERE api_name = %s FOR UPDATE
+                """, (api_name,))
+                row = cursor.fetchone()
+                now = float(row['now'])
+                tokens, wait = _take(row['tokens'], row['updated_at'], now,
+                                     capacity, refill_per_second, requested)
+                cursor.execute("""
+                    UPDATE api_rate_buckets
+                    SET tokens = %s, capacity = %s, refill_per_second = %s, updated_at = %s
+                    WHERE api_name = %s
+                """, (tokens, capacity, refill_per_second, now, api_name))
+                connection.commit()
+                return tokens, wait
+            except Error:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self.lock:
+            connection = self.connect()
+            cursor = connection.cursor(dictionary=True)
+            try:
+                cursor.execute("""
+                    SELECT api_name, capacity, refill_per_second,
+                           LEAST(capacity, tokens + GREATEST(UNIX_TIMESTAMP(NOW(6)) - updated_at, 0)
+                                 * refill_per_second) AS tokens
+                    FROM api_rate_buckets
+                """)
+                rows = cursor.fetchall()
+                connection.commit()
+            finally:
+                cursor.close()
+        return {
+            row['api_name']: {
+                'tokens': float(row['tokens']),
+                'capacity': row['capacity'],
+                'refill_per_second': row['refill_per_second']
+            }
+            for row in rows
+        }
+
+class RateLimiter:
+    """Token-bucket limiter keyed by API name.
+
+    rate_lookup(api_name) returns the current requests-per-minute limit,
+    typically ApiConfigCache.get_rate_limit, so a changed rate_limit takes
+    effect on the next acquire.
+    """
+
+    def __init__(self, store=None, rate_lookup=None):
+        self.store = store or LocalBucketStore()
+        self.local_store = self.store if isinstance(self.store, LocalBucketStore) else LocalBucketStore()
+        self.rate_lookup = rate_lookup
+        self.stats_lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def _shape(self, api_name: str) -> Tuple[float, float]:
+        rate_limit = None
+        if self.rate_lookup:
+            try:
+                rate_limit = self.rate_lookup(api_name)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not look up rate limit for {api_name}: {e}")
+        return bucket_shape(rate_limit)
+
+    def try_acquire(self, api_name: str, tokens: float = 1) -> float:
+        """Take tokens if available; returns 0 on success or the seconds to wait"""
+        capacity, refill_per_second = self._shape(api_name)
+        try:
+            _, wait = self.store.take(api_name, capacity, refill_per_second, tokens)
+        except Error as e:
+            logger.warning(f"⚠️ Shared rate-limit store unavailable, using local bucket: {e}")
+            _, wait = self.local_store.take(api_name, capacity, refill_per_second, tokens)
+        return wait
+
+    def _record(self, api_name: str, waited: float):
+        with self.stats_lock:
+            stats = self.stats.setdefault(api_name, {'acquired': 0, 'waits': 0, 'wait_seconds': 0.0})
+            stats['acquired'] += 1
+            if waited > 0:
+                stats['waits'] += 1
+                stats['wait_seconds'] += waited
+
+    def acquire_blocking(self, api_name: str, tokens: float = 1):
+        """Block the calling thread until the API has capacity"""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(api_name, tokens)
+            if wait <= 0:
+                break
+            time.sleep(wait)
+            waited += wait
+        self._record(api_name, waited)
+
+    async def acquire(self, api_name: str, tokens: float = 1):
+        """Wait, without blocking the event loop, until the API has capacity"""
+        loop = asyncio.get_running_loop()
+        waited = 0.0
+        while True:
+            wait = await loop.run_in_executor(None, self.try_acquire, api_name, tokens)
+            if wait <= 0:
+                break
+            await asyncio.sleep(wait)
+            waited += wait
+        self._record(api_name, waited)
+
+    def remaining(self, api_name: str) -> Optional[float]:
+        """Tokens currently available for an API, if it has a bucket yet"""
+        bucket = self.metrics().get(api_name)
+        return bucket['tokens'] if bucket else None
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Remaining capacity per API plus this process's acquire/wait counters"""
+        try:
+            buckets = self.store.snapshot()
+        except Error as e:
+            logger.warning(f"⚠️ Could not read shared rate-limit buckets: {e}")
+            buckets = self.local_store.snapshot()
+
+        with self.stats_lock:
+            stats = {api_name: dict(values) for api_name, values in self.stats.items()}
+        result = {}
+        for api_name in set(buckets) | set(stats):
+            entry = {key: round(value, 3) for key, value in buckets.get(api_name, {}).items()}
+            entry.update(stats.get(api_name, {}))
+            result[api_name] = entry
+        return result
+
+_limiters: Dict[tuple, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(db_config: Optional[Dict[str, Any]] = None, rate_lookup=None) -> RateLimiter:
+    """Return the process-wide limiter for a database (or a local one without)"""
+    key = (db_config.get('host'), db_config.get('port'), db_config.get('database')) if db_config else None
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            store = None
+            if db_config:
+                store = MySQLBucketStore(db_config)
+                try:
+                    store.ensure_schema()
+                except Error as e:
+                    logger.warning(f"⚠️ Rate-limit buckets not shared across processes: {e}")
+                    store = None
+            limiter = _limiters[key] = RateLimiter(store, rate_lookup)
+        return limiter
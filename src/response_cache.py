@@ -0,0 +1,269 @@
+"""
+Compressed, revalidatable JSON responses for the MCP server and Flask app.
+
+Data-backed endpoints are keyed by a data generation: a row in
+config_versions ('intelligence_data') that writers of scraped_data and
+reports bump in the same transaction as their change. companies rows are
+maintained outside this codebase, so responses that embed them add
+read_companies_version() to the generation. A response body is built once
+per (request key, generation), cached with its gzip / brotli encodings, and
+served with a weak ETag derived from the generation (bodies carry their
+build time and each worker builds its own, so they are equivalent rather
+than byte-identical), so:
+
+- a client sending a matching If-None-Match gets 304 Not Modified without
+  the endpoint's queries running at all, and
+- repeat requests within one generation skip both the queries and the
+  compression.
+
+ResponseMetrics counts, per endpoint, bytes of JSON produced versus bytes
+actually sent, which is what compression and 304s saved.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from metrics import timed_execute
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+DATA_GENERATION_NAME = 'intelligence_data'
+
+# Same statement as api_config_cache.BUMP_CONFIG_VERSION, kept here so writers need no MySQL import
+BUMP_GENERATION = """
+INSERT INTO config_versions (name, version) VALUES (%s, 1)
+ON DUPLICATE KEY UPDATE version = version + 1
+"""
+
+MIN_COMPRESS_BYTES = int(os.getenv('RESPONSE_COMPRESS_MIN_BYTES', 512))
+CACHE_ENTRIES = int(os.getenv('RESPONSE_CACHE_ENTRIES', 64))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+def bump_data_generation(cursor):
+    """Run inside the writer's transaction so cached responses and ETags move with the data"""
+    cursor.execute(BUMP_GENERATION, (DATA_GENERATION_NAME,))
+
+def read_data_generation(connection) -> Optional[int]:
+    """Current data generation, or None when it cannot be read (no ETag is sent then)"""
+    try:
+        cursor = connection.cursor()
+        try:
+            timed_execute(cursor, "SELECT version FROM config_versions WHERE name = %s", (DATA_GENERATION_NAME,),
+                          statement='data_generation')
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+    except Exception:
+        return None
+    if not row:
+        return 0
+    return row['version'] if isinstance(row, dict) else row[0]
+
+def read_companies_version(connection) -> Optional[str]:
+    """Short token that changes when companies rows are added, removed or updated.
+
+    companies.last_updated is ON UPDATE CURRENT_TIMESTAMP, so the row count
+    and newest timestamp move with every write. None when it cannot be read.
+    """
+    try:
+        cursor = connection.cursor()
+        try:
+            timed_execute(cursor, "SELECT COUNT(*), MAX(last_updated) FROM companies",
+                          statement='companies_version')
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+    except Exception:
+        return None
+    values = list(row.values()) if isinstance(row, dict) else list(row or ())
+    return hashlib.sha1(repr(values).encode('utf-8')).hexdigest()[:8]
+
+def supported_encodings() -> List[str]:
+    return ['br', 'gzip'] if brotli else ['gzip']
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best content coding the client accepts (br over gzip at equal q), or None for identity"""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            weights[coding] = q
+
+    best, best_q = None, 0.0
+    for coding in supported_encodings():
+        q = weights.get(coding, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith('W/'):
+        tag = tag[2:]
+    return tag.strip('"')
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, per RFC 7232); encodings of one body share a base tag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    base = _opaque_tag(etag).split('.')[0]
+    return any(_opaque_tag(tag).split('.')[0] == base for tag in if_none_match.split(','))
+
+class ResponseMetrics:
+    """Thread-safe per-endpoint response and byte counters"""
+
+    FIELDS = ('responses', 'not_modified', 'compressed', 'cache_hits', 'bytes_json', 'bytes_sent')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, int]] = {}
+
+    def record(self, endpoint: str, json_bytes: int, sent_bytes: int, not_modified: bool = False,
+               compressed: bool = False, cache_hit: bool = False):
+        with self._lock:
+            counters = self._endpoints.setdefault(endpoint, dict.fromkeys(self.FIELDS, 0))
+            counters['responses'] += 1
+            counters['not_modified'] += int(not_modified)
+            counters['compressed'] += int(compressed)
+            counters['cache_hits'] += int(cache_hit)
+            counters['bytes_json'] += json_bytes
+            counters['bytes_sent'] += sent_bytes
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """endpoint -> counters plus bytes_saved and saved_ratio"""
+        with self._lock:
+            endpoints = {endpoint: dict(counters) for endpoint, counters in self._endpoints.items()}
+        for counters in endpoints.values():
+            counters['bytes_saved'] = counters['bytes_json'] - counters['bytes_sent']
+            counters['saved_ratio'] = round(counters['bytes_saved'] / counters['bytes_json'], 3) \
+                if counters['bytes_json'] else 0.0
+        return dict(sorted(endpoints.items()))
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+METRICS = ResponseMetrics()
+
+class _Entry:
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+        self.encoded: Dict[str, bytes] = {}
+
+class ResponseCache:
+    """Bounded LRU of encoded JSON bodies keyed by (request key, data generation)"""
+
+    def __init__(self, max_entries: int = CACHE_ENTRIES, metrics: ResponseMetrics = METRICS):
+        self.max_entries = max_entries
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, Union[int, str]], _Entry]" = OrderedDict()
+
+    def _get(self, key: Tuple[str, Union[int, str]]) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key: Tuple[str, Union[int, str]], entry: _Entry) -> _Entry:
+        with self._lock:
+            entry = self._entries.setdefault(key, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def respond(self, endpoint: str, key: str, generation: Optional[Union[int, str]], build: Callable[[], Any],
+                accept_encoding: Optional[str] = None,
+                if_none_match: Optional[str] = None) -> Tuple[int, bytes, Dict[str, str]]:
+        """(status, body, headers) for a data-backed endpoint.
+
+        build() is only called when there is no cached body for this
+        generation. Without a generation the response is built fresh,
+        compressed and sent without an ETag.
+        """
+        if generation is None:
+            body, headers = encode_json(endpoint, build(), accept_encoding, metrics=self.metrics)
+            return 200, body, headers
+
+        # Weak validator: same generation + request key means the same data, though
+        # the build timestamp (and the worker that built it) may differ
+        etag = f'W/"g{generation}-{hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]}"'
+        cache_key = (key, generation)
+        entry = self._get(cache_key)
+        cache_hit = entry is not None
+
+        if etag_matches(if_none_match, etag):
+            json_bytes = len(entry.body) if entry else 0
+            self.metrics.record(endpoint, json_bytes, 0, not_modified=True, cache_hit=cache_hit)
+            return 304, b'', {'ETag': etag, 'Vary': 'Accept-Encoding', 'Cache-Control': 'no-cache'}
+
+        if entry is None:
+            entry = self._put(cache_key, _Entry(json.dumps(build(), default=str).encode('utf-8'), etag))
+
+        encoding = negotiate_encoding(accept_encoding) if len(entry.body) >= MIN_COMPRESS_BYTES else None
+        headers = {'Content-Type': 'application/json', 'Vary': 'Accept-Encoding', 'Cache-Control': 'no-cache'}
+        body = entry.body
+        if encoding:
+            encoded = entry.encoded.get(encoding)
+            if encoded is None:
+                encoded = entry.encoded[encoding] = compress(entry.body, encoding)
+            body = encoded
+            headers['Content-Encoding'] = encoding
+            # Each coding is its own representation, so it gets its own tag
+            headers['ETag'] = f'{etag[:-1]}.{encoding}"'
+        else:
+            headers['ETag'] = etag
+        headers['Content-Length'] = str(len(body))
+        self.metrics.record(endpoint, len(entry.body), len(body), compressed=bool(encoding), cache_hit=cache_hit)
+        return 200, body, headers
+
+def encode_json(endpoint: str, data: Any, accept_encoding: Optional[str] = None,
+                metrics: ResponseMetrics = METRICS) -> Tuple[bytes, Dict[str, str]]:
+    """(body, headers) for an uncached JSON response, compressed when worthwhile"""
+    raw = json.dumps(data, default=str).encode('utf-8')
+    encoding = negotiate_encoding(accept_encoding) if len(raw) >= MIN_COMPRESS_BYTES else None
+    body = compress(raw, encoding) if encoding else raw
+    headers = {'Content-Type': 'application/json', 'Vary': 'Accept-Encoding', 'Content-Length': str(len(body))}
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    metrics.record(endpoint, len(raw), len(body), compressed=bool(encoding))
+    return body, headers
+
+RESPONSES = ResponseCache()
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Monthly partitions, retention and archives for scraped_data.
+
+scraped_data is range-partitioned by month (UTC) on scraped_at, with a few
+empty months created ahead of time and a MAXVALUE catch-all at the end.
+Queries on recent data touch only the newest partitions, and retention
+keeps the partition count bounded, so their latency does not grow with
+history.
+
+Partitions older than SCRAPED_DATA_RETENTION_MONTHS are streamed to
+gzip-compressed JSON lines archives (one file per month under
+SCRAPED_DATA_ARCHIVE_DIR) and then dropped, which is a metadata operation
+rather than a large DELETE. query_history() reads a date range from the
+live table and the archives as one newest-first stream.
+
+    python src/scraped_data_retention.py migrate    # partition an existing table (rebuilds it once)
+    python src/scraped_data_retention.py maintain   # add upcoming months, archive expired ones
+    python src/scraped_data_retention.py status
+    python src/scraped_data_retention.py query --since 2024-01-01 --until 2024-03-01 --limit 20
+
+The scraped_data_retention job runs maintain from the job queue.
+"""
+
+import argparse
+import calendar
+import glob
+import gzip
+import json
+import os
+import re
+import sys
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from mysql_config import get_mysql_config
+
+RETENTION_MONTHS = int(os.getenv('SCRAPED_DATA_RETENTION_MONTHS', 12))
+ARCHIVE_DIR = os.getenv('SCRAPED_DATA_ARCHIVE_DIR', os.path.join('data', 'archive', 'scraped_data'))
+MONTHS_AHEAD = 3
+EXPORT_BATCH_ROWS = 1000
+
+FUTURE_PARTITION = 'p_future'
+_PARTITION_NAME = re.compile(r'^p(\d{4})(\d{2})$')
+
+# Every column, in archive order; JSON columns are stored parsed. Bodies stay
+# in the blob store (src/blob_store.py), which archived rows still reference
+ARCHIVE_COLUMNS = ('id', 'source_name', 'category', 'method_type', 'url', 'data_points', 'content',
+                   'content_sha256', 'analysis', 'relevance_score', 'jurisdiction', 'matched_counties',
+                   'article_category', 'scraped_at', 'updated_at')
+JSON_COLUMNS = ('data_points', 'analysis', 'matched_counties')
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def month_of(value) -> date:
+    return date(value.year, value.month, 1)
+
+def month_epoch(month: date) -> int:
+    """UTC epoch seconds at the start of month (partition bounds are UNIX_TIMESTAMP values)"""
+    return calendar.timegm((month.year, month.month, 1, 0, 0, 0))
+
+def partition_name(month: date) -> str:
+    return f"p{month:%Y%m}"
+
+def partition_month(name: str) -> Optional[date]:
+    match = _PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+def partition_clause(month: date) -> str:
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN ({month_epoch(add_months(month, 1))})"
+
+def current_month() -> date:
+    return month_of(datetime.now(timezone.utc))
+
+def archive_path(month: date, archive_dir: str = ARCHIVE_DIR) -> str:
+    return os.path.join(archive_dir, f"scraped_data_{month:%Y-%m}.jsonl.gz")
+
+def partitions(connection) -> List[Dict[str, Any]]:
+    """scraped_data partitions in order: name, month (None for p_future) and estimated rows"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            SELECT PARTITION_NAME, TABLE_ROWS FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'scraped_data' AND PARTITION_NAME IS NOT NULL
+            ORDER BY PARTITION_ORDINAL_POSITION
+        """)
+        return [{'name': name, 'month': partition_month(name), 'rows': rows or 0}
+                for name, rows in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+def ensure_partitioned(connection, months_ahead: int = MONTHS_AHEAD) -> Dict[str, Any]:
+    """Partition scraped_data by month (rebuilding it the first time) and add upcoming months"""
+    existing = partitions(connection)
+    last_month = add_months(current_month(), months_ahead)
+    cursor = connection.cursor()
+    try:
+        if not existing:
+            cursor.execute("SELECT MIN(scraped_at) FROM scraped_data")
+            oldest = cursor.fetchone()[0]
+            first_month = month_of(oldest) if oldest else current_month()
+            months = []
+            month = first_month
+            while month <= last_month:
+                months.append(month)
+                month = add_months(month, 1)
+            # Every unique key of a partitioned table must contain the partitioning column
+            cursor.execute("""
+                ALTER TABLE scraped_data
+                    MODIFY scraped_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    DROP PRIMARY KEY,
+                    ADD PRIMARY KEY (id, scraped_at)
+            """)
+            clauses = [partition_clause(month) for month in months]
+            clauses.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN MAXVALUE")
+            cursor.execute(f"""
+                ALTER TABLE scraped_data
+                PARTITION BY RANGE (UNIX_TIMESTAMP(scraped_at)) ({', '.join(clauses)})
+            """)
+            return {'migrated': True, 'added': [partition_name(month) for month in months]}
+
+        months = [p['month'] for p in existing if p['month']]
+        month = add_months(max(months), 1) if months else current_month()
+        added = []
+        while month <= last_month:
+            added.append(month)
+            month = add_months(month, 1)
+        if added:
+            # p_future is normally empty, so splitting it moves no rows
+            clauses = [partition_clause(month) for month in added]
+            clauses.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN MAXVALUE")
+            cursor.execute(f"ALTER TABLE scraped_data REORGANIZE PARTITION {FUTURE_PARTITION} "
+                           f"INTO ({', '.join(clauses)})")
+        return {'migrated': False, 'added': [partition_name(month) for month in added]}
+    finally:
+        cursor.close()
+
+def _decode_row(row: Tuple) -> Dict[str, Any]:
+    record = dict(zip(ARCHIVE_COLUMNS, row))
+    for column in JSON_COLUMNS:
+        value = record.get(column)
+        if isinstance(value, (bytes, bytearray)):
+            value = value.decode('utf-8')
+        if isinstance(value, str):
+            try:
+                record[column] = json.loads(value)
+            except ValueError:
+                pass
+    for column in ('scraped_at', 'updated_at'):
+        if isinstance(record.get(column), datetime):
+            record[column] = record[column].isoformat()
+    return record
+
+def archive_partition(connection, name: str, archive_dir: str = ARCHIVE_DIR) -> Dict[str, Any]:
+    """Write one partition's rows to its monthly archive file, then drop the partition"""
+    month = partition_month(name)
+    if month is None:
+        raise ValueError(f"{name} is not a monthly partition")
+    from response_cache import bump_data_generation
+
+    os.makedirs(archive_dir, exist_ok=True)
+    path = archive_path(month, archive_dir)
+    partial = path + '.partial'
+    started = time.perf_counter()
+    rows = 0
+    raw_bytes = 0
+    last_id = 0
+    cursor = connection.cursor()
+    try:
+        with open(partial, 'wb') as raw:
+            with gzip.open(raw, 'wt', encoding='utf-8') as f:
+                while True:
+                    cursor.execute(f"""
+                        SELECT {', '.join(ARCHIVE_COLUMNS)} FROM scraped_data PARTITION ({name})
+                        WHERE id > %s ORDER BY id LIMIT %s
+                    """, (last_id, EXPORT_BATCH_ROWS))
+                    batch = cursor.fetchall()
+                    if not batch:
+                        break
+                    for row in batch:
+                        line = json.dumps(_decode_row(row), default=str) + '\n'
+                        f.write(line)
+                        raw_bytes += len(line.encode('utf-8'))
+                    rows += len(batch)
+                    last_id = batch[-1][0]
+            raw.flush()
+            os.fsync(raw.fileno())
+        # Only a complete file replaces an archive; a crash before this leaves the partition in place
+        os.replace(partial, path)
+
+        # County rows of the archived articles go with them (the archive keeps matched_counties)
+        cursor.execute(f"""
+            DELETE c FROM scraped_data_counties c
+            JOIN scraped_data PARTITION ({name}) s ON s.id = c.scraped_data_id
+        """)
+        cursor.execute(f"ALTER TABLE scraped_data DROP PARTITION {name}")
+        bump_data_generation(cursor)
+        connection.commit()
+    finally:
+        cursor.close()
+        if os.path.exists(partial):
+            os.remove(partial)
+    return {
+        'partition': name,
+        'rows': rows,
+        'path': path,
+        'raw_bytes': raw_bytes,
+        'archive_bytes': os.path.getsize(path),
+        'seconds': round(time.perf_counter() - started, 2)
+    }
+
+def apply_retention(connection, retention_months: int = RETENTION_MONTHS,
+                    archive_dir: str = ARCHIVE_DIR) -> List[Dict[str, Any]]:
+    """Archive and drop every monthly partition older than retention_months"""
+    cutoff = add_months(current_month(), -retention_months)
+    return [archive_partition(connection, p['name'], archive_dir)
+            for p in partitions(connection) if p['month'] and p['month'] < cutoff]
+
+def maintain(connection, retention_months: int = RETENTION_MONTHS, archive_dir: str = ARCHIVE_DIR,
+             months_ahead: int = MONTHS_AHEAD) -> Dict[str, Any]:
+    """Partition (first run), add upcoming months and archive expired ones"""
+    result = ensure_partitioned(connection, months_ahead)
+    result['archived'] = apply_retention(connection, retention_months, archive_dir)
+    return result
+
+def archived_months(archive_dir: str = ARCHIVE_DIR) -> List[date]:
+    months = []
+    for path in glob.glob(os.path.join(archive_dir, 'scraped_data_*.jsonl.gz')):
+        match = re.search(r'scraped_data_(\d{4})-(\d{2})\.jsonl\.gz$', path)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+def _in_range(record: Dict[str, Any], since: datetime, until: Optional[datetime],
+              filters: Dict[str, Any]) -> bool:
+    scraped_at = datetime.fromisoformat(record['scraped_at'])
+    if scraped_at < since or (until and scraped_at >= until):
+        return False
+    return all(record.get(column) == value for column, value in filters.items())
+
+def query_history(connection, since: datetime, until: Optional[datetime] = None,
+                  limit: Optional[int] = None, columns: Tuple[str, ...] = ARCHIVE_COLUMNS,
+                  archive_dir: str = ARCHIVE_DIR, **filters) -> Iterator[Dict[str, Any]]:
+    """scraped_data rows with since <= scraped_at < until, newest first, from the table and the archives.
+
+    filters are column=value equality conditions (category=..., source_name=...).
+    connection may be None to read archives only.
+    """
+    unknown = set(columns) - set(ARCHIVE_COLUMNS) | set(filters) - set(ARCHIVE_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown scraped_data column(s): {', '.join(sorted(unknown))}")
+    seen = set()
+    produced = 0
+
+    if connection is not None:
+        conditions = ["scraped_at >= %s"]
+        params: List[Any] = [since]
+        if until:
+            conditions.append("scraped_at < %s")
+            params.append(until)
+        for column, value in filters.items():
+            conditions.append(f"{column} = %s")
+            params.append(value)
+        sql = (f"SELECT {', '.join(ARCHIVE_COLUMNS)} FROM scraped_data WHERE {' AND '.join(conditions)} "
+               f"ORDER BY scraped_at DESC, id DESC")
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        cursor = connection.cursor()
+        try:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        for row in rows:
+            record = _decode_row(row)
+            seen.add(record['id'])
+            yield {column: record[column] for column in columns}
+            produced += 1
+            if limit and produced >= limit:
+                return
+
+    # Archived months hold everything older than the oldest live partition. Months are UTC and
+    # scraped_at is in the session time zone, so the neighbouring months are read too
+    first = add_months(month_of(since), -1)
+    last = add_months(month_of(until) if until else current_month(), 1)
+    for month in reversed(archived_months(archive_dir)):
+        if month < first or month > last:
+            continue
+        with gzip.open(archive_path(month, archive_dir), 'rt', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        records.sort(key=lambda record: (record['scraped_at'], record['id']), reverse=True)
+        for record in records:
+            # Rows still live (a month archived but not yet dropped) come from the table
+            if record['id'] in seen or not _in_range(record, since, until, filters):
+                continue
+            seen.add(record['id'])
+            yield {column: record.get(column) for column in columns}
+            produced += 1
+            if limit and produced >= limit:
+                return
+
+def _connect():
+    import mysql.connector
+
+    return mysql.connector.connect(**get_mysql_config())
+
+def _parse_date(value: str) -> datetime:
+    return datetime.strptime(value, '%Y-%m-%d')
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Partition, archive and query scraped_data history")
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('migrate', help="Partition scraped_data by month")
+    maintain_parser = subparsers.add_parser('maintain', help="Add upcoming months and archive expired ones")
+    maintain_parser.add_argument('--retention-months', type=int, default=RETENTION_MONTHS)
+    subparsers.add_parser('status', help="List partitions and archives")
+
+    query_parser = subparsers.add_parser('query', help="Read a date range from the table and archives")
+    query_parser.add_argument('--since', type=_parse_date, required=True)
+    query_parser.add_argument('--until', type=_parse_date)
+    query_parser.add_argument('--category')
+    query_parser.add_argument('--source')
+    query_parser.add_argument('--limit', type=int, default=50)
+
+    args = parser.parse_args(argv)
+    connection = _connect()
+    try:
+        if args.command == 'migrate':
+            print(json.dumps(ensure_partitioned(connection), indent=2))
+        elif args.command == 'maintain':
+            print(json.dumps(maintain(connection, args.retention_months, args.archive_dir), indent=2))
+        elif args.command == 'status':
+            for p in partitions(connection):
+                print(f"🗂️ {p['name']}: ~{p['rows']:,} rows")
+            for month in archived_months(args.archive_dir):
+                path = archive_path(month, args.archive_dir)
+                print(f"📦 {month:%Y-%m}: {os.path.getsize(path):,} bytes ({path})")
+        else:
+            filters = {column: value for column, value in (('category', args.category),
+                                                           ('source_name', args.source)) if value}
+            started = time.perf_counter()
+            count = 0
+            for record in query_history(connection, args.since, args.until, args.limit,
+                                        ('id', 'source_name', 'category', 'url', 'scraped_at'),
+                                        args.archive_dir, **filters):
+                print(json.dumps(record, default=str))
+                count += 1
+            print(f"✅ {count} rows in {(time.perf_counter() - started) * 1000:.1f} ms", file=sys.stderr)
+    finally:
+        connection.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,76 +1,60 @@
-import requests
 import asyncio
 import aiohttp
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 import time
 import random
 from datetime import datetime, timedelta
 import json
 import re
 
+from browser_pool import BrowserPool
+from http_client import build_session
+
 class HenjiiScraper:
     def __init__(self, config):
         self.config = config
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.delay = config.get('request_delay', 1)
+        self.max_retries = config.get('max_retries', 3)
+        # Pooled keep-alive session; retries/backoff happen in its adapter
+        self.session = build_session(headers={
             'User-Agent': config.get('user_agent', 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'),
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        })
-        self.delay = config.get('request_delay', 1)
-        self.max_retries = config.get('max_retries', 3)
+        }, retries=self.max_retries)
+        # Warm headless Chrome instances, started on first Selenium fetch
+        self.browser_pool = None
     
     def get_page_with_selenium(self, url):
         """Use Selenium for JavaScript-heavy pages"""
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
-        
-        try:
-            driver = webdriver.Chrome(ChromeDriverManager().install(), options=chrome_options)
-            driver.get(url)
-            
-            # Wait for content to load
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
+        if self.browser_pool is None:
+            self.browser_pool = BrowserPool(
+                size=self.config.get('browser_pool_size', 2),
+                max_pages=self.config.get('browser_max_pages', 50),
+                user_agent=self.config.get('user_agent')
             )
-            
-            # Scroll to load dynamic content
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-            
-            page_source = driver.page_source
-            driver.quit()
-            return BeautifulSoup(page_source, 'html.parser')
-            
-        except Exception as e:
-            print(f"Selenium scraping failed for {url}: {e}")
+        page_source = self.browser_pool.fetch(url)
+        if page_source is None:
+            print(f"Selenium scraping failed for {url}")
             return None
+        return BeautifulSoup(page_source, 'html.parser')
+    
+    def close(self):
+        """Shut down pooled browsers"""
+        if self.browser_pool:
+            print(f"Browser pool: {self.browser_pool.metrics()}")
+            self.browser_pool.close()
+            self.browser_pool = None
     
     def get_page_requests(self, url):
         """Standard requests-based scraping"""
-        for attempt in range(self.max_retries):
-            try:
-                time.sleep(self.delay + random.uniform(0, 1))
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
-                return BeautifulSoup(response.content, 'html.parser')
-            except Exception as e:
-                print(f"Attempt {attempt + 1} failed for {url}: {e}")
-                if attempt == self.max_retries - 1:
-                    return None
-                time.sleep(2 ** attempt)
+        try:
+            time.sleep(self.delay + random.uniform(0, 1))
+            response = self.session.get(url, timeout=30)
+            response.raise_for_status()
+            return BeautifulSoup(response.content, 'html.parser')
+        except Exception as e:
+            print(f"Request failed for {url}: {e}")
+            return None
     
     def extract_posts(self, soup):
         """Extract posts from the main page"""
@@ -248,39 +232,43 @@ class HenjiiScraper:
     
     def scrape_full_site(self):
         """Main scraping method"""
-        print("Starting full site scrape...")
+        try:
+            print("Starting full site scrape...")
         
-        # Try requests first, fallback to Selenium
-        soup = self.get_page_requests("https://datapilotplus.com")
-        if not soup:
-            print("Requests failed, trying Selenium...")
-            soup = self.get_page_with_selenium("https://datapilotplus.com")
+            # Try requests first, fallback to Selenium
+            soup = self.get_page_requests("https://datapilotplus.com")
+            if not soup:
+                print("Requests failed, trying Selenium...")
+                soup = self.get_page_with_selenium("https://datapilotplus.com")
         
-        if not soup:
-            print("Failed to retrieve the main page")
-            return None
+            if not soup:
+                print("Failed to retrieve the main page")
+                return None
         
-        # Extract different types of content
-        posts = self.extract_posts(soup)
-        jobs = self.extract_jobs(soup)
+            # Extract different types of content
+            posts = self.extract_posts(soup)
+            jobs = self.extract_jobs(soup)
         
-        # Look for pagination and scrape additional pages
-        additional_pages = self.find_pagination_links(soup)
+            # Look for pagination and scrape additional pages
+            additional_pages = self.find_pagination_links(soup)
         
-        for page_url in additional_pages[:5]:  # Limit to 5 additional pages
-            print(f"Scraping additional page: {page_url}")
-            page_soup = self.get_page_requests(page_url)
-            if page_soup:
-                posts.extend(self.extract_posts(page_soup))
-                jobs.extend(self.extract_jobs(page_soup))
+            for page_url in additional_pages[:5]:  # Limit to 5 additional pages
+                print(f"Scraping additional page: {page_url}")
+                page_soup = self.get_page_requests(page_url)
+                if page_soup:
+                    posts.extend(self.extract_posts(page_soup))
+                    jobs.extend(self.extract_jobs(page_soup))
         
-        return {
-            'posts': posts,
-            'jobs': jobs,
-            'scraped_at': datetime.now().isoformat(),
-            'total_posts': len(posts),
-            'total_jobs': len(jobs)
-        }
+            return {
+                'posts': posts,
+                'jobs': jobs,
+                'scraped_at': datetime.now().isoformat(),
+                'total_posts': len(posts),
+                'total_jobs': len(jobs)
+            }
+        finally:
+            # Don't leave the Selenium fallback's Chrome processes running
+            self.close()
     
     def find_pagination_links(self, soup):
         """Find pagination links"""
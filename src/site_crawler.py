@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Multi-page site crawl on top of crawl4ai's AsyncWebCrawler.
+
+Starting from one URL, a frontier of (url, depth) entries is drained by
+`concurrency` workers, each with its own crawl4ai session (browser tab).
+Links found on a page are canonicalized (scheme/host case, default ports,
+fragments, tracking parameters, query order, trailing slashes) and
+enqueued once, so the visited set never holds two spellings of a page.
+The crawl stays on the start host (plus any allowed_hosts) and stops at
+max_depth links from the start page or after max_pages pages.
+
+Each page's full extracted content (markdown, else cleaned HTML) is kept;
+stats report pages/sec and bytes extracted.
+
+To benchmark against a local static site instead of the network:
+
+    python src/site_crawler.py --serve path/to/site --max-pages 200
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import posixpath
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PAGES = int(os.getenv('SITE_CRAWL_MAX_PAGES', 25))
+DEFAULT_MAX_DEPTH = int(os.getenv('SITE_CRAWL_MAX_DEPTH', 2))
+DEFAULT_CONCURRENCY = int(os.getenv('SITE_CRAWL_CONCURRENCY', 4))
+
+TRACKING_PARAMS = {'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ref', 'replytocom'}
+SKIP_EXTENSIONS = {
+    '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.ico', '.css', '.js', '.json',
+    '.pdf', '.zip', '.gz', '.mp3', '.mp4', '.mov', '.avi', '.woff', '.woff2', '.ttf', '.xml'
+}
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def canonicalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """Absolute, normalized form of url (resolved against base), or None if not crawlable"""
+    if base:
+        url = urljoin(base, url)
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return None
+
+    host = parts.hostname.lower()
+    if parts.port and parts.port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{parts.port}"
+
+    path = posixpath.normpath(parts.path) if parts.path else '/'
+    if path in ('.', '//'):
+        path = '/'
+    if path != '/' and path.endswith('/'):
+        path = path.rstrip('/')
+    # normpath keeps a leading '//' (POSIX), which would read as a host
+    path = '/' + path.lstrip('/')
+
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ))
+    return urlunsplit((scheme, host, path, query, ''))
+
+def is_page_url(url: str) -> bool:
+    """Skip obvious non-HTML resources"""
+    return posixpath.splitext(urlsplit(url).path)[1].lower() not in SKIP_EXTENSIONS
+
+@dataclass
+class CrawledPage:
+    url: str
+    depth: int
+    status_code: Optional[int]
+    title: Optional[str]
+    content: str
+    bytes: int
+    links: int
+    seconds: float
+
+@dataclass
+class CrawlStats:
+    pages: int = 0
+    failures: int = 0
+    bytes_extracted: int = 0
+    links_seen: int = 0
+    enqueued: int = 0
+    skipped_offsite: int = 0
+    skipped_depth: int = 0
+    max_depth_reached: int = 0
+    seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        stats = asdict(self)
+        stats['pages_per_sec'] = round(self.pages / self.seconds, 2) if self.seconds else 0.0
+        stats['seconds'] = round(self.seconds, 2)
+        stats['errors'] = self.errors[:20]
+        return stats
+
+def _result_content(result) -> str:
+    markdown = getattr(result, 'markdown', None)
+    # crawl4ai >= 0.5 returns a MarkdownGenerationResult (str subclass) with raw_markdown
+    markdown = getattr(markdown, 'raw_markdown', markdown)
+    for content in (getattr(result, 'extracted_content', None), markdown,
+                    getattr(result, 'cleaned_html', None), getattr(result, 'html', None)):
+        if content:
+            return str(content)
+    return ''
+
+def _result_links(result) -> List[str]:
+    """hrefs from crawl4ai's link map, falling back to parsing the HTML"""
+    links = getattr(result, 'links', None)
+    if isinstance(links, dict) and (links.get('internal') or links.get('external')):
+        hrefs = []
+        for link in (links.get('internal') or []) + (links.get('external') or []):
+            href = link.get('href') if isinstance(link, dict) else link
+            if href:
+                hrefs.append(href)
+        return hrefs
+
+    html = getattr(result, 'html', None)
+    if not html:
+        return []
+    from bs4 import BeautifulSoup
+
+    return [a['href'] for a in BeautifulSoup(html, 'html.parser').find_all('a', href=True)]
+
+def _result_title(result) -> Optional[str]:
+    metadata = getattr(result, 'metadata', None)
+    if isinstance(metadata, dict):
+        return metadata.get('title')
+    return None
+
+class SiteCrawler:
+    """Budgeted, concurrent, same-site crawl with an AsyncWebCrawler-compatible crawler"""
+
+    def __init__(self, crawler, max_pages: int = DEFAULT_MAX_PAGES, max_depth: int = DEFAULT_MAX_DEPTH,
+                 concurrency: int = DEFAULT_CONCURRENCY, allowed_hosts: Iterable[str] = (),
+                 page_timeout: float = 60.0):
+        self.crawler = crawler
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.concurrency = max(1, concurrency)
+        self.allowed_hosts = {host.lower() for host in allowed_hosts}
+        self.page_timeout = page_timeout
+
+    async def _fetch(self, url: str, session_id: str):
+        try:
+            from crawl4ai import CacheMode, CrawlerRunConfig
+        except ImportError:
+            # Older crawl4ai releases take run options as keyword arguments
+            return await self.crawler.arun(url=url, session_id=session_id, bypass_cache=True)
+        return await self.crawler.arun(
+            url=url, config=CrawlerRunConfig(session_id=session_id, cache_mode=CacheMode.BYPASS)
+        )
+
+    def _close_session(self, session_id: str):
+        strategy = getattr(self.crawler, 'crawler_strategy', None)
+        kill_session = getattr(strategy, 'kill_session', None)
+        if kill_session:
+            try:
+                result = kill_session(session_id)
+                if asyncio.iscoroutine(result):
+                    return result
+            except Exception:
+                pass
+        return None
+
+    async def crawl(self, start_url: str) -> Tuple[List[CrawledPage], CrawlStats]:
+        start = canonicalize_url(start_url)
+        if not start:
+            raise ValueError(f"Not a crawlable URL: {start_url}")
+        hosts = self.allowed_hosts | {urlsplit(start).netloc}
+
+        frontier: "asyncio.Queue[Tuple[str, int]]" = asyncio.Queue()
+        visited: Set[str] = {start}
+        pages: List[CrawledPage] = []
+        stats = CrawlStats(enqueued=1)
+        claimed = 0
+        frontier.put_nowait((start, 0))
+        started = time.perf_counter()
+
+        def enqueue(href: str, base: str, depth: int):
+            url = canonicalize_url(href, base)
+            if not url or url in visited or not is_page_url(url):
+                return
+            if urlsplit(url).netloc not in hosts:
+                stats.skipped_offsite += 1
+                return
+            if depth > self.max_depth:
+                stats.skipped_depth += 1
+                return
+            visited.add(url)
+            stats.enqueued += 1
+            frontier.put_nowait((url, depth))
+
+        async def worker(index: int):
+            nonlocal claimed
+            session_id = f"site-crawl-{index}"
+            while True:
+                url, depth = await frontier.get()
+                try:
+                    if claimed >= self.max_pages:
+                        continue
+                    claimed += 1
+                    page_started = time.perf_counter()
+                    try:
+                        result = await asyncio.wait_for(self._fetch(url, session_id), self.page_timeout)
+                        if not result or not getattr(result, 'success', False):
+                            raise RuntimeError(getattr(result, 'error_message', None) or 'crawl failed')
+                        content = _result_content(result)
+                        hrefs = _result_links(result)
+                    except Exception as e:
+                        stats.failures += 1
+                        stats.errors.append(f"{url}: {e}")
+                        continue
+
+                    size = len(content.encode('utf-8'))
+                    pages.append(CrawledPage(
+                        url=url, depth=depth, status_code=getattr(result, 'status_code', None),
+                        title=_result_title(result), content=content, bytes=size, links=len(hrefs),
+                        seconds=round(time.perf_counter() - page_started, 3)
+                    ))
+                    stats.pages += 1
+                    stats.bytes_extracted += size
+                    stats.links_seen += len(hrefs)
+                    stats.max_depth_reached = max(stats.max_depth_reached, depth)
+
+                    # Resolve against the final URL so relative links survive redirects
+                    base = getattr(result, 'redirected_url', None) or getattr(result, 'url', None) or url
+                    for href in hrefs:
+                        enqueue(href, base, depth + 1)
+                finally:
+                    frontier.task_done()
+
+        workers = [asyncio.ensure_future(worker(index)) for index in range(self.concurrency)]
+        try:
+            await frontier.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            closing = [self._close_session(f"site-crawl-{index}") for index in range(self.concurrency)]
+            await asyncio.gather(*(c for c in closing if c), return_exceptions=True)
+        stats.seconds = time.perf_counter() - started
+        return pages, stats
+
+async def crawl_site(start_url: str, max_pages: int = DEFAULT_MAX_PAGES, max_depth: int = DEFAULT_MAX_DEPTH,
+                     concurrency: int = DEFAULT_CONCURRENCY, crawler=None) -> Tuple[List[CrawledPage], CrawlStats]:
+    """Crawl with the given AsyncWebCrawler, or a temporary one"""
+    if crawler is not None:
+        return await SiteCrawler(crawler, max_pages, max_depth, concurrency).crawl(start_url)
+
+    from crawl4ai import AsyncWebCrawler
+
+    async with AsyncWebCrawler() as crawler:
+        return await SiteCrawler(crawler, max_pages, max_depth, concurrency).crawl(start_url)
+
+def serve_directory(directory: str):
+    """Serve a static site fixture on an ephemeral localhost port; returns (server, base_url)"""
+    import functools
+    import threading
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/"
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Crawl a site with crawl4ai")
+    parser.add_argument('url', nargs='?', default=os.getenv('DATAPILOTPLUS_BASE_URL', 'https://datapilotplus.com'))
+    parser.add_argument('--serve', metavar='DIR', help="Crawl a local static site directory instead of url")
+    parser.add_argument('--max-pages', type=int, default=DEFAULT_MAX_PAGES)
+    parser.add_argument('--max-depth', type=int, default=DEFAULT_MAX_DEPTH)
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--output', help="Write crawled pages as JSON lines to this file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    server = None
+    url = args.url
+    if args.serve:
+        server, url = serve_directory(args.serve)
+    try:
+        pages, stats = asyncio.run(crawl_site(url, args.max_pages, args.max_depth, args.concurrency))
+    finally:
+        if server:
+            server.shutdown()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            for page in pages:
+                f.write(json.dumps(asdict(page)) + '\n')
+    print(json.dumps(stats.as_dict(), indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
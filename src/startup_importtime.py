@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Startup-time check for the main.py entry points.
+
+Each entry point's startup is run in a fresh interpreter under
+`python -X importtime`. The stderr trace is summarized into a total import
+time and the slowest top-level imports. The check fails when an entry point
+goes over its budget or imports a module it has no use for: the MCP-only
+server must not load the database driver, crawl4ai's browser stack or the
+HTTP client, and a report-only run must not start a crawler.
+
+    python src/startup_importtime.py            # all entry points
+    python src/startup_importtime.py mcp --top 15
+    python src/startup_importtime.py --check    # exit 1 on a budget or import violation
+
+Budgets are in milliseconds and default to STARTUP_BUDGET_MS_<ENTRY>
+(e.g. STARTUP_BUDGET_MS_MCP) when set.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Heavy third-party stacks none of the light entry points should pay for
+HEAVY_MODULES = ('crawl4ai', 'playwright', 'selenium', 'pandas', 'numpy', 'openai',
+                 'supabase', 'bs4', 'schedule')
+
+# name -> (startup code, modules that must not be imported, default budget ms)
+ENTRY_POINTS = {
+    'mcp': (
+        "import main\n"
+        "main.HTTPServer, main.MCPHandler, main.start_mcp_server\n",
+        HEAVY_MODULES + ('mysql', 'requests', 'urllib3'),
+        300.0,
+    ),
+    'report': (
+        # No database is reachable on port 1, so the scraper starts without one and the
+        # report path runs end to end without side effects
+        "import main\n"
+        "scraper = main.DataPilotPlusScraper()\n"
+        "scraper.send_comprehensive_report(scraper.generate_comprehensive_report())\n",
+        HEAVY_MODULES + ('requests',),
+        1000.0,
+    ),
+    'scrape': (
+        # What a scrape run adds on top of the module import
+        "import main\n"
+        "import crawl4ai, http_client, site_crawler\n",
+        (),
+        None,
+    ),
+}
+
+_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """(module, self_us, cumulative_us, depth) rows from -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append({'module': module, 'self_us': int(self_us), 'cumulative_us': int(cumulative_us),
+                         'depth': (len(indent) - 1) // 2})
+    return rows
+
+def summarize(rows: List[Dict], top: int = 10) -> Dict:
+    """Total import time plus the slowest top-level imports"""
+    top_level = sorted((row for row in rows if row['depth'] == 0),
+                       key=lambda row: row['cumulative_us'], reverse=True)
+    return {
+        'modules': len(rows),
+        'total_ms': round(sum(row['self_us'] for row in rows) / 1000, 1),
+        'top': [{'module': row['module'], 'cumulative_ms': round(row['cumulative_us'] / 1000, 1)}
+                for row in top_level[:top]]
+    }
+
+def measure(entry: str, top: int = 10, budget_ms: Optional[float] = None) -> Dict:
+    """Run one entry point's startup under -X importtime and check it"""
+    code, forbidden, default_budget = ENTRY_POINTS[entry]
+    if budget_ms is None:
+        budget_ms = float(os.getenv(f'STARTUP_BUDGET_MS_{entry.upper()}', default_budget or 0)) or None
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, (SRC_DIR, env.get('PYTHONPATH'))))
+    env.update({'MYSQL_HOST': '127.0.0.1', 'MYSQL_PORT': '1', 'SMTP_SERVER': ''})
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=SRC_DIR, env=env,
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    rows = parse_importtime(process.stderr)
+    result = {'entry': entry, **summarize(rows, top), 'budget_ms': budget_ms}
+
+    imported = {row['module'] for row in rows}
+    result['forbidden_imports'] = sorted(
+        module for module in imported if module.split('.')[0] in forbidden
+    )
+    problems = []
+    if process.returncode != 0:
+        errors = [line for line in process.stderr.splitlines() if not line.startswith('import time:')]
+        problems.append(f"startup failed: {errors[-1] if errors else process.returncode}")
+    if budget_ms and result['total_ms'] > budget_ms:
+        problems.append(f"{result['total_ms']} ms over the {budget_ms:.0f} ms budget")
+    if result['forbidden_imports']:
+        roots = sorted({module.split('.')[0] for module in result['forbidden_imports']})
+        problems.append(f"imports {', '.join(roots)}")
+    result['problems'] = problems
+    return result
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Summarize python -X importtime for the main.py entry points")
+    parser.add_argument('entries', nargs='*', metavar='entry',
+                        help=f"Entry points to measure ({', '.join(ENTRY_POINTS)}; default all)")
+    parser.add_argument('--top', type=int, default=10, help="Slowest top-level imports to list")
+    parser.add_argument('--budget-ms', type=float, help="Override the budget for every entry point")
+    parser.add_argument('--check', action='store_true', help="Exit 1 when any entry point has problems")
+    parser.add_argument('--json', action='store_true', help="Print the full results as JSON")
+    args = parser.parse_args(argv)
+    unknown = [entry for entry in args.entries if entry not in ENTRY_POINTS]
+    if unknown:
+        parser.error(f"unknown entry point(s): {', '.join(unknown)}")
+
+    results = [measure(entry, args.top, args.budget_ms) for entry in (args.entries or ENTRY_POINTS)]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            budget = f" (budget {result['budget_ms']:.0f} ms)" if result['budget_ms'] else ''
+            status = '❌' if result['problems'] else '✅'
+            print(f"{status} {result['entry']}: {result['total_ms']} ms over {result['modules']} modules{budget}")
+            for module in result['top']:
+                print(f"     {module['cumulative_ms']:>8.1f} ms  {module['module']}")
+            for problem in result['problems']:
+                print(f"   ⚠️ {problem}")
+
+    if args.check and any(result['problems'] for result in results):
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Span tracing for the batch analysis runs, exported as a Chrome trace.
+
+A run wrapped in trace_run() (a context manager or a decorator on the
+run's entry method) records one complete event per span with its
+start, duration, thread and attributes (URL, bytes, article count...);
+spans opened inside others nest by time on the same thread. The JSON
+written to TRACE_DIR opens in chrome://tracing or https://ui.perfetto.dev.
+Tracing is off unless TRACE_DIR is set. span() then returns one shared
+no-op object, so instrumented code pays a function call and nothing else.
+
+    TRACE_DIR=reports/traces python local825_targeted_intelligence_system.py
+
+TRACE_PROFILE_STAGE names a span (e.g. `parse` or `report`) to sample
+with the built-in profiler. The span's thread stack is read every
+TRACE_PROFILE_INTERVAL_MS while the span is open. Stacks are written next
+to the trace as <trace>.<stage>.folded, summed over every span of that
+name. The format is collapsed stacks, for flamegraph.pl or speedscope.
+Each sampled span also gets its hottest frames as attributes.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+TRACE_DIR = os.getenv('TRACE_DIR')
+PROFILE_STAGE = os.getenv('TRACE_PROFILE_STAGE')
+PROFILE_INTERVAL = float(os.getenv('TRACE_PROFILE_INTERVAL_MS', 5)) / 1000.0
+HOT_FRAMES = 10
+
+class SamplingProfiler:
+    """Samples one thread's Python stack at a fixed interval from a background thread"""
+
+    def __init__(self, thread_id: int, interval: float = PROFILE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='trace-profiler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def start(self) -> 'SamplingProfiler':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def hot_frames(self, limit: int = HOT_FRAMES) -> List[List]:
+        """[frame, samples] for the frames most often on top of the stack"""
+        leaves: Counter = Counter()
+        for stack, count in self.samples.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        return [[frame, count] for frame, count in leaves.most_common(limit)]
+
+class Tracer:
+    """Collects complete ('X') events for one run"""
+
+    def __init__(self, profile_stage: Optional[str] = None, profile_interval: float = PROFILE_INTERVAL):
+        self.origin_ns = time.perf_counter_ns()
+        self.started_at = datetime.now()
+        self.pid = os.getpid()
+        self.profile_stage = profile_stage
+        self.profile_interval = profile_interval
+        self.events: List[Dict] = []
+        self.threads: Dict[int, str] = {}
+        # stage -> collapsed stack -> samples, summed over every span of that stage
+        self.profiles: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def add_profile(self, stage: str, profiler: SamplingProfiler):
+        with self._lock:
+            self.profiles.setdefault(stage, Counter()).update(profiler.samples)
+
+    def now_us(self) -> float:
+        return (time.perf_counter_ns() - self.origin_ns) / 1000.0
+
+    def export(self, path: str) -> str:
+        """Write the Chrome trace (and any sampled stage profiles beside it); returns path"""
+        metadata = [{'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'tid': 0, 'args': {'name': 'local825'}}]
+        metadata += [{'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid, 'args': {'name': name}}
+                     for tid, name in sorted(self.threads.items())]
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': metadata + self.events, 'displayTimeUnit': 'ms',
+                       'otherData': {'started_at': self.started_at.isoformat()}}, f, default=str)
+        base = path[:-len('.json')] if path.endswith('.json') else path
+        for stage, samples in self.profiles.items():
+            with open(f"{base}.{stage}.folded", 'w', encoding='utf-8') as f:
+                f.writelines(f"{stack} {count}\n" for stack, count in sorted(samples.items()))
+        return path
+
+class Span:
+    """A timed region; attributes can be added with set() until it closes"""
+    __slots__ = ('tracer', 'name', 'category', 'args', 'start', 'tid', 'profiler')
+
+    def __init__(self, tracer: Tracer, name: str, category: str, args: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.profiler = None
+
+    def set(self, **attrs):
+        self.args.update(attrs)
+
+    def __enter__(self):
+        tracer = self.tracer
+        self.tid = threading.get_ident()
+        if self.tid not in tracer.threads:
+            tracer.threads[self.tid] = threading.current_thread().name
+        if tracer.profile_stage == self.name:
+            self.profiler = SamplingProfiler(self.tid, tracer.profile_interval).start()
+        self.start = tracer.now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        tracer = self.tracer
+        end = tracer.now_us()
+        if exc_type is not None:
+            self.args['error'] = f"{exc_type.__name__}: {exc}"
+        if self.profiler is not None:
+            self.profiler.stop()
+            tracer.add_profile(self.name, self.profiler)
+            self.args['profile_samples'] = sum(self.profiler.samples.values())
+            self.args['hot_frames'] = self.profiler.hot_frames()
+        tracer.events.append({'name': self.name, 'cat': self.category, 'ph': 'X', 'ts': round(self.start, 3),
+                              'dur': round(end - self.start, 3), 'pid': tracer.pid, 'tid': self.tid,
+                              'args': self.args})
+        return False
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+NOOP_SPAN = _NoopSpan()
+
+_tracer: Optional[Tracer] = None
+
+def enabled() -> bool:
+    return _tracer is not None
+
+def span(name: str, category: str = 'stage', **attrs):
+    """Context manager timing its block as a span (a shared no-op while tracing is off)"""
+    if _tracer is None:
+        return NOOP_SPAN
+    return Span(_tracer, name, category, attrs)
+
+def traced(name: Optional[str] = None, category: str = 'stage'):
+    """Decorator running the function inside span(name or the function's name)"""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with Span(_tracer, span_name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def trace_path(run: str, directory: str) -> str:
+    return os.path.join(directory, f"{run}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+
+@contextmanager
+def trace_run(run: str, directory: Optional[str] = TRACE_DIR, profile_stage: Optional[str] = PROFILE_STAGE,
+              **attrs):
+    """Trace a whole run as a root span and export it when the run ends.
+
+    With no directory (TRACE_DIR unset) this only yields the no-op span. A
+    run nested in an already traced one becomes a span of that trace.
+    """
+    global _tracer
+    if _tracer is not None:
+        with span(run, 'run', **attrs) as root:
+            yield root
+        return
+    if not directory:
+        yield NOOP_SPAN
+        return
+
+    _tracer = tracer = Tracer(profile_stage)
+    try:
+        with Span(tracer, run, 'run', attrs) as root:
+            yield root
+    finally:
+        _tracer = None
+        try:
+            path = tracer.export(trace_path(run, directory))
+            print(f"🧭 Trace saved to: {path} (open in https://ui.perfetto.dev)")
+        except OSError as e:
+            print(f"⚠️ Could not write trace: {e}")
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+USAspending.gov federal contract award connector.
+
+Searches spending_by_award with server-side filters (construction NAICS
+codes, place of performance in New Jersey or the New York counties of the
+Local 825 territory, last-modified date window) and upserts each award into
+usaspending_awards keyed by its generated award id, so reruns only move the
+window forward and update changed awards.
+
+The search is split into one partition per place-of-performance filter.
+Partitions are fetched in parallel, bounded by max_parallel; within a
+partition pages follow the keyset cursor (last_record_unique_id /
+last_record_sort_value) that the API returns.
+
+Point USASPENDING_API_URL at a local server replaying recorded responses to
+run it without network access.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from company_names import normalize_company_name
+from http_client import get_session
+from mysql_config import get_mysql_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_URL = os.getenv('USASPENDING_API_URL', 'https://api.usaspending.gov')
+SEARCH_PATH = '/api/v2/search/spending_by_award/'
+
+# Contracts only; award type groups cannot be mixed in one search
+CONTRACT_AWARD_TYPES = ['A', 'B', 'C', 'D']
+# NAICS sector 23: construction (236 buildings, 237 heavy/civil, 238 specialty trades)
+CONSTRUCTION_NAICS = ['236', '237', '238']
+
+# FIPS county codes for the New York areas in local825_jurisdictions.JURISDICTION_AREAS
+# (New York City is its five boroughs; Long Island is covered by Nassau and Suffolk)
+NY_COUNTY_FIPS = {
+    'Bronx': '005',
+    'Brooklyn': '047',
+    'Manhattan': '061',
+    'Queens': '081',
+    'Staten Island': '085',
+    'Nassau County': '059',
+    'Suffolk County': '103',
+    'Westchester County': '119',
+    'Rockland County': '087',
+    'Orange County': '071',
+    'Putnam County': '079',
+    'Dutchess County': '027',
+}
+
+AWARD_FIELDS = [
+    'Award ID', 'Recipient Name', 'Award Amount', 'Total Outlays', 'Description',
+    'Contract Award Type', 'Awarding Agency', 'Awarding Sub Agency',
+    'Start Date', 'End Date', 'Last Modified Date', 'NAICS',
+    'Place of Performance State Code', 'Place of Performance Zip5',
+    'generated_internal_id'
+]
+
+SORT_FIELD = 'Last Modified Date'
+
+CREATE_AWARDS_TABLE = """
+CREATE TABLE IF NOT EXISTS usaspending_awards (
+    award_id VARCHAR(255) PRIMARY KEY,
+    piid VARCHAR(100),
+    recipient_name VARCHAR(255),
+    normalized_name VARCHAR(255),
+    company_id INT NULL,
+    award_amount DECIMAL(18,2),
+    total_outlays DECIMAL(18,2),
+    description TEXT,
+    award_type VARCHAR(100),
+    awarding_agency VARCHAR(255),
+    awarding_sub_agency VARCHAR(255),
+    naics_code VARCHAR(10),
+    naics_description VARCHAR(255),
+    pop_state CHAR(2),
+    territory_area VARCHAR(100),
+    pop_zip5 VARCHAR(10),
+    start_date DATE NULL,
+    end_date DATE NULL,
+    last_modified_date DATE NULL,
+    raw JSON,
+    first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_recipient (recipient_name),
+    INDEX idx_normalized_name (normalized_name),
+    INDEX idx_company_start (company_id, start_date),
+    INDEX idx_territory (pop_state, territory_area),
+    INDEX idx_last_modified (last_modified_date),
+    INDEX idx_naics (naics_code)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+# Added after the table was first created; ensure_awards_table() migrates older tables
+COMPANY_COLUMNS = {
+    'normalized_name': "ALTER TABLE usaspending_awards ADD COLUMN normalized_name VARCHAR(255) AFTER recipient_name, "
+                       "ADD INDEX idx_normalized_name (normalized_name)",
+    'company_id': "ALTER TABLE usaspending_awards ADD COLUMN company_id INT NULL AFTER normalized_name, "
+                  "ADD INDEX idx_company_start (company_id, start_date)",
+}
+
+def build_partitions() -> List[Tuple[str, Dict[str, str]]]:
+    """(label, place_of_performance location) for every search partition"""
+    partitions = [('New Jersey', {'country': 'USA', 'state': 'NJ'})]
+    partitions.extend(
+        (area, {'country': 'USA', 'state': 'NY', 'county': fips})
+        for area, fips in NY_COUNTY_FIPS.items()
+    )
+    return partitions
+
+def build_search_body(location: Dict[str, str], since: date, until: date,
+                      limit: int = 100, cursor: Optional[Dict[str, Any]] = None, page: int = 1) -> Dict:
+    """Request body for one page of one partition"""
+    body = {
+        'filters': {
+            'award_type_codes': CONTRACT_AWARD_TYPES,
+            'naics_codes': {'require': CONSTRUCTION_NAICS},
+            'place_of_performance_locations': [location],
+            'time_period': [{
+                'start_date': since.isoformat(),
+                'end_date': until.isoformat(),
+                'date_type': 'last_modified_date'
+            }]
+        },
+        'fields': AWARD_FIELDS,
+        'sort': SORT_FIELD,
+        'order': 'asc',
+        'limit': limit,
+        'page': page,
+        'subawards': False
+    }
+    if cursor:
+        body['last_record_unique_id'] = cursor['last_record_unique_id']
+        body['last_record_sort_value'] = cursor['last_record_sort_value']
+    return body
+
+def fetch_partition(label: str, location: Dict[str, str], since: date, until: date,
+                    api_url: str = DEFAULT_API_URL, limit: int = 100, max_pages: int = 200,
+                    rate_limiter=None, session: Optional[requests.Session] = None,
+                    timeout: float = 60) -> List[Dict]:
+    """Follow the keyset cursor through every page of one partition"""
+    session = session or get_session()
+    results = []
+    cursor = None
+    for page in range(1, max_pages + 1):
+        if rate_limiter:
+            rate_limiter.acquire_blocking('usaspending')
+        response = session.post(
+            f"{api_url.rstrip('/')}{SEARCH_PATH}",
+            json=build_search_body(location, since, until, limit, cursor, page),
+            timeout=timeout
+        )
+        response.raise_for_status()
+        payload = response.json()
+
+        for result in payload.get('results', []):
+            result['_partition'] = label
+            results.append(result)
+
+        metadata = payload.get('page_metadata', {})
+        if not metadata.get('hasNext') or not payload.get('results'):
+            break
+        if metadata.get('last_record_unique_id') is not None:
+            cursor = {
+                'last_record_unique_id': metadata['last_record_unique_id'],
+                'last_record_sort_value': metadata.get('last_record_sort_value')
+            }
+    else:
+        logger.warning(f"⚠️ USAspending partition {label} stopped at {max_pages} pages")
+    return results
+
+def fetch_awards(since: date, until: date, api_url: str = DEFAULT_API_URL, max_parallel: int = 4,
+                 rate_limiter=None, timeout: float = 60) -> Tuple[List[Dict], Dict[str, int]]:
+    """Fetch every partition with at most max_parallel in flight"""
+    awards = []
+    per_partition = {}
+    with ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix='usaspending') as executor:
+        futures = {
+            executor.submit(fetch_partition, label, location, since, until, api_url,
+                            rate_limiter=rate_limiter, timeout=timeout): label
+            for label, location in build_partitions()
+        }
+        for future in as_completed(futures):
+            label = futures[future]
+            results = future.result()
+            per_partition[label] = len(results)
+            awards.extend(results)
+    return awards, per_partition
+
+def _parse_date(value: Optional[str]) -> Optional[str]:
+    return value[:10] if value else None
+
+def award_row(result: Dict) -> Tuple:
+    """Map one search result onto a usaspending_awards row"""
+    naics = result.get('NAICS')
+    if isinstance(naics, dict):
+        naics_code, naics_description = naics.get('code'), naics.get('description')
+    else:
+        naics_code, naics_description = naics, None
+    raw = {key: value for key, value in result.items() if not key.startswith('_')}
+    return (
+        result.get('generated_internal_id') or result.get('Award ID'),
+        result.get('Award ID'),
+        result.get('Recipient Name'),
+        normalize_company_name(result.get('Recipient Name')) or None,
+        result.get('Award Amount'),
+        result.get('Total Outlays'),
+        result.get('Description'),
+        result.get('Contract Award Type'),
+        result.get('Awarding Agency'),
+        result.get('Awarding Sub Agency'),
+        naics_code,
+        naics_description,
+        result.get('Place of Performance State Code'),
+        result.get('_partition'),
+        result.get('Place of Performance Zip5'),
+        _parse_date(result.get('Start Date')),
+        _parse_date(result.get('End Date')),
+        _parse_date(result.get('Last Modified Date')),
+        json.dumps(raw, default=str)
+    )
+
+def upsert_awards(connection, awards: Iterable[Dict], batch_size: int = 500) -> List[Tuple]:
+    """Insert new awards and refresh changed ones; returns the rows written"""
+    rows = {}
+    for award in awards:
+        row = award_row(award)
+        if row[0]:
+            rows[row[0]] = row  # partitions can overlap (e.g. multi-county awards)
+    rows = list(rows.values())
+
+    cursor = connection.cursor()
+    try:
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany("""
+                INSERT INTO usaspending_awards
+                (award_id, piid, recipient_name, normalized_name, award_amount, total_outlays, description,
+                 award_type, awarding_agency, awarding_sub_agency, naics_code, naics_description, pop_state,
+                 territory_area, pop_zip5, start_date, end_date, last_modified_date, raw)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    recipient_name = VALUES(recipient_name),
+                    normalized_name = VALUES(normalized_name),
+                    award_amount = VALUES(award_amount),
+                    total_outlays = VALUES(total_outlays),
+                    description = VALUES(description),
+                    end_date = VALUES(end_date),
+                    last_modified_date = VALUES(last_modified_date),
+                    raw = VALUES(raw)
+            """, rows[start:start + batch_size])
+        connection.commit()
+    finally:
+        cursor.close()
+    return rows
+
+def ensure_awards_table(connection):
+    cursor = connection.cursor()
+    try:
+        cursor.execute(CREATE_AWARDS_TABLE)
+        cursor.execute("""
+            SELECT COLUMN_NAME FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'usaspending_awards'
+        """)
+        existing = {row[0] for row in cursor.fetchall()}
+        for column, ddl in COMPANY_COLUMNS.items():
+            if column not in existing:
+                cursor.execute(ddl)
+                logger.info(f"🗄️ Added usaspending_awards.{column}")
+        if 'normalized_name' not in existing:
+            # Backfill names for rows stored before the column existed
+            cursor.execute("SELECT award_id, recipient_name FROM usaspending_awards WHERE normalized_name IS NULL")
+            names = [(normalize_company_name(name) or None, award_id) for award_id, name in cursor.fetchall()]
+            cursor.executemany("UPDATE usaspending_awards SET normalized_name = %s WHERE award_id = %s", names)
+        connection.commit()
+    finally:
+        cursor.close()
+
+def match_award_companies(connection, companies: Dict[str, List[int]],
+                          names: Optional[Iterable[str]] = None) -> Dict[int, int]:
+    """Link awards to companies by normalized recipient name.
+
+    names limits the pass to those normalized names (e.g. the ones just
+    upserted). Returns company_id -> awards newly linked.
+    """
+    keys = companies.keys() if names is None else set(names) & companies.keys()
+    linked = {}
+    cursor = connection.cursor()
+    try:
+        for normalized in keys:
+            company_id = companies[normalized][0]
+            cursor.execute(
+                "UPDATE usaspending_awards SET company_id = %s WHERE normalized_name = %s "
+                "AND (company_id IS NULL OR company_id != %s)",
+                (company_id, normalized, company_id)
+            )
+            if cursor.rowcount:
+                linked[company_id] = linked.get(company_id, 0) + cursor.rowcount
+        connection.commit()
+    finally:
+        cursor.close()
+    return linked
+
+def sync_window(connection, lookback_days: int) -> Tuple[date, date]:
+    """Resume one day before the newest stored modification, else look back lookback_days"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT MAX(last_modified_date) FROM usaspending_awards")
+        newest = cursor.fetchone()[0]
+    finally:
+        cursor.close()
+    until = date.today()
+    since = newest - timedelta(days=1) if newest else until - timedelta(days=lookback_days)
+    return since, until
+
+def sync_awards(connection, api_url: str = DEFAULT_API_URL, max_parallel: Optional[int] = None,
+                lookback_days: Optional[int] = None, rate_limiter=None,
+                companies: Optional[Dict[str, List[int]]] = None, timeout: float = 60) -> Dict[str, Any]:
+    """Fetch awards modified since the last sync and upsert them.
+
+    With a companies name index (company_names.build_name_index), upserted
+    awards are linked to companies and stats['companies'] lists the ids
+    whose awards were touched.
+    """
+    max_parallel = max_parallel or int(os.getenv('USASPENDING_MAX_PARALLEL', 4))
+    lookback_days = lookback_days or int(os.getenv('USASPENDING_LOOKBACK_DAYS', 365))
+
+    ensure_awards_table(connection)
+    since, until = sync_window(connection, lookback_days)
+    started = datetime.now()
+    awards, per_partition = fetch_awards(since, until, api_url, max_parallel, rate_limiter, timeout)
+    rows = upsert_awards(connection, awards)
+    written = len(rows)
+
+    touched = []
+    if companies:
+        names = {row[3] for row in rows if row[3]}
+        match_award_companies(connection, companies, names)
+        touched = sorted({companies[name][0] for name in names if name in companies})
+
+    stats = {
+        'window': [since.isoformat(), until.isoformat()],
+        'fetched': len(awards),
+        'upserted': written,
+        'companies': touched,
+        'per_partition': per_partition,
+        'seconds': round((datetime.now() - started).total_seconds(), 1)
+    }
+    logger.info(f"🏛️ USAspending sync {stats['window'][0]}..{stats['window'][1]}: "
+                f"{written} awards from {len(per_partition)} partitions")
+    return stats
+
+def recent_awards(connection, limit: int = 25) -> List[Dict]:
+    """Most recently modified awards, largest first within a day"""
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT award_id, piid, recipient_name, award_amount, awarding_agency,
+                   naics_code, pop_state, territory_area, start_date, last_modified_date
+            FROM usaspending_awards
+            ORDER BY last_modified_date DESC, award_amount DESC
+            LIMIT %s
+        """, (limit,))
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Sync USAspending construction awards")
+    parser.add_argument('--api-url', default=DEFAULT_API_URL)
+    parser.add_argument('--max-parallel', type=int)
+    parser.add_argument('--lookback-days', type=int)
+    args = parser.parse_args(argv)
+
+    import mysql.connector
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    connection = mysql.connector.connect(**get_mysql_config())
+    try:
+        print(json.dumps(sync_awards(connection, args.api_url, args.max_parallel, args.lookback_days), indent=2))
+    finally:
+        connection.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+import os
+import sys
+
+# Add the src directory to the path so we can import from article_scoring.py
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from article_scoring import categorize_article, score_article, score_relevance
+
+def test_local_825_mentions_get_the_priority_bonus():
+    # 1 keyword + 5 for mentioning Local 825; the jurisdiction adds nothing
+    assert score_relevance('Local 825 operating engineers rally', 'General') == (6, ['Local 825'])
+
+def test_categories_match_regardless_of_case():
+    assert categorize_article('Local 825 members meet') == 'Local 825 Specific'
+    assert categorize_article('NLRB ruling issued') == 'Union Organizing'
+
+def test_score_article():
+    score = score_article('Local 825 strike halts Bergen County bridge construction')
+
+    # 2 keywords + 4 (New Jersey) + 2 (construction) + 5 (Local 825) + 3 (strike)
+    assert score['relevance_score'] == 16
+    assert score['jurisdiction'] == 'New Jersey'
+    assert score['matched_counties'] == ['Bergen County']
+    assert score['article_category'] == 'Labor Disputes'
@@ -0,0 +1,147 @@
+import json
+import os
+import sys
+import zipfile
+from datetime import date
+
+import pytest
+
+# Add the src directory to the path so we can import from edgar_bulk.py
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from edgar_bulk import (EdgarBulkIndex, daily_index_url, ingest_companyfacts, ingest_submissions,
+                        parse_master_index, update_from_daily_indexes)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+INDEX_DAY = date(2024, 1, 2)
+TRACKED_COMPANIES = [(1, 'Tutor Perini Corporation'), (2, 'Skanska USA Inc.')]
+
+# A few members in the layout of EDGAR's nightly submissions.zip and companyfacts.zip
+SUBMISSIONS = {
+    'CIK0001001600.json': {
+        'cik': '1001600', 'name': 'TUTOR PERINI CORP', 'sic': '1600', 'stateOfIncorporation': 'MA',
+        'filings': {'recent': {
+            'accessionNumber': ['0001001600-24-000002', '0001001600-23-000090'],
+            'form': ['8-K', '10-Q'],
+            'filingDate': ['2024-01-02', '2023-11-01'],
+            'reportDate': ['2024-01-02', '2023-09-30'],
+            'primaryDocument': ['tpc-20240102.htm', 'tpc-20230930.htm']
+        }}
+    },
+    'CIK0001001600-submissions-001.json': {
+        'accessionNumber': ['0001001600-09-000011'],
+        'form': ['10-K'],
+        'filingDate': ['2009-02-26'],
+        'reportDate': ['2008-12-31'],
+        'primaryDocument': ['tpc-20081231.htm']
+    },
+    'CIK0000320193.json': {
+        'cik': '320193', 'name': 'APPLE INC',
+        'filings': {'recent': {'accessionNumber': ['0000320193-24-000001'], 'form': ['4'],
+                               'filingDate': ['2024-01-02'], 'reportDate': [''], 'primaryDocument': ['x.xml']}}
+    },
+    'CIK0000320193-submissions-001.json': {
+        'accessionNumber': ['0000320193-09-000001'], 'form': ['10-K'], 'filingDate': ['2009-10-27']
+    },
+}
+COMPANYFACTS = {
+    'CIK0001001600.json': {'cik': 1001600, 'facts': {
+        'us-gaap': {
+            'Revenues': {'units': {'USD': [
+                {'end': '2022-12-31', 'val': 3790000000, 'accn': '0001001600-23-000010', 'fy': 2022,
+                 'fp': 'FY', 'form': '10-K', 'filed': '2023-02-28'},
+                {'end': '2023-12-31', 'val': 3880000000, 'accn': '0001001600-24-000010', 'fy': 2023,
+                 'fp': 'FY', 'form': '10-K', 'filed': '2024-02-28'},
+            ]}},
+            'AccountsPayableCurrent': {'units': {'USD': [
+                {'end': '2023-12-31', 'val': 500000000, 'accn': '0001001600-24-000010'}
+            ]}}
+        }
+    }},
+    'CIK0000320193.json': {'cik': 320193, 'facts': {
+        'us-gaap': {'Revenues': {'units': {'USD': [{'end': '2023-09-30', 'val': 1, 'accn': 'a'}]}}}
+    }},
+}
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+def write_archive(path, members):
+    with zipfile.ZipFile(str(path), 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, document in members.items():
+            archive.writestr(name, json.dumps(document))
+    return str(path)
+
+@pytest.fixture
+def index(tmp_path):
+    with EdgarBulkIndex(str(tmp_path / 'edgar_index.db')) as index:
+        yield index
+
+def test_parse_master_index_skips_header_and_malformed_rows():
+    rows = list(parse_master_index(read_fixture('master.20240102.idx')))
+
+    assert len(rows) == 4
+    assert rows[0] == ('0001001600', 'TUTOR PERINI CORP', '8-K', '2024-01-02',
+                       'edgar/data/1001600/0001001600-24-000002.txt')
+    assert all(len(cik) == 10 and filed == '2024-01-02' for cik, _, _, filed, _ in rows)
+
+def test_daily_indexes_add_filings_for_tracked_filers_only(index):
+    fixtures = {daily_index_url(INDEX_DAY): read_fixture('master.20240102.idx')}
+
+    stats = update_from_daily_indexes(index, fixtures.get, TRACKED_COMPANIES,
+                                      since=date(2023, 12, 29), until=INDEX_DAY)
+
+    # Friday has no recorded index, nor do the weekend and New Year's Day
+    assert stats == {'days_fetched': 1, 'filings_added': 3}
+    assert index.filer_ciks() == {'0001001600': 1, '0001061219': 2}
+    assert index.get_state('daily_index_through') == '2024-01-02'
+    assert {filing['accession'] for filing in index.recent_filings(INDEX_DAY)} == {
+        '0001001600-24-000002', '0001209191-24-000311', '0001061219-24-000001'
+    }
+
+def test_daily_indexes_resume_after_the_watermark(index):
+    fixtures = {daily_index_url(INDEX_DAY): read_fixture('master.20240102.idx')}
+    update_from_daily_indexes(index, fixtures.get, TRACKED_COMPANIES, since=INDEX_DAY, until=INDEX_DAY)
+    fetched = []
+
+    def fetch(url):
+        fetched.append(url)
+        return None
+
+    stats = update_from_daily_indexes(index, fetch, TRACKED_COMPANIES, until=date(2024, 1, 4))
+
+    assert fetched == [daily_index_url(date(2024, 1, 3)), daily_index_url(date(2024, 1, 4))]
+    assert stats == {'days_fetched': 0, 'filings_added': 0}
+    # A missing index for today may still be published, so today is not recorded
+    assert index.get_state('daily_index_through') == '2024-01-03'
+
+def test_failed_fetch_keeps_the_watermark_at_the_last_day_applied(index):
+    def fetch(url):
+        if url == daily_index_url(INDEX_DAY):
+            raise RuntimeError('403 Forbidden')
+        return None
+
+    with pytest.raises(RuntimeError):
+        update_from_daily_indexes(index, fetch, TRACKED_COMPANIES, since=date(2024, 1, 1), until=date(2024, 1, 3))
+
+    assert index.get_state('daily_index_through') == '2024-01-01'
+
+def test_bulk_archives_index_only_matched_filers(index, tmp_path):
+    submissions = write_archive(tmp_path / 'submissions.zip', SUBMISSIONS)
+    companyfacts = write_archive(tmp_path / 'companyfacts.zip', COMPANYFACTS)
+
+    stats = ingest_submissions(index, submissions, TRACKED_COMPANIES)
+
+    assert stats == {'members_scanned': 2, 'filers_matched': 1, 'filings_indexed': 3}
+    assert index.filer_ciks() == {'0001001600': 1}
+    assert index.counts()['filings'] == 3
+
+    stats = ingest_companyfacts(index, companyfacts)
+
+    assert stats == {'filers': 1, 'facts_indexed': 2}
+    assert index.latest_facts('0001001600') == {
+        'us-gaap:Revenues': {'unit': 'USD', 'period_end': '2023-12-31', 'value': 3880000000.0,
+                             'form': '10-K', 'filed': '2024-02-28'}
+    }
+    assert index.latest_facts('0000320193') == {}
@@ -0,0 +1,82 @@
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+# Add the src directory to the path so we can import from site_crawler.py
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from site_crawler import SiteCrawler, canonicalize_url
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+START_URL = 'https://datapilotplus.com/?utm_campaign=report'
+
+class FakeCrawler:
+    """AsyncWebCrawler stand-in that serves pages recorded in crawl_site.json"""
+
+    def __init__(self):
+        with open(os.path.join(FIXTURES, 'crawl_site.json'), encoding='utf-8') as f:
+            self.site = json.load(f)
+        self.fetched = []
+
+    async def arun(self, url, **kwargs):
+        self.fetched.append(url)
+        page = self.site.get(url)
+        if page is None:
+            return SimpleNamespace(success=False, error_message='404 Not Found', url=url)
+        return SimpleNamespace(
+            success=True, url=url, status_code=200, markdown=page['markdown'],
+            links={'internal': [{'href': href} for href in page['links']], 'external': []},
+            metadata={'title': page['title']}
+        )
+
+def crawl(crawler, **budgets):
+    return asyncio.run(SiteCrawler(crawler, **budgets).crawl(START_URL))
+
+def test_canonicalize_url():
+    assert canonicalize_url('HTTPS://DataPilotPlus.com:443/projects/?utm_source=x&b=2&a=1#top') == \
+        'https://datapilotplus.com/projects?a=1&b=2'
+    assert canonicalize_url('../about', 'https://datapilotplus.com/projects/route-287') == \
+        'https://datapilotplus.com/about'
+    assert canonicalize_url('http://datapilotplus.com:8080//') == 'http://datapilotplus.com:8080/'
+    assert canonicalize_url('mailto:info@datapilotplus.com') is None
+
+def test_crawl_visits_each_page_once_within_the_depth_budget():
+    crawler = FakeCrawler()
+
+    pages, stats = crawl(crawler, max_pages=50, max_depth=2, concurrency=3)
+
+    assert sorted(crawler.fetched) == sorted(crawler.site)
+    assert {page.url: page.depth for page in pages} == {
+        'https://datapilotplus.com/': 0,
+        'https://datapilotplus.com/about': 1,
+        'https://datapilotplus.com/projects': 1,
+        'https://datapilotplus.com/team': 2,
+        'https://datapilotplus.com/projects/route-287': 2,
+        'https://datapilotplus.com/projects/gateway-tunnel': 2,
+    }
+    assert stats.pages == 6
+    assert stats.failures == 0
+    assert stats.skipped_offsite == 1
+    assert stats.skipped_depth == 2
+    assert stats.max_depth_reached == 2
+    assert stats.bytes_extracted == sum(page.bytes for page in pages)
+
+def test_crawl_stops_at_the_page_budget():
+    crawler = FakeCrawler()
+
+    pages, stats = crawl(crawler, max_pages=3, max_depth=5, concurrency=2)
+
+    assert len(pages) == 3
+    assert len(crawler.fetched) == 3
+
+def test_crawl_records_failed_pages():
+    crawler = FakeCrawler()
+    del crawler.site['https://datapilotplus.com/about']
+
+    pages, stats = crawl(crawler, max_pages=50, max_depth=1, concurrency=1)
+
+    assert [page.url for page in pages] == ['https://datapilotplus.com/', 'https://datapilotplus.com/projects']
+    assert stats.failures == 1
+    assert stats.errors == ['https://datapilotplus.com/about: 404 Not Found']
@@ -0,0 +1,120 @@
+import json
+import os
+import sys
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add the src directory to the path so we can import from usaspending_awards.py
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from usaspending_awards import SEARCH_PATH, build_partitions, fetch_awards, fetch_partition
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+LOCATION = {'country': 'USA', 'state': 'NJ'}
+SINCE = date(2024, 1, 1)
+UNTIL = date(2024, 1, 7)
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return json.load(f)
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+class FakeSession:
+    """Replays recorded search pages in order and records each request"""
+
+    def __init__(self, *pages):
+        self.pages = list(pages)
+        self.requests = []
+
+    def post(self, url, json=None, timeout=None):
+        self.requests.append({'url': url, 'body': json, 'timeout': timeout})
+        return FakeResponse(self.pages.pop(0))
+
+@pytest.fixture
+def fixture_server():
+    """Local search endpoint that answers with the recorded pages, picked by keyset cursor"""
+    pages = {None: read_fixture('usaspending_page1.json'), 102: read_fixture('usaspending_page2.json')}
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            requests_seen.append((self.path, body))
+            payload = json.dumps(pages[body.get('last_record_unique_id')]).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}", requests_seen
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_fetch_partition_follows_the_keyset_cursor():
+    session = FakeSession(read_fixture('usaspending_page1.json'), read_fixture('usaspending_page2.json'))
+
+    results = fetch_partition('New Jersey', LOCATION, SINCE, UNTIL, api_url='https://api.test/',
+                              limit=2, session=session, timeout=15)
+
+    assert [result['Award ID'] for result in results] == ['W912DS24C0001', '69056724C0002', '70FA2024C0003']
+    assert {result['_partition'] for result in results} == {'New Jersey'}
+    assert len(session.requests) == 2
+    assert all(request['url'] == f"https://api.test{SEARCH_PATH}" for request in session.requests)
+    assert all(request['timeout'] == 15 for request in session.requests)
+
+    first, second = (request['body'] for request in session.requests)
+    assert 'last_record_unique_id' not in first
+    assert second['last_record_unique_id'] == 102
+    assert second['last_record_sort_value'] == '2024-01-04 08:00:00'
+    assert second['filters']['place_of_performance_locations'] == [LOCATION]
+    assert second['filters']['time_period'][0]['start_date'] == '2024-01-01'
+
+def test_fetch_partition_stops_at_an_empty_page():
+    empty = {'results': [], 'page_metadata': {'page': 1, 'hasNext': True}}
+    session = FakeSession(empty)
+
+    assert fetch_partition('Kings', LOCATION, SINCE, UNTIL, session=session) == []
+    assert len(session.requests) == 1
+
+def test_fetch_partition_stops_at_max_pages():
+    page = read_fixture('usaspending_page1.json')
+    session = FakeSession(page, page, page)
+
+    results = fetch_partition('New Jersey', LOCATION, SINCE, UNTIL, limit=2, max_pages=2, session=session)
+
+    assert len(results) == 4
+    assert len(session.requests) == 2
+
+def test_fetch_awards_pages_every_partition_through_the_fixture_server(fixture_server):
+    api_url, requests_seen = fixture_server
+    partitions = build_partitions()
+
+    awards, per_partition = fetch_awards(SINCE, UNTIL, api_url=api_url, max_parallel=3, timeout=5)
+
+    assert per_partition == {label: 3 for label, _ in partitions}
+    assert len(awards) == 3 * len(partitions)
+    assert len(requests_seen) == 2 * len(partitions)
+    assert {path for path, _ in requests_seen} == {SEARCH_PATH}
+    assert {json.dumps(body['filters']['place_of_performance_locations'][0], sort_keys=True)
+            for _, body in requests_seen} == {json.dumps(location, sort_keys=True) for _, location in partitions}